@@ -16,6 +16,10 @@ import regex
 import arrow
 
 import constantes
+from bot_metrics import metrics
+from executors import dump_json
+from loop_watchdog import loop_watchdog
+from sampling_profiler import profiler
 
 def stockePID():
     from os.path import join, dirname, abspath
@@ -61,6 +65,12 @@ welcomeTeam = 801958112173096990
 #users
 botAdmin = 619574125622722560
 
+#metrics (handler latencies, API calls, saves): Prometheus text file, and local endpoint on this port (None: off)
+metricsTextfile = "bot.prom"
+metricsPort: Optional[int] = 9102
+#live profiles taken with the profile command
+profilesFolder = os.path.join("outputs", "profiles")
+
 #info in json
 if "bot_info.json" in os.listdir(os.path.dirname(__file__)):
     with open("bot_info.json", "r") as f:
@@ -70,9 +80,9 @@ else:
     with open("bot_info.json", "w") as f:
         json.dump(info, f)
 
-def save():
-    with open("bot_info.json", "w") as f:
-        json.dump(info, f)
+async def save():
+    with metrics.timer("save_seconds", what="bot_info"):
+        await dump_json(info, "bot_info.json")
 
 
 def get_birthdays_storage():
@@ -516,7 +526,7 @@ async def count_banned_words(guild: discord.Guild, author: discord.Member, msg_t
         
         banned_words_user = info["banned_words"][authorId]
         banned_words_user.append((banned_word_used, time.time()))
-        save()
+        await save()
         
         punishment = {1: "nothing", 2: "nothing", 3: "3h of mute", 4: "6h of mute", 5: "24h of mute", 6: "48h of mute"}.get(len(banned_words_user), "1 week")
         
@@ -555,7 +565,7 @@ async def kekw_board(message: discord.Message, bot: commands.Bot):
         
         await message.forward(channelKewk)
         info["kekw_board"].add(message.id)
-        save()
+        await save()
 
 async def remove_recycle(message: discord.Message):
     if message.channel.id not in (memes, european_memes):
@@ -568,13 +578,14 @@ async def remove_recycle(message: discord.Message):
 def main():
     intents = discord.Intents.all()
     bot = commands.Bot(command_prefix=constantes.prefixVolt, help_command=None, intents = intents)
+    metrics.instrument(bot, "bot")
 
     @bot.event
     async def on_message(message):
         await bot.process_commands(message)
         if int(message.created_at.timestamp()) % 100 == 1: #purge the log of deleted-edited-message about every 100 messages
             await purge_log(None, bot.get_guild(voltServer))
-            save()
+            await save()
 
         await verif_word_train(message)
         await verif_news_source(message)
@@ -1029,8 +1040,15 @@ def main():
         await msg.create_thread(name=member.display_name, auto_archive_duration=1440)
         
 
+    async def reportToAdmin(text, files = None):
+        admin = await bot.fetch_user(botAdmin)
+        await (await dmChannelUser(admin)).send(text, files = files or [])
+
     @bot.event
     async def on_ready():
+        metrics.start(textfile=metricsTextfile, port=metricsPort)
+        loop_watchdog.start(report=reportToAdmin)
+
         if not birthday_announcer.is_running():
             birthday_announcer.start()
         
@@ -1128,7 +1146,7 @@ def main():
 
         assert interaction.user is not None
         birthdays[str(interaction.user.id)] = record
-        save()
+        await save()
 
         confirmation = (
             f"Saved! Your birthday is set as {day:02d}/{month:02d}"
@@ -1191,6 +1209,22 @@ def main():
             else:
                 await ctx.send("Someone has to start the count!", reference = ref)
 
+    @bot.command(name = "profile")
+    async def profile(ctx, seconds: int = 30):
+        if ctx.author.id != botAdmin:
+            return
+        if profiler.running:
+            await ctx.send("A profiling run is already in progress")
+            return
+
+        await ctx.message.add_reaction("⏳")
+        result = await profiler.profile(seconds, profilesFolder)
+        summary = "\n".join(result.summary)
+        if len(summary) > 1900:
+            summary = summary[:1900].rsplit("\n", 1)[0] + "\n…"
+        await reportToAdmin(f"```\n{summary}\n```", files = [discord.File(result.collapsed_path), discord.File(result.summary_path)])
+        await ctx.message.add_reaction("👌")
+
     @bot.command(name="react")
     async def react(ctx, *emojis: Union[discord.Emoji, str]):
         reference = ctx.message.reference
@@ -1221,7 +1255,7 @@ def main():
                 banned_words_user = info["banned_words"][userId]
                 if banned_words_user:
                     del banned_words_user[-1]
-                    save()
+                    await save()
                     
                     await ctx.message.add_reaction("👌")
 
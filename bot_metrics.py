@@ -0,0 +1,320 @@
+"""Metrics shared by the bots: where the time goes in production.
+
+The `metrics` registry keeps counters and latency histograms in memory:
+- handler_seconds: each event handler of the client (on_message, on_raw_reaction_add...)
+- discord_api_seconds / discord_api_errors_total: each REST call, by route
+- contest_mutation_seconds, save_seconds, board_render_seconds: what the handlers wait on
+- loop_lag_seconds, loop_stall_seconds: see loop_watchdog
+
+instrument() hooks a nextcord or discord.py client, start() exports everything in the
+Prometheus text format, to a file (for node_exporter's textfile collector) and on a local
+HTTP endpoint (http://127.0.0.1:<port>/metrics), and summary() is what the admin command shows.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from executors import executors
+
+logger = logging.getLogger("bot_metrics")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Upper bounds (seconds) of the latency histograms, from a cached lookup to a full board render
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+DESCRIPTIONS: Dict[str, str] = {
+    "handler_seconds": "Time from a gateway event to the end of its handler",
+    "discord_api_seconds": "Duration of the Discord REST calls, rate limit waits included",
+    "discord_api_errors_total": "Discord REST calls that failed, by status",
+    "contest_mutation_seconds": "Time spent computing a new contest state",
+    "save_seconds": "Time spent writing the bot's state to disk",
+    "board_render_seconds": "Time spent rendering a board",
+    "loop_lag_seconds": "How late the event loop runs a task that is due",
+    "loop_stall_seconds": "Event loop blocked longer than the watchdog threshold, by call site",
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram, like Prometheus'; also keeps the maximum."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the q quantile (0 to 1), interpolated inside its bucket like histogram_quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.max
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = min(self.buckets[i], self.max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / count
+            seen += count
+        return self.max
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms" if seconds >= 0.001 else f"{seconds * 1000:.1f}ms"
+    return f"{seconds:.1f}s"
+
+
+class Metrics:
+    """Registry of the counters and histograms of one bot.
+
+    Args:
+        namespace: Prefix of the exported metric names
+    """
+
+    def __init__(self, namespace: str = "voltbot"):
+        self.namespace = namespace
+        self.const_labels: Dict[str, str] = {}
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.started_at = time.time()
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._http: Any = None
+
+    # Recording ##############################################################
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        family = self.counters.setdefault(name, {})
+        family[key] = family.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: Any):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        family = self.histograms.setdefault(name, {})
+        if key not in family:
+            family[key] = Histogram()
+        family[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe how long the block takes (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, label: str = "operation") -> Callable[[F], F]:
+        """Decorator observing each call of a function (or coroutine function) in `name`,
+        labelled with the function's name."""
+        def decorator(func: F) -> F:
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with self.timer(name, **{label: func.__name__}):
+                        return await func(*args, **kwargs)
+                return async_wrapper  # type: ignore[return-value]
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.timer(name, **{label: func.__name__}):
+                    return func(*args, **kwargs)
+            return wrapper  # type: ignore[return-value]
+        return decorator
+
+    # Client hooks ###########################################################
+
+    def instrument(self, client: Any, bot: str):
+        """Time the event handlers and REST calls of a nextcord or discord.py client.
+
+        Call it once, when the client is created: handlers are timed from the gateway event
+        to their end, REST calls by route template (e.g. "POST /channels/{channel_id}/messages").
+        Interaction responses go through the webhook adapter and are not counted.
+
+        Args:
+            client: The client (or commands.Bot)
+            bot: Name of the bot, added as a label to every metric
+        """
+        self.const_labels["bot"] = bot
+
+        schedule_event = client._schedule_event
+
+        def timed_event(coro: Any, event_name: str, *args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            task = schedule_event(coro, event_name, *args, **kwargs)
+            task.add_done_callback(lambda _: self.observe("handler_seconds", time.perf_counter() - start, event=event_name))
+            return task
+
+        client._schedule_event = timed_event
+
+        request = client.http.request
+
+        async def timed_request(route: Any, **kwargs: Any) -> Any:
+            label = f"{route.method} {route.path}"
+            start = time.perf_counter()
+            try:
+                return await request(route, **kwargs)
+            except Exception as e:
+                self.inc("discord_api_errors_total", route=label, status=getattr(e, "status", type(e).__name__))
+                raise
+            finally:
+                self.observe("discord_api_seconds", time.perf_counter() - start, route=label)
+
+        client.http.request = timed_request
+
+    # Export #################################################################
+
+    def render(self) -> str:
+        """All the metrics in the Prometheus text exposition format."""
+        const = tuple(sorted(self.const_labels.items()))
+        lines: List[str] = []
+        for name, family in sorted(self.counters.items()):
+            full = f"{self.namespace}_{name}"
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {full} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {full} counter")
+            for labels, value in sorted(family.items()):
+                lines.append(f"{full}{_format_labels(const + labels)} {value:g}")
+        for name, family in sorted(self.histograms.items()):
+            full = f"{self.namespace}_{name}"
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {full} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {full} histogram")
+            for labels, histogram in sorted(family.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{full}_bucket{_format_labels(const + labels, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{full}_bucket{_format_labels(const + labels, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{full}_sum{_format_labels(const + labels)} {histogram.sum:.6f}")
+                lines.append(f"{full}_count{_format_labels(const + labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str, text: Optional[str] = None):
+        """Write render(), or `text` if it was rendered beforehand, to `path`, atomically (scrapers never see a half written file)."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render() if text is None else text)
+        os.replace(tmp, path)
+
+    async def _export_loop(self, path: str, interval: float):
+        while True:
+            try:
+                # Rendered on the event loop, where the metrics are updated, and written in the I/O pool
+                await executors.run_io(self.write_textfile, path, self.render())
+            except OSError as e:
+                logger.warning(f"Could not write the metrics to {path}: {e}")
+            await asyncio.sleep(interval)
+
+    async def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve render() on http://host:port/metrics."""
+        from aiohttp import web
+
+        async def handle(_: web.Request) -> web.Response:
+            return web.Response(text=self.render(), content_type="text/plain", charset="utf-8", headers={"X-Content-Type-Options": "nosniff"})
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError as e:
+            logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+            await runner.cleanup()
+            return
+        self._http = runner
+        logger.info(f"Metrics served on http://{host}:{port}/metrics")
+
+    def start(self, textfile: Optional[str] = None, port: Optional[int] = None, interval: float = 15.0):
+        """Start the exports in the background (no-op if they are already running).
+
+        Args:
+            textfile: Where to write the metrics every `interval` seconds
+            port: Local port of the HTTP endpoint
+            interval: Seconds between two writes of the text file
+        """
+        self._tasks = [task for task in self._tasks if not task.done()]
+        if self._tasks or self._http is not None:
+            return
+        if textfile:
+            self._tasks.append(asyncio.create_task(self._export_loop(textfile, interval)))
+        if port:
+            self._tasks.append(asyncio.create_task(self.serve(port)))
+
+    # Summary ################################################################
+
+    def summary(self, top: int = 8) -> List[str]:
+        """Lines for the admin command: per family, the series that took the most time in total."""
+        uptime = time.time() - self.started_at
+        lines = [f"Metrics of the last {uptime / 3600:.1f}h (p50/p95 estimated from buckets)"]
+        titles = {
+            "handler_seconds": "Event handlers",
+            "discord_api_seconds": "Discord API calls",
+            "contest_mutation_seconds": "Contest mutations",
+            "save_seconds": "Saves",
+            "board_render_seconds": "Board renders",
+            "loop_stall_seconds": "Event loop stalls",
+            "loop_lag_seconds": "Event loop lag",
+        }
+        for name in list(titles) + sorted(set(self.histograms) - set(titles)):
+            family = self.histograms.get(name)
+            if not family:
+                continue
+            lines.append("")
+            lines.append(f"{titles.get(name, name)}: {sum(h.count for h in family.values())} calls, {_format_seconds(sum(h.sum for h in family.values()))} in total")
+            ranked = sorted(family.items(), key=lambda item: item[1].sum, reverse=True)
+            for labels, histogram in ranked[:top]:
+                label = " ".join(value for _, value in labels) or name
+                lines.append(
+                    f"  {label[:48]:<48} {histogram.count:>7} "
+                    f"p50 {_format_seconds(histogram.quantile(0.5)):>6} p95 {_format_seconds(histogram.quantile(0.95)):>6} "
+                    f"max {_format_seconds(histogram.max):>6}"
+                )
+            if len(ranked) > top:
+                lines.append(f"  ... and {len(ranked) - top} more")
+        errors = self.counters.get("discord_api_errors_total", {})
+        if errors:
+            lines.append("")
+            lines.append(f"Discord API errors: {sum(errors.values()):g}")
+            for labels, count in sorted(errors.items(), key=lambda item: item[1], reverse=True)[:top]:
+                lines.append(f"  {' '.join(value for _, value in labels)[:56]:<56} {count:>7g}")
+        return lines
+
+
+metrics = Metrics()
@@ -1,11 +1,22 @@
 from cairosvg import svg2png
+from PIL import Image
 from math import ceil
 from random import shuffle
+import asyncio
 import csv
+import io
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from photo_contest.reveal_export import encode_reveal
+from executors import executors
 
 songs: list[str] = []
 
+#boards are rendered in memory; set this to a folder to also keep every svg/png on disk
+CACHE_DIR: str | None = None
+
 def load_songs_from_file(path: str) -> list[str]:
     with open(path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f, delimiter=';')
@@ -102,25 +113,38 @@ def genSvgUser(votes, currentPoints, username, changePoints = True, highlight_so
     
     printF("</svg>")
 
-    with open(os.path.join(os.path.dirname(__file__), "test.svg"), "w") as f:
-        f.write(svgCode[0])
-    
     return svgCode[0]
 
-pathPng = os.path.join(os.path.dirname(__file__), "test.png")
+def renderPng(svgCode: str, name: str) -> io.BytesIO:
+    """Render the svg in memory, as a png file-like object named `name`.png"""
+    png = io.BytesIO(svg2png(bytestring = svgCode))
+    png.name = name + ".png"
 
-def generateSvgs(semi: str):
+    if CACHE_DIR:
+        os.makedirs(CACHE_DIR, exist_ok = True)
+        with open(os.path.join(CACHE_DIR, name + ".svg"), "w") as f:
+            f.write(svgCode)
+        with open(os.path.join(CACHE_DIR, png.name), "wb") as f:
+            f.write(png.getvalue())
+
+    return png
+
+async def renderPngAsync(svgCode: str, name: str) -> io.BytesIO:
+    """renderPng in the render process pool"""
+    return await executors.run_render(renderPng, svgCode, name)
+
+def generateBoards(semi: str):
+    """Steps of the results show, as (svg code of the board, its name, current voter, next voter).
+    The standings come last, with the board of the results."""
     load_semi(semi)
     votes, voters = readVotes()
     shuffle(voters)
     currentPoints = {country: 0 for country in songs}
 
     for i, voter in enumerate(voters):
-        svg2png(bytestring = genSvgUser(votes, currentPoints, voter), write_to = pathPng)
-        yield pathPng, voter, voters[i+1] if i < len(voters)-1 else None
+        yield genSvgUser(votes, currentPoints, voter), f"votes_{semi}_{i+1}", voter, voters[i+1] if i < len(voters)-1 else None
     
-    svg2png(bytestring = genSvgUser(votes, currentPoints, "the jury"), write_to = pathPng)
-    yield pathPng, "jurors", None
+    yield genSvgUser(votes, currentPoints, "the jury"), f"votes_{semi}_jury", "jurors", None
 
     juryTop = sorted(currentPoints, key=lambda x: (currentPoints[x], -songs.index(x)))
     votesPublic = {song: points for song, voter, points in votes if voter == "public"}
@@ -131,14 +155,52 @@ def generateSvgs(semi: str):
         currentPoints[song] += votesPublicSong
         countedPublicVotes.append((song, "public", votesPublicSong))
 
-        svg2png(bytestring = genSvgUser(countedPublicVotes, currentPoints, "public", False, highlight_song = song), write_to = pathPng)
-        yield pathPng, "public", (song, votesPublicSong, jury_points)
+        yield genSvgUser(countedPublicVotes, currentPoints, "public", False, highlight_song = song), f"votes_{semi}_public_{i+1}", "public", (song, votesPublicSong, jury_points)
 
-    svg2png(bytestring = genSvgUser(votes, currentPoints, "the server"), write_to = pathPng)
-    yield pathPng, "results", None
+    results = genSvgUser(votes, currentPoints, "the server")
+    yield results, f"votes_{semi}_results", "results", None
 
     standings = sorted(currentPoints.items(), key=lambda x: (x[1], -songs.index(x[0])), reverse=True)
-    yield pathPng, "standings", standings
+    yield results, f"votes_{semi}_results", "standings", standings
+
+def generateSvgs(semi: str):
+    """Steps of the results show, as (png of the board, current voter, next voter)"""
+    pngs: dict[str, io.BytesIO] = {}
+    for svgCode, name, currentVoter, nextVoter in generateBoards(semi):
+        if name not in pngs:
+            pngs[name] = renderPng(svgCode, name)
+            yield pngs[name], currentVoter, nextVoter
+        else:
+            yield io.BytesIO(pngs[name].getvalue()), currentVoter, nextVoter
+
+async def generateSvgsAsync(semi: str):
+    """Same as generateSvgs, with all the boards rendered in parallel in the render process pool"""
+    steps = list(generateBoards(semi))
+    renders = {}
+    for svgCode, name, _, _ in steps:
+        if name not in renders:
+            renders[name] = asyncio.ensure_future(renderPngAsync(svgCode, name))
+
+    try:
+        seen = set()
+        for _, name, currentVoter, nextVoter in steps:
+            png = await renders[name]
+            yield (png if name not in seen else io.BytesIO(png.getvalue())), currentVoter, nextVoter
+            seen.add(name)
+    finally:
+        for render in renders.values():
+            render.cancel()
+
+def generateRecap(pngs: list[bytes], name: str, fmt: str = "webp") -> io.BytesIO:
+    """Encode the boards yielded by generateSvgs as a single file (animated webp/gif, or a zip of the frames)"""
+    frames = [Image.open(io.BytesIO(png)) for png in pngs]
+    recap = io.BytesIO(encode_reveal(frames, fmt))
+    recap.name = f"{name}.{fmt}"
+    return recap
+
+async def generateRecapAsync(pngs: list[bytes], name: str, fmt: str = "webp") -> io.BytesIO:
+    """generateRecap in the render process pool"""
+    return await executors.run_render(generateRecap, pngs, name, fmt)
 
 if __name__ == "__main__":
     for _ in generateSvgs("1"):
@@ -0,0 +1,192 @@
+"""Executors shared by the bots, to keep blocking and CPU-heavy work off the event loop.
+
+- `executors.run_io` runs blocking calls (file writes, hashing, thumbnails...) in a thread pool
+- `executors.run_render` runs CPU-bound renders (boards, svg → png, animations) in a process
+  pool; the functions registered with `executors.on_worker_start` run once in each worker
+- `SnapshotWriter` saves the successive states of some data to a file in the thread pool,
+  in order, writing only the latest state when several saves pile up
+- `dump_json` and `dump_pickle` serialize an object on the loop (a consistent snapshot, even
+  if it is mutated right after) and write it through a SnapshotWriter per file
+
+Both pools are created on first use, so importing this module is free.
+"""
+import asyncio
+import functools
+import json
+import logging
+import os
+import pickle
+import stat
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger("executors")
+
+T = TypeVar("T")
+
+
+def _start_worker(setups: List[Callable[[], Any]]):
+    for setup in setups:
+        setup()
+
+
+class Executors:
+    """A thread pool for blocking I/O and a process pool for render work.
+
+    Args:
+        io_workers: Threads of the I/O pool (None: the default of ThreadPoolExecutor)
+        render_workers: Processes of the render pool (None: one per CPU)
+    """
+
+    def __init__(self, io_workers: Optional[int] = None, render_workers: Optional[int] = None):
+        self.io_workers = io_workers
+        self.render_workers = render_workers
+        self._setups: List[Callable[[], Any]] = []
+        self._io: Optional[Executor] = None
+        self._render: Optional[Executor] = None
+
+    def on_worker_start(self, setup: Callable[[], Any]):
+        """Run `setup` (a picklable module-level function) in each render worker when it starts.
+
+        Workers that are already running are not affected.
+        """
+        if setup not in self._setups:
+            self._setups.append(setup)
+
+    @property
+    def io(self) -> Executor:
+        if self._io is None:
+            self._io = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io")
+        return self._io
+
+    @property
+    def render(self) -> Executor:
+        if self._render is None:
+            self._render = ProcessPoolExecutor(max_workers=self.render_workers, initializer=_start_worker, initargs=(list(self._setups),))
+        return self._render
+
+    async def run_io(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call in the I/O thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.io, functools.partial(func, *args, **kwargs))
+
+    async def run_render(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a CPU-bound call in the render process pool.
+
+        The function must be defined at module level, and its arguments and result picklable.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.render, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        """Stop both pools (pending renders are cancelled, pending writes are finished)."""
+        if self._render is not None:
+            self._render.shutdown(wait=False, cancel_futures=True)
+            self._render = None
+        if self._io is not None:
+            self._io.shutdown(wait=True)
+            self._io = None
+
+
+executors = Executors()
+
+
+def write_atomic(path: str, data: bytes):
+    """Write a file through a temporary file, so that readers never see it half written."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            fd = -1  # closed with f from now on
+            f.write(data)
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if fd != -1:
+            os.close(fd)
+        os.unlink(tmp_path)
+        raise
+
+
+class SnapshotWriter(Generic[T]):
+    """Writes the successive snapshots of some data in the I/O pool, one at a time and in order.
+
+    When snapshots are saved faster than they are written, the intermediate ones are
+    skipped: each snapshot holds the whole state, so writing the latest one is enough.
+    If a write fails, the saves it covered raise its error, and the snapshot stays
+    pending (see `latest`) until a later save writes it.
+
+    Args:
+        write: Writes a snapshot (called in the I/O pool)
+        name: Name of the data, for the logs
+    """
+
+    def __init__(self, write: Callable[[T], Any], name: str):
+        self.write = write
+        self.name = name
+        self.nb_saves = 0
+        self.nb_writes = 0
+        self._latest: Optional[T] = None
+        self._requested = 0
+        self._written = 0
+        self._next_write: "Optional[asyncio.Future[None]]" = None  # resolved by the next write
+        self._task: "Optional[asyncio.Task[None]]" = None
+
+    @property
+    def latest(self) -> Optional[T]:
+        """The newest snapshot that is not written yet (pending or failed), if any."""
+        return self._latest if self._written < self._requested else None
+
+    async def save(self, snapshot: T):
+        """Write `snapshot`, and return once it (or a newer snapshot) is written.
+
+        Raises:
+            Exception: The error of the write that covered this snapshot, if it failed
+        """
+        self._latest = snapshot
+        self._requested += 1
+        self.nb_saves += 1
+        if self._next_write is None:
+            self._next_write = asyncio.get_running_loop().create_future()
+            # Retrieved here in case every waiter was cancelled, so that asyncio does not warn
+            self._next_write.add_done_callback(lambda future: future.cancelled() or future.exception())
+        next_write = self._next_write
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        await asyncio.shield(next_write)
+
+    async def _run(self):
+        while self._next_write is not None:
+            next_write, self._next_write = self._next_write, None
+            target, snapshot = self._requested, self._latest
+            try:
+                await executors.run_io(self.write, snapshot)
+            except Exception as e:
+                logger.error(f"Could not save {self.name}: {e}")
+                next_write.set_exception(e)
+                continue
+            self.nb_writes += 1
+            self._written = max(self._written, target)
+            if self._written == self._requested:
+                self._latest = None
+            next_write.set_result(None)
+
+
+_file_writers: Dict[str, SnapshotWriter[bytes]] = {}
+
+
+async def save_bytes(path: str, data: bytes):
+    """Write `data` to `path` off the event loop, in order with the other saves of that file."""
+    if path not in _file_writers:
+        _file_writers[path] = SnapshotWriter(functools.partial(write_atomic, path), path)
+    await _file_writers[path].save(data)
+
+
+async def dump_json(obj: Any, path: str, **kwargs: Any):
+    """Async json.dump: the object is serialized at once, then written off the event loop."""
+    await save_bytes(path, json.dumps(obj, **kwargs).encode())
+
+
+async def dump_pickle(obj: Any, path: str):
+    """Async pickle.dump: the object is serialized at once, then written off the event loop."""
+    await save_bytes(path, pickle.dumps(obj))
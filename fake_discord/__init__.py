@@ -0,0 +1,10 @@
+"""Local stand-in for Discord, to run the bots end to end without a server.
+
+FakeDiscord answers the REST calls of a nextcord (or discord.py) client and feeds it
+gateway events for synthetic users; LoadStats collects what a load test measures.
+See photo_contest/load_scenario.py for a whole contest played against it.
+"""
+from fake_discord.server import EPHEMERAL, FakeDiscord, buttons
+from fake_discord.stats import LoadStats, percentile
+
+__all__ = ["EPHEMERAL", "FakeDiscord", "LoadStats", "buttons", "percentile"]
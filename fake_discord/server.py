@@ -0,0 +1,623 @@
+import asyncio
+import importlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import unquote
+
+from aiohttp import web
+
+from fake_discord.stats import LoadStats
+
+logger = logging.getLogger("fake_discord")
+
+DISCORD_EPOCH = 1420070400000
+
+# Message flag of the ephemeral interaction responses
+EPHEMERAL = 64
+
+
+@dataclass
+class FakeResponse:
+    """What the HTTPException of the client library reads from an HTTP response."""
+    status: int
+    reason: str
+
+
+class FakeDiscord:
+    """In-memory stand-in for the Discord REST API and gateway, for one guild.
+
+    attach() plugs it under a client of nextcord (or discord.py, which shares the same
+    HTTP and gateway layers): every REST call of the client is answered from the local
+    state instead of Discord, and the users of the scenario act through gateway events
+    fed to the client's own parsers (post, react, click, delete). Messages, threads,
+    reactions, DMs, attachments (served by a local CDN), views and interaction responses
+    are supported: what the bots use.
+
+    Each API call of the bot is counted by route in `stats`, and each handler's latency is
+    measured from the gateway event to the end of the handler (for views, to the
+    interaction response). Calls wait `api_latency` seconds, like a round trip to Discord;
+    rate limits are not simulated (the bots pace themselves).
+
+    Args:
+        guild_id: Id of the guild
+        channels: Text channels of the guild, id -> name
+        bot_id: Id of the bot user
+        api_latency: Seconds each API call takes
+        stats: Where to record the measures (a new LoadStats by default)
+    """
+
+    def __init__(
+        self,
+        guild_id: int,
+        channels: Dict[int, str],
+        bot_id: int = 1000,
+        api_latency: float = 0.03,
+        stats: Optional[LoadStats] = None,
+    ):
+        self.guild_id = guild_id
+        self.api_latency = api_latency
+        self.stats = stats or LoadStats()
+        self.client: Any = None
+        self.lib: Any = None
+
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self.roles: Dict[int, List[int]] = {}  # user id -> role ids
+        self.closed_dms: Set[int] = set()
+        self.channels: Dict[int, Dict[str, Any]] = {}
+        self.messages: Dict[int, Dict[str, Any]] = {}
+        self.history: Dict[int, List[int]] = {}  # channel id -> message ids, oldest first
+        self.reactions: Dict[int, Dict[str, List[int]]] = {}  # message id -> emoji -> user ids
+        self.dm_channels: Dict[int, int] = {}  # user id -> DM channel id
+        self.files: Dict[str, Tuple[bytes, str]] = {}  # CDN path -> (data, content type)
+        self.interactions: Dict[str, Dict[str, Any]] = {}  # token -> interaction
+
+        self._last_snowflake = 0
+        self._changed = asyncio.Condition()
+        self._cdn: Optional[web.AppRunner] = None
+        self.cdn_url = ""
+
+        self.bot_id = bot_id
+        self.add_user(bot_id, "bot", bot=True, roles=[bot_id])
+        for i, (channel_id, name) in enumerate(channels.items()):
+            self._add_channel({
+                "id": str(channel_id), "type": 0, "guild_id": str(guild_id), "name": name, "position": i,
+                "permission_overwrites": [], "nsfw": False, "parent_id": None, "topic": None,
+                "last_message_id": None, "rate_limit_per_user": 0,
+            })
+
+        self._routes: Dict[Tuple[str, str], Callable[..., Awaitable[Any]]] = {}
+        for method, path, handler in [
+            ("POST", "/channels/{channel_id}/messages", self._send_message),
+            ("GET", "/channels/{channel_id}/messages", self._get_history),
+            ("GET", "/channels/{channel_id}/messages/{message_id}", self._get_message),
+            ("PATCH", "/channels/{channel_id}/messages/{message_id}", self._edit_message),
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}", self._delete_message),
+            ("POST", "/channels/{channel_id}/messages/bulk-delete", self._bulk_delete),
+            ("PUT", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me", self._add_reaction),
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{member_id}", self._remove_reaction),
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}", self._clear_emoji),
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions", self._clear_reactions),
+            ("POST", "/channels/{channel_id}/threads", self._create_thread),
+            ("POST", "/channels/{channel_id}/messages/{message_id}/threads", self._create_thread),
+            ("GET", "/channels/{channel_id}", self._get_channel),
+            ("PATCH", "/channels/{channel_id}", self._edit_channel),
+            ("POST", "/channels/{channel_id}/typing", self._no_content),
+            ("GET", "/channels/{channel_id}/pins", self._get_pins),
+            ("PUT", "/channels/{channel_id}/pins/{message_id}", self._pin),
+            ("DELETE", "/channels/{channel_id}/pins/{message_id}", self._pin),
+            ("POST", "/users/@me/channels", self._open_dm),
+            ("GET", "/users/{user_id}", self._get_user),
+            ("GET", "/guilds/{guild_id}/members/{user_id}", self._get_member),
+            ("POST", "/interactions/{webhook_id}/{webhook_token}/callback", self._interaction_callback),
+            ("GET", "/webhooks/{webhook_id}/{webhook_token}/messages/@original", self._get_original),
+            ("PATCH", "/webhooks/{webhook_id}/{webhook_token}/messages/@original", self._edit_original),
+            ("POST", "/webhooks/{webhook_id}/{webhook_token}", self._followup),
+        ]:
+            self._routes[(method, path)] = handler
+        self._patterns = [(method, path, _path_pattern(path)) for method, path in self._routes]
+
+    # State ##################################################################
+
+    def snowflake(self) -> int:
+        """A new id, with the current time in it like Discord's."""
+        value = max((int(time.time() * 1000) - DISCORD_EPOCH) << 22, self._last_snowflake + 1)
+        self._last_snowflake = value
+        return value
+
+    def add_user(self, user_id: int, name: str, bot: bool = False, roles: Sequence[int] = (), dms_open: bool = True):
+        """Add a member to the guild (call before attach())."""
+        self.users[user_id] = {
+            "id": str(user_id), "username": name, "discriminator": "0", "global_name": name,
+            "avatar": None, "bot": bot,
+        }
+        self.roles[user_id] = list(roles)
+        if not dms_open:
+            self.closed_dms.add(user_id)
+
+    def _member(self, user_id: int) -> Dict[str, Any]:
+        return {
+            "user": self.users[user_id], "roles": [str(role) for role in self.roles.get(user_id, [])],
+            "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0, "nick": None,
+        }
+
+    def _add_channel(self, data: Dict[str, Any]):
+        self.channels[int(data["id"])] = data
+        self.history.setdefault(int(data["id"]), [])
+
+    def _guild_payload(self) -> Dict[str, Any]:
+        roles = [{
+            "id": str(self.guild_id), "name": "@everyone", "permissions": "1071698660929", "position": 0,
+            "color": 0, "hoist": False, "managed": False, "mentionable": False,
+        }]
+        for role_id in sorted({role for user_roles in self.roles.values() for role in user_roles}):
+            roles.append({
+                "id": str(role_id), "name": f"role {role_id}", "permissions": "8" if role_id == self.bot_id else "0",
+                "position": 1, "color": 0, "hoist": False, "managed": False, "mentionable": False,
+            })
+        return {
+            "id": str(self.guild_id), "name": "Fake guild", "owner_id": str(self.bot_id), "roles": roles,
+            "channels": [c for c in self.channels.values() if c["type"] == 0],
+            "threads": [c for c in self.channels.values() if c["type"] in (11, 12)],
+            "members": [self._member(user_id) for user_id in self.users],
+            "member_count": len(self.users), "features": [], "emojis": [], "stickers": [],
+            "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+            "mfa_level": 0, "afk_timeout": 300, "premium_tier": 0, "preferred_locale": "en-US",
+            "system_channel_flags": 0, "nsfw_level": 0, "large": False, "unavailable": False,
+        }
+
+    def _location(self, channel_id: int) -> Dict[str, Any]:
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            raise self._error(404, 10003, "Unknown Channel")
+        return channel
+
+    def _in_guild(self, channel_id: int) -> bool:
+        return "guild_id" in self.channels.get(channel_id, {})
+
+    def messages_in(self, channel_id: int) -> List[Dict[str, Any]]:
+        """Messages of a channel, thread or DM channel, oldest first."""
+        return [self.messages[message_id] for message_id in self.history.get(channel_id, [])]
+
+    def dms_of(self, user_id: int) -> List[Dict[str, Any]]:
+        """The DMs the bot sent to a user, oldest first."""
+        return self.messages_in(self.dm_channels[user_id]) if user_id in self.dm_channels else []
+
+    def reacted_by(self, message_id: int, emoji: str) -> List[int]:
+        return self.reactions.get(message_id, {}).get(emoji, [])
+
+    async def wait_for(self, predicate: Callable[[], Any], timeout: float = 30.0) -> Any:
+        """Wait until predicate() returns something truthy (checked whenever the bot changes a message)."""
+        async with self._changed:
+            return await asyncio.wait_for(self._changed.wait_for(predicate), timeout)
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    # Client side ############################################################
+
+    def attach(self, client: Any):
+        """Serve the REST calls and the gateway of client (before it is used)."""
+        self.client = client
+        self.lib = importlib.import_module(type(client).__module__.split(".")[0])
+        client.http.request = self.request
+        # Interaction responses don't go through client.http, but through the webhook adapter
+        importlib.import_module(f"{self.lib.__name__}.webhook.async_").async_context.get().request = self._webhook_request
+
+        state = client._connection
+        state.user = self.lib.ClientUser(state=state, data=self.users[self.bot_id])
+        state.application_id = self.bot_id
+        state._add_guild_from_data(self._guild_payload())
+
+        schedule_event = client._schedule_event
+
+        def timed_event(coro, event_name, *args, **kwargs):
+            start, phase = time.perf_counter(), self.stats.phase
+            task = schedule_event(coro, event_name, *args, **kwargs)
+            task.add_done_callback(lambda _: self.stats.latency(event_name, time.perf_counter() - start, phase))
+            return task
+
+        client._schedule_event = timed_event
+
+    async def start(self):
+        """Start the CDN of the attachments, then send READY to the client."""
+        app = web.Application()
+        app.router.add_get("/attachments/{path:.*}", self._serve_file)
+        self._cdn = web.AppRunner(app, access_log=None)
+        await self._cdn.setup()
+        site = web.TCPSite(self._cdn, "127.0.0.1", 0)
+        await site.start()
+        port = self._cdn.addresses[0][1]
+        self.cdn_url = f"http://127.0.0.1:{port}/attachments"
+
+        if hasattr(self.client, "_ready"):
+            self.client._ready.set()
+        self.client.dispatch("ready")
+
+    async def close(self):
+        if self._cdn is not None:
+            await self._cdn.cleanup()
+
+    async def _serve_file(self, request: web.Request) -> web.Response:
+        path = request.match_info["path"]
+        if path not in self.files:
+            return web.Response(status=404)
+        data, content_type = self.files[path]
+        return web.Response(body=data, content_type=content_type)
+
+    def _emit(self, event: str, data: Dict[str, Any]):
+        """Feed a gateway event to the client, like the websocket would."""
+        parser = self.client._connection.parsers.get(event)
+        if parser is not None:
+            parser(_wire(data))
+
+    def _emit_later(self, event: str, data: Dict[str, Any]):
+        # The gateway event of a REST call arrives after its response
+        asyncio.get_running_loop().call_soon(self._emit, event, data)
+
+    def _error(self, status: int, code: int, message: str) -> Exception:
+        kind = {403: "Forbidden", 404: "NotFound"}.get(status, "HTTPException")
+        return getattr(self.lib, kind)(FakeResponse(status, message), {"code": code, "message": message})
+
+    async def request(self, route: Any, *, files: Optional[Sequence[Any]] = None, form: Optional[List[Dict[str, Any]]] = None, json: Any = None, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+        """Replacement of client.http.request."""
+        payload = json
+        if form is not None:
+            payload = next((_json_loads(part["value"]) for part in form if part["name"] == "payload_json"), {})
+        return await self._dispatch(route, payload, files or [], params or {})
+
+    async def _webhook_request(self, route: Any, session: Any = None, *, payload: Any = None, multipart: Optional[List[Dict[str, Any]]] = None, files: Optional[Sequence[Any]] = None, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+        """Replacement of the webhook adapter's request (interaction responses)."""
+        if multipart:
+            payload = next((_json_loads(part["value"]) for part in multipart if part["name"] == "payload_json"), {})
+        return await self._dispatch(route, payload, files or [], params or {})
+
+    async def _dispatch(self, route: Any, payload: Any, files: Sequence[Any], params: Dict[str, Any]) -> Any:
+        path = route.url.split("/api/v", 1)[1]
+        path = unquote(path[path.index("/"):].split("?", 1)[0])
+        for method, template, pattern in self._patterns:
+            match = pattern.match(path) if method == route.method else None
+            if match:
+                self.stats.api_call(f"{method} {template}")
+                if self.api_latency:
+                    await asyncio.sleep(self.api_latency)
+                args = {k: (v if k in ("emoji", "webhook_token", "member_id") else int(v)) for k, v in match.groupdict().items()}
+                result = await self._routes[(method, template)](payload=payload or {}, files=files, params=params, **args)
+                await self._notify()
+                return _wire(result)
+        self.stats.api_call(f"unhandled {route.method} {route.path}")
+        raise self._error(404, 0, f"Not implemented by the fake: {route.method} {route.path}")
+
+    # REST routes ############################################################
+
+    def _attachments(self, channel_id: int, message_id: int, files: Sequence[Any]) -> List[Dict[str, Any]]:
+        attachments = []
+        for file in files:
+            data = file.fp.read()
+            path = f"{channel_id}/{self.snowflake()}/{file.filename}"
+            content_type = _content_type(file.filename)
+            self.files[path] = (data, content_type)
+            attachments.append({
+                "id": str(self.snowflake()), "filename": file.filename, "size": len(data),
+                "url": f"{self.cdn_url}/{path}", "proxy_url": f"{self.cdn_url}/{path}", "content_type": content_type,
+            })
+        return attachments
+
+    def _new_message(self, channel_id: int, author_id: int, payload: Dict[str, Any], attachments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        message_id = self.snowflake()
+        channel = self._location(channel_id)
+        message: Dict[str, Any] = {
+            "id": str(message_id), "channel_id": str(channel_id), "author": self.users[author_id],
+            "content": payload.get("content") or "", "timestamp": datetime.now(timezone.utc).isoformat(),
+            "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": attachments, "embeds": payload.get("embeds") or [], "components": payload.get("components") or [],
+            "pinned": False, "type": 19 if payload.get("message_reference") else 0, "flags": payload.get("flags") or 0,
+        }
+        if payload.get("message_reference"):
+            # Discord answers with its ids as strings, whatever the client sent
+            message["message_reference"] = {
+                key: str(value) if key.endswith("_id") and value is not None else value
+                for key, value in payload["message_reference"].items()
+            }
+        if "guild_id" in channel:
+            message["guild_id"] = channel["guild_id"]
+            message["member"] = {k: v for k, v in self._member(author_id).items() if k != "user"}
+        self.messages[message_id] = message
+        self.history[channel_id].append(message_id)
+        channel["last_message_id"] = str(message_id)
+        return message
+
+    def _message(self, channel_id: int, message_id: int) -> Dict[str, Any]:
+        message = self.messages.get(message_id)
+        if message is None or int(message["channel_id"]) != channel_id:
+            raise self._error(404, 10008, "Unknown Message")
+        return message
+
+    async def _send_message(self, channel_id: int, payload: Dict[str, Any], files: Sequence[Any], **_: Any) -> Dict[str, Any]:
+        channel = self._location(channel_id)
+        if channel["type"] == 1 and int(channel["recipients"][0]["id"]) in self.closed_dms:
+            raise self._error(403, 50007, "Cannot send messages to this user")
+        message = self._new_message(channel_id, self.bot_id, payload, [])
+        message["attachments"] = self._attachments(channel_id, int(message["id"]), files)
+        self._emit_later("MESSAGE_CREATE", message)
+        return message
+
+    async def _get_history(self, channel_id: int, params: Dict[str, Any], **_: Any) -> List[Dict[str, Any]]:
+        self._location(channel_id)
+        ids = self.history[channel_id]
+        if params.get("before"):
+            ids = [i for i in ids if i < int(params["before"])]
+        if params.get("after"):
+            ids = [i for i in ids if i > int(params["after"])]
+        limit = int(params.get("limit", 50))
+        return [self.messages[i] for i in reversed(ids)][:limit]
+
+    async def _get_message(self, channel_id: int, message_id: int, **_: Any) -> Dict[str, Any]:
+        return self._message(channel_id, message_id)
+
+    def _apply_edit(self, message: Dict[str, Any], payload: Dict[str, Any], files: Sequence[Any]):
+        for key in ("content", "embeds", "components", "flags"):
+            if key in payload:
+                message[key] = payload[key] if payload[key] is not None else ([] if key != "content" else "")
+        if "attachments" in payload:
+            kept = {str(a.get("id")) for a in payload["attachments"]}
+            message["attachments"] = [a for a in message["attachments"] if a["id"] in kept]
+        if files:
+            message["attachments"] += self._attachments(int(message["channel_id"]), int(message["id"]), files)
+        message["edited_timestamp"] = datetime.now(timezone.utc).isoformat()
+        self._emit_later("MESSAGE_UPDATE", message)
+
+    async def _edit_message(self, channel_id: int, message_id: int, payload: Dict[str, Any], files: Sequence[Any], **_: Any) -> Dict[str, Any]:
+        message = self._message(channel_id, message_id)
+        if int(message["author"]["id"]) != self.bot_id:
+            raise self._error(403, 50005, "Cannot edit a message authored by another user")
+        self._apply_edit(message, payload, files)
+        return message
+
+    def _drop_message(self, channel_id: int, message_id: int):
+        message = self.messages.pop(message_id)
+        self.history[channel_id].remove(message_id)
+        self.reactions.pop(message_id, None)
+        data = {"id": str(message_id), "channel_id": str(channel_id)}
+        if "guild_id" in message:
+            data["guild_id"] = message["guild_id"]
+        self._emit_later("MESSAGE_DELETE", data)
+
+    async def _delete_message(self, channel_id: int, message_id: int, **_: Any):
+        self._message(channel_id, message_id)
+        self._drop_message(channel_id, message_id)
+
+    async def _bulk_delete(self, channel_id: int, payload: Dict[str, Any], **_: Any):
+        for message_id in payload.get("messages", []):
+            if int(message_id) in self.messages:
+                self._drop_message(channel_id, int(message_id))
+
+    def _reaction_event(self, channel_id: int, message_id: int, user_id: int, emoji: str) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "user_id": str(user_id), "channel_id": str(channel_id), "message_id": str(message_id),
+            "emoji": {"id": None, "name": emoji}, "type": 0, "burst": False,
+        }
+        if self._in_guild(channel_id):
+            data["guild_id"] = str(self.guild_id)
+            data["member"] = self._member(user_id)
+        return data
+
+    async def _add_reaction(self, channel_id: int, message_id: int, emoji: str, **_: Any):
+        self._message(channel_id, message_id)
+        users = self.reactions.setdefault(message_id, {}).setdefault(emoji, [])
+        if self.bot_id not in users:
+            users.append(self.bot_id)
+            self._emit_later("MESSAGE_REACTION_ADD", self._reaction_event(channel_id, message_id, self.bot_id, emoji))
+
+    async def _remove_reaction(self, channel_id: int, message_id: int, emoji: str, member_id: str, **_: Any):
+        self._message(channel_id, message_id)
+        user_id = self.bot_id if member_id == "@me" else int(member_id)
+        users = self.reactions.get(message_id, {}).get(emoji, [])
+        if user_id in users:
+            users.remove(user_id)
+            self._emit_later("MESSAGE_REACTION_REMOVE", self._reaction_event(channel_id, message_id, user_id, emoji))
+
+    async def _clear_emoji(self, channel_id: int, message_id: int, emoji: str, **_: Any):
+        self._message(channel_id, message_id)
+        self.reactions.get(message_id, {}).pop(emoji, None)
+
+    async def _clear_reactions(self, channel_id: int, message_id: int, **_: Any):
+        self._message(channel_id, message_id)
+        self.reactions.pop(message_id, None)
+
+    async def _create_thread(self, channel_id: int, payload: Dict[str, Any], message_id: Optional[int] = None, **_: Any) -> Dict[str, Any]:
+        parent = self._location(channel_id)
+        thread_id = message_id if message_id is not None else self.snowflake()
+        thread = {
+            "id": str(thread_id), "guild_id": parent["guild_id"], "parent_id": str(channel_id), "owner_id": str(self.bot_id),
+            "name": payload.get("name", "thread"), "type": payload.get("type", 11), "last_message_id": None,
+            "message_count": 0, "member_count": 1, "rate_limit_per_user": 0, "flags": 0,
+            "thread_metadata": {
+                "archived": False, "auto_archive_duration": payload.get("auto_archive_duration", 1440),
+                "archive_timestamp": datetime.now(timezone.utc).isoformat(), "locked": False,
+            },
+        }
+        self._add_channel(thread)
+        self._emit_later("THREAD_CREATE", dict(thread, newly_created=True))
+        return thread
+
+    async def _get_channel(self, channel_id: int, **_: Any) -> Dict[str, Any]:
+        return self._location(channel_id)
+
+    async def _edit_channel(self, channel_id: int, payload: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        channel = self._location(channel_id)
+        for key, value in payload.items():
+            if key in ("archived", "locked", "auto_archive_duration") and "thread_metadata" in channel:
+                channel["thread_metadata"][key] = value
+            else:
+                channel[key] = value
+        self._emit_later("THREAD_UPDATE" if "thread_metadata" in channel else "CHANNEL_UPDATE", channel)
+        return channel
+
+    async def _no_content(self, **_: Any):
+        return None
+
+    async def _get_pins(self, channel_id: int, **_: Any) -> List[Dict[str, Any]]:
+        return [message for message in self.messages_in(channel_id) if message["pinned"]]
+
+    async def _pin(self, channel_id: int, message_id: int, **_: Any):
+        message = self._message(channel_id, message_id)
+        message["pinned"] = not message["pinned"]
+
+    async def _open_dm(self, payload: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        user_id = int(payload["recipient_id"])
+        if user_id not in self.users:
+            raise self._error(404, 10013, "Unknown User")
+        if user_id not in self.dm_channels:
+            channel_id = self.snowflake()
+            self._add_channel({"id": str(channel_id), "type": 1, "recipients": [self.users[user_id]], "last_message_id": None})
+            self.dm_channels[user_id] = channel_id
+        return self.channels[self.dm_channels[user_id]]
+
+    async def _get_user(self, user_id: int, **_: Any) -> Dict[str, Any]:
+        if user_id not in self.users:
+            raise self._error(404, 10013, "Unknown User")
+        return self.users[user_id]
+
+    async def _get_member(self, guild_id: int, user_id: int, **_: Any) -> Dict[str, Any]:
+        if user_id not in self.users:
+            raise self._error(404, 10007, "Unknown Member")
+        return self._member(user_id)
+
+    def _interaction(self, token: str) -> Dict[str, Any]:
+        if token not in self.interactions:
+            raise self._error(404, 10062, "Unknown interaction")
+        return self.interactions[token]
+
+    def _responded(self, interaction: Dict[str, Any]):
+        if not interaction["responded"]:
+            interaction["responded"] = True
+            self.stats.latency("interaction", time.perf_counter() - interaction["emitted_at"], interaction["phase"])
+
+    async def _interaction_callback(self, webhook_token: str, payload: Dict[str, Any], files: Sequence[Any], **_: Any):
+        interaction = self._interaction(webhook_token)
+        self._responded(interaction)
+        kind, data = payload.get("type"), payload.get("data") or {}
+        if kind == 4:  # message in the channel of the interaction
+            message = self._new_message(interaction["channel_id"], self.bot_id, data, [])
+            message["attachments"] = self._attachments(interaction["channel_id"], int(message["id"]), files)
+            interaction["original"] = int(message["id"])
+            if not data.get("flags", 0) & EPHEMERAL:
+                self._emit_later("MESSAGE_CREATE", message)
+        elif kind == 7:  # edit of the message of the component
+            message = self.messages.get(interaction["message_id"])
+            if message is not None:
+                self._apply_edit(message, data, files)
+            interaction["original"] = interaction["message_id"]
+        elif kind == 9:  # modal, kept for the scenario to submit it
+            interaction["modal"] = data
+
+    async def _get_original(self, webhook_token: str, **_: Any) -> Dict[str, Any]:
+        interaction = self._interaction(webhook_token)
+        if interaction.get("original") not in self.messages:
+            raise self._error(404, 10008, "Unknown Message")
+        return self.messages[interaction["original"]]
+
+    async def _edit_original(self, webhook_token: str, payload: Dict[str, Any], files: Sequence[Any], **_: Any) -> Dict[str, Any]:
+        interaction = self._interaction(webhook_token)
+        if interaction.get("original") not in self.messages:
+            # Response of a deferred interaction
+            message = self._new_message(interaction["channel_id"], self.bot_id, payload, [])
+            interaction["original"] = int(message["id"])
+        message = self.messages[interaction["original"]]
+        self._apply_edit(message, payload, files)
+        return message
+
+    async def _followup(self, webhook_token: str, payload: Dict[str, Any], files: Sequence[Any], **_: Any) -> Dict[str, Any]:
+        interaction = self._interaction(webhook_token)
+        self._responded(interaction)
+        message = self._new_message(interaction["channel_id"], self.bot_id, payload, [])
+        message["attachments"] = self._attachments(interaction["channel_id"], int(message["id"]), files)
+        if not payload.get("flags", 0) & EPHEMERAL:
+            self._emit_later("MESSAGE_CREATE", message)
+        return message
+
+    # User side ##############################################################
+
+    def post(self, user_id: int, channel_id: int, content: str = "", files: Sequence[Tuple[str, bytes]] = ()) -> int:
+        """A user posts a message (with attachments given as (filename, data)). Returns its id."""
+        message = self._new_message(channel_id, user_id, {"content": content}, [])
+        for filename, data in files:
+            path = f"{channel_id}/{message['id']}/{filename}"
+            self.files[path] = (data, _content_type(filename))
+            message["attachments"].append({
+                "id": str(self.snowflake()), "filename": filename, "size": len(data),
+                "url": f"{self.cdn_url}/{path}", "proxy_url": f"{self.cdn_url}/{path}", "content_type": _content_type(filename),
+            })
+        self._emit("MESSAGE_CREATE", message)
+        return int(message["id"])
+
+    def react(self, user_id: int, channel_id: int, message_id: int, emoji: str):
+        """A user adds a reaction."""
+        self._message(channel_id, message_id)
+        users = self.reactions.setdefault(message_id, {}).setdefault(emoji, [])
+        if user_id not in users:
+            users.append(user_id)
+        self._emit("MESSAGE_REACTION_ADD", self._reaction_event(channel_id, message_id, user_id, emoji))
+
+    def delete(self, channel_id: int, message_id: int):
+        """A user (or a moderator) deletes a message."""
+        self._message(channel_id, message_id)
+        self._drop_message(channel_id, message_id)
+
+    def click(self, user_id: int, message_id: int, custom_id: str) -> str:
+        """A user clicks a button of a message of the bot. Returns the interaction token."""
+        message = self.messages[message_id]
+        channel_id = int(message["channel_id"])
+        interaction_id = self.snowflake()
+        token = f"token-{interaction_id}"
+        self.interactions[token] = {
+            "channel_id": channel_id, "message_id": message_id, "responded": False,
+            "emitted_at": time.perf_counter(), "phase": self.stats.phase,
+        }
+        data: Dict[str, Any] = {
+            "id": str(interaction_id), "application_id": str(self.bot_id), "type": 3, "token": token, "version": 1,
+            "channel_id": str(channel_id), "data": {"custom_id": custom_id, "component_type": 2},
+            "message": message, "locale": "en-US", "app_permissions": "0",
+        }
+        if self._in_guild(channel_id):
+            data["guild_id"] = str(self.guild_id)
+            data["member"] = dict(self._member(user_id), permissions="0")
+        else:
+            data["user"] = self.users[user_id]
+        self._emit("INTERACTION_CREATE", data)
+        return token
+
+
+def buttons(message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The buttons of a message, in order."""
+    return [item for row in message.get("components", []) for item in row.get("components", []) if item.get("type") == 2]
+
+
+def _path_pattern(template: str) -> "re.Pattern[str]":
+    """Regex matching the paths of a route template, e.g. /channels/{channel_id}/messages."""
+    parts = re.split(r"\{(\w+)\}", template)
+    return re.compile("^" + "".join(
+        re.escape(part) if i % 2 == 0 else f"(?P<{part}>[^/]+)" for i, part in enumerate(parts)
+    ) + "$")
+
+
+def _wire(data: Any) -> Any:
+    """A copy of a payload, as it would come out of the network (the library mutates what it parses)."""
+    return json.loads(json.dumps(data)) if data is not None else None
+
+
+def _json_loads(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _content_type(filename: str) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower()
+    return {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "webp": "image/webp", "gif": "image/gif"}.get(
+        extension, "application/octet-stream"
+    )
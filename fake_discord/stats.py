@@ -0,0 +1,65 @@
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q between 0 and 100)."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+class LoadStats:
+    """Measures of a load test, split by phase.
+
+    For each phase: the number of API calls the bot made (by route, e.g.
+    "POST /channels/{channel_id}/messages"), and the latencies of its handlers
+    (from the gateway event to the end of the handler, by event name).
+    """
+
+    def __init__(self):
+        self.phase = "setup"
+        self.phases: List[str] = ["setup"]
+        self.calls: Dict[str, Counter] = defaultdict(Counter)
+        self.latencies: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        self.durations: Dict[str, float] = {}
+        self._phase_start = time.perf_counter()
+
+    def start_phase(self, name: str):
+        self.durations[self.phase] = self.durations.get(self.phase, 0.0) + time.perf_counter() - self._phase_start
+        self.phase = name
+        self._phase_start = time.perf_counter()
+        if name not in self.phases:
+            self.phases.append(name)
+
+    def api_call(self, route: str):
+        self.calls[self.phase][route] += 1
+
+    def latency(self, event: str, seconds: float, phase: Optional[str] = None):
+        self.latencies[phase or self.phase][event].append(seconds)
+
+    def report(self) -> str:
+        """Text summary: per phase, the duration, latency percentiles and API calls."""
+        self.start_phase(self.phase)  # close the running phase's duration
+        lines = []
+        for phase in self.phases:
+            calls = self.calls.get(phase, Counter())
+            latencies = self.latencies.get(phase, {})
+            if not calls and not latencies:
+                continue
+            lines.append(f"== {phase} ({self.durations.get(phase, 0.0):.1f}s, {sum(calls.values())} API calls)")
+            for event, values in sorted(latencies.items()):
+                values = sorted(values)
+                lines.append(
+                    f"   {event:<28} n={len(values):<6} p50={percentile(values, 50) * 1000:8.1f}ms "
+                    f"p95={percentile(values, 95) * 1000:8.1f}ms p99={percentile(values, 99) * 1000:8.1f}ms "
+                    f"max={values[-1] * 1000:8.1f}ms"
+                )
+            for route, count in calls.most_common():
+                lines.append(f"   {count:>7}  {route}")
+        total = sum(sum(calls.values()) for calls in self.calls.values())
+        lines.append(f"== total: {total} API calls")
+        return "\n".join(lines)
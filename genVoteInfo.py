@@ -1,18 +1,14 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from typing import Dict, List, Optional, Set, Tuple
 from random import shuffle
 from math import ceil
 
+from photo_contest.assets import fonts, get_logo
+
 BG_COLOR = "#502379"
 Submission = Tuple[str, int, int]
 PhotoId = Tuple[int, str, str, int] #photo #, url, local path and id of the author
 
-fnt_light = ImageFont.truetype('resource/Ubuntu-Light.ttf', 15)
-fnt_italic = ImageFont.truetype('resource/Ubuntu-LightItalic.ttf', 15)
-fnt_regular = ImageFont.truetype('resource/Ubuntu-Regular.ttf', 20)
-fnt_bold_small = ImageFont.truetype('resource/Ubuntu-Bold.ttf', 20)
-fnt_bold = ImageFont.truetype('resource/Ubuntu-Bold.ttf', 30)
-
 points_full = [12, 10, 8, 7, 6, 5, 4, 3, 2, 1]
 points_part = [7, 5, 3, 2, 1, 0]
 
@@ -23,12 +19,11 @@ def genSemiThread(channel_name: str, photo_id: PhotoId, id2name: Dict[int, str],
     d = ImageDraw.Draw(img) #draw on the image
 
     title = f"Photo #{photo_num} in {channel_name}" + ("#"+thread_name if thread_name else "")
-    d.text((375, 20), title, anchor="mt", font=fnt_bold if len(title) < 46 else fnt_bold_small, fill="white")
-    d.text((375, 50), f"submitted by {id2name[photo_author]}", anchor="mt", font=fnt_italic, fill="white")
+    d.text((375, 20), title, anchor="mt", font=fonts.bold if len(title) < 46 else fonts.bold_small, fill="white")
+    d.text((375, 50), f"submitted by {id2name[photo_author]}", anchor="mt", font=fonts.italic, fill="white")
 
     #volt logo
-    logo = Image.open("resource/logo_volt.png")
-    img.paste(logo.resize((150, 150)), (585, 435))
+    img.paste(get_logo(150), (585, 435))
 
     #snippet of the photo
     img_snippet = Image.open(photo_path)
@@ -48,9 +43,9 @@ def genSemiThread(channel_name: str, photo_id: PhotoId, id2name: Dict[int, str],
             points_per_juror[id2name[voter_id]] = ranking
     total_jury_points = sum(points_per_juror.values())
     
-    d.text((50, 365), f"{total_jury_points} point{'s' if total_jury_points != 1 else ''} from the jury", anchor="lt", font=fnt_bold_small, fill="white")
+    d.text((50, 365), f"{total_jury_points} point{'s' if total_jury_points != 1 else ''} from the jury", anchor="lt", font=fonts.bold_small, fill="white")
     for i, (juror, points) in enumerate(sorted(points_per_juror.items(), key=lambda x: x[1], reverse=True)):
-        fnt = fnt_bold_small if points == 12 else (fnt_regular if points in (8, 10) else fnt_light)
+        fnt = fonts.bold_small if points == 12 else (fonts.regular if points in (8, 10) else fonts.light)
         d.text((50, 395+i*25), f"{points} point{'s' if points != 1 else ''} from {juror}", anchor="lt", fill="white", font=fnt)
 
     #global votes
@@ -61,9 +56,9 @@ def genSemiThread(channel_name: str, photo_id: PhotoId, id2name: Dict[int, str],
             points_per_voter[voter] = points_per_voter.get(voter, 0) + 1
     total_points = sum(points_per_voter.values())
 
-    d.text((400, 100), f"{total_points} point{'s' if total_points != 1 else ''} from the global vote", anchor="lt", font=fnt_bold_small, fill="white")
+    d.text((400, 100), f"{total_points} point{'s' if total_points != 1 else ''} from the global vote", anchor="lt", font=fonts.bold_small, fill="white")
     for i, (voter, points) in enumerate(sorted(points_per_voter.items(), key=lambda x: x[1], reverse=True)):
-        fnt = fnt_bold_small if points == 3 else (fnt_regular if points == 2 else fnt_light)
+        fnt = fonts.bold_small if points == 3 else (fonts.regular if points == 2 else fonts.light)
         d.text((400, 135+i*25), f"{points} point{'s' if points != 1 else ''} from {voter}", anchor="lt", fill="white", font=fnt)
 
     img.save(photo_path+"_result.png")
@@ -82,11 +77,10 @@ def genVoteAnimFinal(channel_name: str, sub2photoid: Dict[Submission, int], id2n
         d = ImageDraw.Draw(img)
 
         title = f"Winner for {channel_name}"
-        d.text((375, 20), title, anchor="mt", font=fnt_bold, fill="white")
+        d.text((375, 20), title, anchor="mt", font=fonts.bold, fill="white")
 
         #volt logo
-        logo = Image.open("resource/logo_volt.png")
-        img.paste(logo.resize((150, 150)), (585, 435))
+        img.paste(get_logo(150), (585, 435))
 
         return img, d
 
@@ -117,22 +111,22 @@ def genVoteAnimFinal(channel_name: str, sub2photoid: Dict[Submission, int], id2n
             title = f"Photo #{sub2photoid[sub]}"
             x_title = 50 if i < half_nb_entries else 400
             y = 150 + 125 * (i % half_nb_entries)
-            d.text((x_title, y), title, anchor="lm", font=fnt_bold, fill="white")
-            d.text((x_title + 325, y), str(nbP), anchor="rm", font=fnt_bold, fill="white")
+            d.text((x_title, y), title, anchor="lm", font=fonts.bold, fill="white")
+            d.text((x_title + 325, y), str(nbP), anchor="rm", font=fonts.bold, fill="white")
             
             if i == 0: #underline the winner
-                x1, _, x2, y2 = d.textbbox((x_title, y), title, anchor="lm", font=fnt_bold)
+                x1, _, x2, y2 = d.textbbox((x_title, y), title, anchor="lm", font=fonts.bold)
                 d.line((x1, y2+5, x2, y2+5), width=2, fill="white")
 
             if new_points.get(sub):
                 nbP = new_points[sub]
-                d.text((x_title + 250, y), str(nbP), anchor="lm", font=fnt_bold if nbP == points[0] else (fnt_bold_small if nbP == points[1] else fnt_regular), fill="white")
+                d.text((x_title + 250, y), str(nbP), anchor="lm", font=fonts.bold if nbP == points[0] else (fonts.bold_small if nbP == points[1] else fonts.regular), fill="white")
 
     #initial score board
     img, d = drawBase()
     for i in range(len(points)):
-        d.text((50 + 350 * (i >= half_nb_entries), 150 + 125 * (i % half_nb_entries)), f"Photo #{i+1}", anchor="lm", font=fnt_bold, fill="white")
-        d.text((375 + 350 * (i < half_nb_entries), 150 + 125 * (i % half_nb_entries)), "0", anchor="rm", font=fnt_bold, fill="white")
+        d.text((50 + 350 * (i >= half_nb_entries), 150 + 125 * (i % half_nb_entries)), f"Photo #{i+1}", anchor="lm", font=fonts.bold, fill="white")
+        d.text((375 + 350 * (i < half_nb_entries), 150 + 125 * (i % half_nb_entries)), "0", anchor="rm", font=fonts.bold, fill="white")
     
     img.save(save_file)
     yield save_file, None
@@ -140,7 +134,7 @@ def genVoteAnimFinal(channel_name: str, sub2photoid: Dict[Submission, int], id2n
     #votes of each voter
     for i, (voter, _) in enumerate(ordered_votes):
         img, d = drawBase()
-        d.text((375, 60), f"Votes by {id2name[voter]}", anchor="mt", font=fnt_bold_small, fill="white")
+        d.text((375, 60), f"Votes by {id2name[voter]}", anchor="mt", font=fonts.bold_small, fill="white")
 
         glob, jury, new_points = partialPoints(i)
         drawPoints(d, glob, jury, new_points)
@@ -150,7 +144,7 @@ def genVoteAnimFinal(channel_name: str, sub2photoid: Dict[Submission, int], id2n
     
     #final results
     img, d = drawBase()
-    d.text((375, 60), "Final results", anchor="mt", font=fnt_bold, fill="white")
+    d.text((375, 60), "Final results", anchor="mt", font=fonts.bold, fill="white")
     drawPoints(d, *partialPoints())
 
     img.save(save_file)
@@ -0,0 +1,210 @@
+"""Watchdog of the asyncio event loop: finds the blocking calls that freeze a bot.
+
+A heartbeat task measures how late the loop wakes it up (the loop lag). When the loop
+is blocked for longer than a threshold, a watcher thread captures the stack of the loop
+thread while it is still blocked, so the stall is attributed to the code that caused it
+(the innermost frame of the bots' own code, e.g. `photo_contest_data.py:1381 in save`).
+Stalls are aggregated by call site, recorded in bot_metrics (loop_lag_seconds,
+loop_stall_seconds), and reported periodically (e.g. to the organizer).
+
+For tests and load runs, check() raises LoopStalled if the loop stalled at all.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bot_metrics import metrics
+
+logger = logging.getLogger("loop_watchdog")
+
+# Code of the bots: stalls are attributed to the innermost frame in there
+REPOSITORY = os.path.dirname(os.path.abspath(__file__))
+
+
+class LoopStalled(AssertionError):
+    """The event loop was blocked for longer than the threshold (raised by check())."""
+
+
+@dataclass
+class Offender:
+    """Stalls caused by one call site.
+
+    Attributes:
+        site: Innermost frame of the bots' code, e.g. "bot.py:211 in verif_news_source"
+        blocked_in: Innermost frame of the stack, where the loop actually waited
+        count: Number of stalls
+        total: Seconds the loop was blocked in total
+        longest: Longest stall, in seconds
+        stack: Stack of the longest stall: the frames of the bots' code, then where it blocked
+    """
+    site: str
+    blocked_in: str = ""
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+
+def _describe(frame: traceback.FrameSummary) -> str:
+    filename = frame.filename
+    if filename.startswith(REPOSITORY + os.sep):
+        filename = os.path.relpath(filename, REPOSITORY)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{frame.lineno} in {frame.name}"
+
+
+def _is_own_code(frame: traceback.FrameSummary) -> bool:
+    return (
+        frame.filename.startswith(REPOSITORY + os.sep)
+        and "site-packages" not in frame.filename
+        and os.path.abspath(frame.filename) != os.path.abspath(__file__)
+    )
+
+
+class LoopWatchdog:
+    """Measures the lag of the running event loop and pinpoints what blocks it.
+
+    Args:
+        threshold: Seconds the loop may be blocked before it counts as a stall
+        interval: Seconds between two heartbeats
+        report_interval: Seconds between two reports of the new stalls
+    """
+
+    def __init__(self, threshold: float = 0.5, interval: float = 0.1, report_interval: float = 600.0):
+        self.threshold = threshold
+        self.interval = interval
+        self.report_interval = report_interval
+        self.offenders: Dict[str, Offender] = {}
+        self.nb_stalls = 0
+        self._reported: Dict[str, tuple] = {}  # site -> (stalls, seconds) already reported
+        self._beat = time.monotonic()
+        self._captured: Optional[tuple] = None  # (heartbeat, stack) taken by the watcher during a stall
+        self._loop_thread: Optional[int] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    # Detection ##############################################################
+
+    def _watch(self):
+        """Watcher thread: grab the loop thread's stack once the heartbeat is late enough."""
+        while not self._stop.wait(self.interval / 2):
+            beat = self._beat
+            if time.monotonic() - beat < self.interval + self.threshold:
+                continue
+            if self._captured is not None and self._captured[0] == beat:
+                continue  # this stall is already captured
+            frame = sys._current_frames().get(self._loop_thread)  # type: ignore[arg-type]
+            if frame is not None:
+                self._captured = (beat, traceback.extract_stack(frame))
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - start - self.interval)
+            metrics.observe("loop_lag_seconds", lag)
+            if lag >= self.threshold:
+                captured = self._captured
+                self._record(lag, captured[1] if captured is not None and captured[0] == start else None)
+
+    def _record(self, seconds: float, stack: Optional[traceback.StackSummary]):
+        if stack:
+            own = [frame for frame in stack if _is_own_code(frame)]
+            site = _describe(own[-1]) if own else _describe(stack[-1])
+            blocked_in = _describe(stack[-1])
+        else:
+            # Too short for the watcher, or the loop thread held the GIL all along
+            site, blocked_in = "unknown", ""
+        offender = self.offenders.setdefault(site, Offender(site))
+        offender.count += 1
+        offender.total += seconds
+        if seconds >= offender.longest:
+            offender.longest = seconds
+            offender.blocked_in = blocked_in or offender.blocked_in
+            if stack:
+                offender.stack = [_describe(frame) for frame in stack if _is_own_code(frame)]
+                if offender.stack[-1:] != [blocked_in]:
+                    offender.stack.append(f"... {blocked_in}")
+        self.nb_stalls += 1
+        metrics.observe("loop_stall_seconds", seconds, site=site)
+        logger.warning(f"Event loop blocked for {seconds:.2f}s at {site}" + (f" (in {blocked_in})" if blocked_in and blocked_in != site else ""))
+
+    # Reports ################################################################
+
+    def report(self, offenders: Optional[List[Offender]] = None, top: int = 5) -> str:
+        """Text summary of the offenders (all of them by default), worst first."""
+        offenders = sorted(offenders if offenders is not None else self.offenders.values(), key=lambda o: o.total, reverse=True)
+        lines = [f"⚠️ **Event loop blocked {sum(o.count for o in offenders)} time(s)** (over {self.threshold}s), {sum(o.total for o in offenders):.1f}s in total:"]
+        for offender in offenders[:top]:
+            line = f"• `{offender.site}`: {offender.count}× (longest {offender.longest:.2f}s)"
+            if offender.blocked_in and offender.blocked_in != offender.site:
+                line += f", blocked in `{offender.blocked_in}`"
+            lines.append(line)
+        if len(offenders) > top:
+            lines.append(f"… and {len(offenders) - top} more call site(s)")
+        return "\n".join(lines)
+
+    def _new_offenders(self) -> List[Offender]:
+        new = []
+        for site, offender in self.offenders.items():
+            count, total = self._reported.get(site, (0, 0.0))
+            if offender.count > count:
+                new.append(Offender(site, offender.blocked_in, offender.count - count, offender.total - total, offender.longest, offender.stack))
+                self._reported[site] = (offender.count, offender.total)
+        return new
+
+    async def _report_loop(self, report: Callable[[str], Awaitable[Any]]):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            new = self._new_offenders()
+            if new:
+                try:
+                    await report(self.report(new))
+                except Exception as e:
+                    logger.warning(f"Could not report the event loop stalls: {e}")
+
+    def check(self):
+        """Raise LoopStalled with the offenders and their stacks if the loop stalled (for tests)."""
+        if not self.offenders:
+            return
+        details = [self.report(top=len(self.offenders))]
+        for offender in sorted(self.offenders.values(), key=lambda o: o.total, reverse=True):
+            details.append(f"\n{offender.site}:\n  " + "\n  ".join(offender.stack))
+        raise LoopStalled("\n".join(details))
+
+    # Lifecycle ##############################################################
+
+    def start(self, report: Optional[Callable[[str], Awaitable[Any]]] = None):
+        """Start watching the running loop (no-op if already running).
+
+        Args:
+            report: Called with a summary of the new stalls every report_interval seconds, if any
+        """
+        self._tasks = [task for task in self._tasks if not task.done()]
+        if self._tasks:
+            return
+        self._loop_thread = threading.get_ident()
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        if report is not None:
+            self._tasks.append(asyncio.create_task(self._report_loop(report)))
+        if self._watcher is None or not self._watcher.is_alive():
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._stop.set()
+
+
+loop_watchdog = LoopWatchdog()
@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import Iterable
+
+from PIL import Image, ImageFont
+
+FONT_FILES = {
+    "light": "resource/Ubuntu-Light.ttf",
+    "italic": "resource/Ubuntu-LightItalic.ttf",
+    "regular": "resource/Ubuntu-Regular.ttf",
+    "bold": "resource/Ubuntu-Bold.ttf",
+}
+LOGO_PATH = "resource/logo_volt.png"
+
+
+@lru_cache(maxsize=None)
+def get_font(style: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a font from the resource folder, once per (style, size) and per process.
+
+    Args:
+        style: One of the FONT_FILES keys
+        size: Font size in points
+    """
+    return ImageFont.truetype(FONT_FILES[style], size)
+
+
+class _Fonts:
+    """The fonts used by the boards, loaded on first access (e.g. `fonts.bold`)."""
+
+    @property
+    def light(self) -> ImageFont.FreeTypeFont:
+        return get_font("light", 15)
+
+    @property
+    def italic(self) -> ImageFont.FreeTypeFont:
+        return get_font("italic", 15)
+
+    @property
+    def regular(self) -> ImageFont.FreeTypeFont:
+        return get_font("regular", 20)
+
+    @property
+    def bold_small(self) -> ImageFont.FreeTypeFont:
+        return get_font("bold", 20)
+
+    @property
+    def bold(self) -> ImageFont.FreeTypeFont:
+        return get_font("bold", 30)
+
+
+fonts = _Fonts()
+
+
+@lru_cache(maxsize=1)
+def _logo_original() -> Image.Image:
+    """Decode the Volt logo once per process."""
+    with Image.open(LOGO_PATH) as logo:
+        logo.load()
+        return logo.copy()
+
+
+@lru_cache(maxsize=None)
+def get_logo(size: int) -> Image.Image:
+    """Return the Volt logo resized to (size, size), resized once per size and per process.
+
+    The returned image is shared: paste it, never draw on it.
+    """
+    return _logo_original().resize((size, size))
+
+
+def warm_up(logo_sizes: Iterable[int] = (100, 150)):
+    """Load every font and pre-resize the logo ahead of the first render.
+
+    Meant to be called once at startup or as a worker process initializer, so that
+    the first board rendered does not pay for the disk reads.
+    """
+    for name in ("light", "italic", "regular", "bold_small", "bold"):
+        getattr(fonts, name)
+    for size in logo_sizes:
+        get_logo(size)
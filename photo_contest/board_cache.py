@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, AsyncIterator, Iterable, List, Optional
+
+from executors import executors
+from photo_contest import board_gen
+from photo_contest.board_gen import RenderedBoard
+from photo_contest.photo_contest_data import CompetitionInfo, Contest, Submission
+from photo_contest.render_service import RenderJob, RenderResult, render_service
+
+# Part of every fingerprint: bump it when the boards change without their inputs changing
+# (new layout, fonts, colors...), so that the boards cached by the previous version are not reused
+CACHE_VERSION = 1
+
+
+def _canonical(value: Any) -> str:
+    """Stable text form of a render argument, for fingerprinting.
+
+    Competitions are reduced to their tally fingerprint and contests to the fingerprints of
+    their competitions, so that a board is only considered stale when votes, entries or
+    names actually changed.
+    """
+    if isinstance(value, CompetitionInfo):
+        return f"C{value.tally_fingerprint()}"
+    if isinstance(value, Contest):
+        return "K[" + ",".join(comp.tally_fingerprint() for comp in value.competitions) + "]"
+    if isinstance(value, Submission):
+        return f"S{value.author_id}/{value.submission_time}/{value.discord_save_path}"
+    if isinstance(value, dict):
+        return "{" + ",".join(sorted(f"{_canonical(k)}:{_canonical(v)}" for k, v in value.items())) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "set(" + ",".join(sorted(_canonical(v) for v in value)) + ")"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canonical(v) for v in value) + "]"
+    return repr(value)
+
+
+def job_fingerprint(job: RenderJob) -> str:
+    """Fingerprint of a render job: same fingerprint, same boards.
+
+    Besides the inputs, it covers CACHE_VERSION and the qualified name of the renderer, so a
+    renderer moved or renamed (e.g. a name now pointing to a new implementation) is rendered again.
+    """
+    renderer = getattr(board_gen, job.renderer)
+    qualified_name = f"{renderer.__module__}.{renderer.__qualname__}"
+    text = f"v{CACHE_VERSION}|{qualified_name}|{_canonical(job.args)}|{_canonical(job.kwargs)}|{job.seed}"
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class BoardCache:
+    """Disk cache of rendered boards, addressed by the fingerprint of the render job.
+
+    Boards rendered ahead of time (see prerender) are picked up by the close and announce
+    handlers through render/stream, which only render the jobs whose inputs changed since.
+    Each entry is a folder named after the fingerprint, holding the board files and a
+    manifest, so the cache survives restarts.
+
+    Only renderers returning a RenderedBoard or a list of them can be cached. The files are
+    read and written in the I/O thread pool.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 1000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def _entry_dir(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, fingerprint)
+
+    def has(self, job: RenderJob) -> bool:
+        """Whether the boards of this job, with these exact inputs, are already rendered."""
+        return os.path.exists(os.path.join(self._entry_dir(job_fingerprint(job)), "manifest.json"))
+
+    async def get(self, job: RenderJob) -> Optional[Any]:
+        """Return the cached output of the job, or None if its inputs changed since the last render."""
+        return await executors.run_io(self._read, self._entry_dir(job_fingerprint(job)))
+
+    def _read(self, entry_dir: str) -> Optional[Any]:
+        try:
+            with open(os.path.join(entry_dir, "manifest.json")) as f:
+                manifest = json.load(f)
+            boards = []
+            for name in manifest["names"]:
+                with open(os.path.join(entry_dir, name), "rb") as f:
+                    boards.append(RenderedBoard(name, f.read()))
+        except (OSError, ValueError, KeyError):
+            return None
+        return boards[0] if manifest["single"] else boards
+
+    async def put(self, job: RenderJob, output: Any):
+        """Store the output of a job (RenderedBoard or list of RenderedBoard)."""
+        single = isinstance(output, RenderedBoard)
+        boards: List[RenderedBoard] = [output] if single else list(output)
+        await executors.run_io(self._write, self._entry_dir(job_fingerprint(job)), job.renderer, single, boards)
+
+    def _write(self, entry_dir: str, renderer: str, single: bool, boards: List[RenderedBoard]):
+        # A folder of its own: the same job can be stored by two threads at once
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=os.path.basename(entry_dir) + ".", suffix=".tmp")
+        for board in boards:
+            board.save(tmp_dir)
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump({"renderer": renderer, "single": single, "names": [board.name for board in boards]}, f)
+
+        # Swap the complete entry in, so that a reader never sees half of it
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Stored meanwhile by another thread: same fingerprint, same boards
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._prune()
+
+    def _prune(self):
+        """Drop the least recently written entries above max_entries."""
+        entries = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if not name.endswith(".tmp")
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    async def render(self, job: RenderJob) -> Any:
+        """Like render_service.render, but reuse the cached boards if the inputs did not change."""
+        output = await self.get(job)
+        if output is None:
+            output = await render_service.render(job)
+            await self.put(job, output)
+        return output
+
+    async def stream(self, jobs: Iterable[RenderJob]) -> AsyncIterator[RenderResult]:
+        """Like render_service.stream: cached jobs are yielded right away, the others as they finish rendering."""
+        to_render, cached = [], []
+        for job in jobs:
+            output = await self.get(job)
+            if output is None:
+                to_render.append(job)
+            else:
+                cached.append(RenderResult(job, board=output))
+
+        rendered_ids = {id(job) for job in to_render}
+        async for result in render_service.stream(to_render, ready=cached):
+            if result.error is None and id(result.job) in rendered_ids:
+                await self.put(result.job, result.board)
+            yield result
+
+    async def prerender(self, jobs: Iterable[RenderJob]) -> int:
+        """Render the jobs whose inputs changed since their last render.
+
+        Returns:
+            Number of jobs rendered
+        """
+        to_render = [job for job in jobs if not self.has(job)]
+        nb_rendered = 0
+        async for result in render_service.stream(to_render):
+            if result.error is None:
+                await self.put(result.job, result.board)
+                nb_rendered += 1
+            else:
+                print(f"Could not pre-render {result.job.renderer}: {result.error}")
+        return nb_rendered
+
+
+board_cache = BoardCache("photo_contest/generated_tables/board_cache")
@@ -1,3 +1,6 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import io
 from math import ceil
 import os
 from random import shuffle
@@ -6,10 +9,51 @@ from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
+from photo_contest.assets import fonts, get_logo
 from photo_contest.photo_contest_data import CompetitionInfo, Contest, Submission, POINTS_SETS
+from photo_contest.picture_store import open_picture
+from photo_contest.reveal_export import encode_reveal
 
 BG_COLOR = "#502379"
 
+# Boards are encoded in memory and uploaded straight from there. Point this to a folder
+# (e.g. "photo_contest/generated_tables") to also keep a copy of every board on disk.
+BOARD_CACHE_DIR: Optional[str] = None
+
+
+@dataclass
+class RenderedBoard:
+    """An encoded board, ready to be uploaded without going through the disk.
+    
+    Attributes:
+        name: Deterministic file name of the board (e.g. "qualif_Nature_thread1.png")
+        data: The file content (PNG, or WebP/GIF/zip for reveal exports)
+    """
+    name: str
+    data: bytes
+
+    def open(self) -> io.BytesIO:
+        """Return a new file-like object over the file content."""
+        return io.BytesIO(self.data)
+
+    def save(self, folder: str) -> str:
+        """Write the board to `folder` under its name and return the path."""
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, self.name)
+        with open(path, "wb") as f:
+            f.write(self.data)
+        return path
+
+
+def encode_board(img: Image.Image, name: str) -> RenderedBoard:
+    """Encode a board as PNG in memory, also writing it to BOARD_CACHE_DIR if set."""
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    board = RenderedBoard(name, buffer.getvalue())
+    if BOARD_CACHE_DIR:
+        board.save(BOARD_CACHE_DIR)
+    return board
+
 
 def strip_emoji(text: str) -> str:
     """Remove emoji characters from text for compatibility with image generation."""
@@ -34,16 +78,13 @@ def truncate_name(name: str, max_length: int = 18) -> str:
         return name
     return name[: max_length - 3] + "..."
 
-fnt_light = ImageFont.truetype("resource/Ubuntu-Light.ttf", 15)
-fnt_italic = ImageFont.truetype("resource/Ubuntu-LightItalic.ttf", 15)
-fnt_regular = ImageFont.truetype("resource/Ubuntu-Regular.ttf", 20)
-fnt_bold_small = ImageFont.truetype("resource/Ubuntu-Bold.ttf", 20)
-fnt_bold = ImageFont.truetype("resource/Ubuntu-Bold.ttf", 30)
-
 
 def create_thumbnail(img_path: str, size: Tuple[int, int]) -> Image.Image:
-    """Create a thumbnail with preserved aspect ratio and purple background (letterbox)."""
-    img = Image.open(img_path)
+    """Create a thumbnail with preserved aspect ratio and purple background (letterbox).
+    
+    Works from the kept thumbnail if the original was evicted from the picture store.
+    """
+    img = open_picture(img_path)
     
     img.thumbnail(size, Image.Resampling.LANCZOS)
     
@@ -56,6 +97,15 @@ def create_thumbnail(img_path: str, size: Tuple[int, int]) -> Image.Image:
     return bg
 
 
+@lru_cache(maxsize=2048)
+def cached_thumbnail(img_path: str, size: Tuple[int, int]) -> Image.Image:
+    """Like create_thumbnail, computed once per (picture, size) and per process.
+    
+    The returned image is shared: paste it, never draw on it.
+    """
+    return create_thumbnail(img_path, size)
+
+
 def calculate_board_dimensions(num_submissions: int, mode: str = "qualif") -> Tuple[int, int, int, Tuple[int, int]]:
     """Calculate board dimensions based on number of submissions.
     
@@ -102,18 +152,18 @@ def draw_column_headers(d: ImageDraw.ImageDraw, y: int, mode: str = "qualif"):
     """
     if mode == "qualif":
         # Left column headers
-        d.text((335, y), "Jury", anchor="mm", font=fnt_bold_small, fill="white")
-        d.text((395, y), "Public", anchor="mm", font=fnt_bold_small, fill="white")
+        d.text((335, y), "Jury", anchor="mm", font=fonts.bold_small, fill="white")
+        d.text((395, y), "Public", anchor="mm", font=fonts.bold_small, fill="white")
         # Right column headers
-        d.text((800, y), "Jury", anchor="mm", font=fnt_bold_small, fill="white")
-        d.text((860, y), "Public", anchor="mm", font=fnt_bold_small, fill="white")
+        d.text((800, y), "Jury", anchor="mm", font=fonts.bold_small, fill="white")
+        d.text((860, y), "Public", anchor="mm", font=fonts.bold_small, fill="white")
     else:  # semis
         # Left column headers (aligned with point positions)
-        d.text((355, y), "Jury", anchor="mm", font=fnt_bold_small, fill="white")
-        d.text((415, y), "Public", anchor="mm", font=fnt_bold_small, fill="white")
+        d.text((355, y), "Jury", anchor="mm", font=fonts.bold_small, fill="white")
+        d.text((415, y), "Public", anchor="mm", font=fonts.bold_small, fill="white")
         # Right column headers
-        d.text((805, y), "Jury", anchor="mm", font=fnt_bold_small, fill="white")
-        d.text((865, y), "Public", anchor="mm", font=fnt_bold_small, fill="white")
+        d.text((805, y), "Jury", anchor="mm", font=fonts.bold_small, fill="white")
+        d.text((865, y), "Public", anchor="mm", font=fonts.bold_small, fill="white")
 
 
 def select_fonts(qualifies: bool, num_rows: int) -> Tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]:
@@ -127,23 +177,264 @@ def select_fonts(qualifies: bool, num_rows: int) -> Tuple[ImageFont.FreeTypeFont
         Tuple of (regular_font, bold_font, italic_font)
     """
     if qualifies:
-        regular = fnt_regular if num_rows <= 12 else fnt_light
-        bold = fnt_bold if num_rows <= 12 else fnt_bold_small
-        italic = fnt_italic
+        regular = fonts.regular if num_rows <= 12 else fonts.light
+        bold = fonts.bold if num_rows <= 12 else fonts.bold_small
+        italic = fonts.italic
     else:
-        regular = fnt_light
-        bold = fnt_regular
-        italic = fnt_light
+        regular = fonts.light
+        bold = fonts.regular
+        italic = fonts.light
     return regular, bold, italic
 
 
+class CompetitionBoardRenderer:
+    """Incremental renderer for the standings board of a qualification thread or a semi final.
+    
+    The background, title, logo and column headers are drawn once into a static layer,
+    and the last rendered board is kept along with the state of each of its rows (points,
+    qualifier status, author name). A new render only repaints the rows whose state changed:
+    the row is wiped by copying its band back from the static layer, then redrawn. Rows are
+    laid out in fixed bands that do not overlap, so the result is the same as a full render.
+    If a row ever draws outside of its band (e.g. a very long author name), the renderer
+    falls back to full renders.
+    
+    Entries keep their photo number and position, so the competing entries must not change
+    between renders: create a new renderer if they do.
+    
+    Args:
+        competition: The competition, for its competing entries and board name
+        channel_name: Name of the channel/category
+        id2name: Mapping of user IDs to names
+        thread_name: Optional thread name for qualification boards
+        mode: "qualif" for a qualification board, "semis" for a semifinal board
+    """
+    
+    # Per mode: x of the texts of the left/right column, x shift of the thumbnails,
+    # x of the jury/public points of the left/right column, y of the column headers,
+    # and number of qualifiers by public then by jury points
+    LAYOUTS = {
+        "qualif": {"x_offsets": (95, 560), "thumb_dx": -60, "jury_x": (335, 800), "public_x": (395, 860), "headers_y": 70, "qualifiers": (2, 6)},
+        "semis": {"x_offsets": (110, 565), "thumb_dx": -80, "jury_x": (355, 805), "public_x": (415, 865), "headers_y": 80, "qualifiers": (2, 3)},
+    }
+    
+    def __init__(
+        self,
+        competition: CompetitionInfo,
+        channel_name: str,
+        id2name: Dict[int, str],
+        thread_name: Optional[str] = None,
+        mode: str = "qualif",
+    ):
+        self.mode = mode
+        self.layout = self.LAYOUTS[mode]
+        self.entries = list(competition.competing_entries)
+        self.id2name = id2name
+        self.num_rows = ceil(len(self.entries) / 2)
+        self.img_height, self.spacing, self.start_y, self.thumb_size = calculate_board_dimensions(len(self.entries), mode)
+        
+        safe_channel_name = channel_name.replace(" ", "_").replace("-", "_")
+        if mode == "qualif":
+            self.title = f"Qualification in {strip_emoji(channel_name)}" + (
+                "#" + strip_emoji(thread_name) if thread_name else ""
+            )
+            self.title_font = fonts.bold if len(self.title) < 46 else fonts.bold_small
+            self.name = f"{competition.type}_{safe_channel_name}"
+            if thread_name:
+                self.name += f"_thread{thread_name}"
+            self.name += ".png"
+        else:
+            self.title = f"Semi final for {channel_name}"
+            self.title_font = fonts.bold
+            self.name = f"semifinal_{safe_channel_name}.png"
+        
+        self._layer: Optional[Image.Image] = None
+        self._canvas: Optional[Image.Image] = None
+        self._row_states: Dict[int, Tuple[Any, ...]] = {}
+        self._full_renders_only = False
+        self.last_changed_rows = 0  # Number of rows repainted by the last render
+    
+    def _static_layer(self) -> Image.Image:
+        """Return the background with the title, logo and column headers."""
+        if self._layer is not None:
+            return self._layer
+        
+        img = Image.new("RGB", (950, self.img_height), color=BG_COLOR)
+        d = ImageDraw.Draw(img)
+        
+        # Title
+        title_bbox = d.textbbox((0, 0), self.title, font=self.title_font)
+        title_x = (950 - (title_bbox[2] - title_bbox[0])) // 2
+        d.text(
+            (title_x, 20),
+            self.title,
+            anchor="lt",
+            font=self.title_font,
+            fill="white",
+        )
+        
+        # volt logo - position at bottom right
+        logo_size = 100
+        logo_y = self.img_height - logo_size - 20
+        img.paste(get_logo(logo_size), (img.size[0] - logo_size - 20, logo_y))
+        
+        # Add column headers for Jury and Public points
+        draw_column_headers(d, self.layout["headers_y"], self.mode)
+        
+        self._layer = img
+        return img
+    
+    def _position(self, i: int) -> Tuple[int, int]:
+        """Column and row of the i-th entry (left column first, top to bottom)."""
+        if i < self.num_rows:
+            return 0, i
+        return 1, i - self.num_rows
+    
+    def _row_box(self, i: int) -> Tuple[int, int, int, int]:
+        """Band of the board owned by the i-th entry: half of the width, one row spacing
+        high, ending at the bottom of its thumbnail."""
+        col, row = self._position(i)
+        bottom = self.start_y + row * self.spacing - 3 + self.thumb_size[1]
+        top = max(0, bottom - self.spacing)
+        return (0, top, 475, bottom) if col == 0 else (475, top, 950, bottom)
+    
+    def row_states(
+        self,
+        competition: CompetitionInfo,
+        jury_voter_authors: Optional[set[int]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """Compute what each row shows: (author name, thumbnail path, qualifies, jury points, public points)."""
+        jury_votes = competition.count_votes_jury()
+        public_votes = competition.count_votes_public()
+        
+        # Calculate adjusted jury scores with +3 bonus for submissions from jury voters
+        def get_adjusted_jury_score(submission: Submission) -> int:
+            base_score = jury_votes.get(submission, 0)
+            if jury_voter_authors and submission.author_id in jury_voter_authors:
+                return base_score + 3
+            return base_score
+        
+        # Determine qualifiers: top by public, then top by jury from remaining (with +3 bonus)
+        nb_public, nb_jury = self.layout["qualifiers"]
+        top_public = sorted(
+            self.entries,
+            key=lambda x: (public_votes.get(x, 0), get_adjusted_jury_score(x), -x.submission_time),
+            reverse=True,
+        )[:nb_public]
+        top_jury = sorted(
+            [x for x in self.entries if x not in top_public],
+            key=lambda x: (get_adjusted_jury_score(x), public_votes.get(x, 0), -x.submission_time),
+            reverse=True,
+        )[:nb_jury]
+        qualifiers = set(top_public + top_jury)
+        
+        return [
+            (
+                strip_emoji(self.id2name.get(submission.author_id, f"User {submission.author_id}")),
+                submission.local_save_path,
+                submission in qualifiers,
+                get_adjusted_jury_score(submission),
+                public_votes.get(submission, 0),
+            )
+            for submission in self.entries
+        ]
+    
+    def _select_fonts(self, qualifies: bool) -> Tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]:
+        if self.mode == "qualif":
+            return select_fonts(qualifies, self.num_rows)
+        # Semifinals have more room per row
+        if qualifies:
+            return fonts.bold_small, fonts.bold, fonts.italic
+        return fonts.regular, fonts.bold_small, fonts.light
+    
+    def _draw_row(self, img: Image.Image, d: ImageDraw.ImageDraw, i: int, state: Tuple[Any, ...]) -> bool:
+        """Draw the i-th row, return whether it stayed inside of its band."""
+        author_name, thumb_path, qualifies, jury_points, public_points = state
+        col, row = self._position(i)
+        x_offset = self.layout["x_offsets"][col]
+        y_pos = self.start_y + row * self.spacing
+        
+        # Photo thumbnail
+        img.paste(cached_thumbnail(thumb_path, self.thumb_size), (x_offset + self.layout["thumb_dx"], y_pos - 3))
+        
+        # Select fonts and color based on qualifier status
+        color = "white" if qualifies else "#888888"
+        font_regular_choice, font_bold_choice, font_italic_choice = self._select_fonts(qualifies)
+        
+        texts = [
+            ((x_offset, y_pos), f"Photo #{i + 1}", "lm", font_bold_choice),
+            ((x_offset, y_pos + 20), f"by {author_name}", "lm", font_italic_choice),
+            # Points - show jury and public in separate columns
+            ((self.layout["jury_x"][col], y_pos + 10), str(jury_points), "mm", font_regular_choice),
+            ((self.layout["public_x"][col], y_pos + 10), str(public_points), "mm", font_regular_choice),
+        ]
+        left, top, right, bottom = self._row_box(i)
+        fits = True
+        for xy, text, anchor, font in texts:
+            d.text(xy, text, anchor=anchor, font=font, fill=color)
+            x0, y0, x1, y1 = d.textbbox(xy, text, anchor=anchor, font=font)
+            # Whatever goes past the right edge of the board is cut anyway
+            if x0 < left or y0 < top or min(x1, img.width) > right or y1 > bottom:
+                fits = False
+        return fits
+    
+    def render(
+        self,
+        competition: CompetitionInfo,
+        jury_voter_authors: Optional[set[int]] = None,
+    ) -> Image.Image:
+        """Render the standings of the competition, repainting only the rows that changed.
+        
+        Args:
+            competition: The competition, with the same competing entries as at creation
+            jury_voter_authors: Set of author IDs who voted as jury (for bonus display)
+        """
+        if list(competition.competing_entries) != self.entries:
+            raise ValueError("The competing entries changed, a new renderer is needed")
+        
+        states = self.row_states(competition, jury_voter_authors)
+        layer = self._static_layer()
+        
+        if self._canvas is None or self._full_renders_only:
+            changed = list(range(len(states)))
+            self._canvas = layer.copy()
+            incremental = False
+        else:
+            changed = [i for i, state in enumerate(states) if self._row_states.get(i) != state]
+            incremental = True
+        
+        d = ImageDraw.Draw(self._canvas)
+        for i in changed:
+            if incremental:
+                box = self._row_box(i)
+                self._canvas.paste(layer.crop(box), box[:2])
+            if not self._draw_row(self._canvas, d, i, states[i]):
+                self._full_renders_only = True
+        
+        if incremental and self._full_renders_only:
+            # A repainted row overflowed onto its neighbours: start over from scratch
+            self._canvas = None
+            return self.render(competition, jury_voter_authors)
+        
+        self._row_states = dict(enumerate(states))
+        self.last_changed_rows = len(changed)
+        return self._canvas.copy()
+    
+    def render_board(
+        self,
+        competition: CompetitionInfo,
+        jury_voter_authors: Optional[set[int]] = None,
+    ) -> RenderedBoard:
+        """Like render, encoded under the name of the board."""
+        return encode_board(self.render(competition, jury_voter_authors), self.name)
+
+
 def gen_competition_board(
     competition: CompetitionInfo,
     channel_name: str,
     id2name: Dict[int, str],
     thread_name: Optional[str] = None,
     jury_voter_authors: Optional[set[int]] = None,
-) -> str:
+) -> RenderedBoard:
     """Generate a competition board showing current standings for a competition.
     
     Args:
@@ -153,149 +444,255 @@ def gen_competition_board(
         thread_name: Optional thread name for qualification boards
         jury_voter_authors: Set of author IDs who voted as jury (for bonus display)
     """
+    renderer = CompetitionBoardRenderer(competition, channel_name, id2name, thread_name)
+    return renderer.render_board(competition, jury_voter_authors)
+
+
+# Live standings renderers of this process, by location: (what they were created with, renderer)
+_live_standings_renderers: Dict[int, Tuple[Tuple[Any, ...], CompetitionBoardRenderer]] = {}
+
+
+def gen_live_standings_board(
+    location_id: int,
+    competition: CompetitionInfo,
+    channel_name: str,
+    id2name: Dict[int, str],
+    thread_name: Optional[str] = None,
+    mode: str = "qualif",
+    jury_voter_authors: Optional[set[int]] = None,
+) -> RenderedBoard:
+    """Render the live standings board of a competition, repainting only the rows that changed.
     
-    # Count votes
-    jury_votes = competition.count_votes_jury()
-    public_votes = competition.count_votes_public()
-    
-    # Calculate adjusted jury scores with +3 bonus for submissions from jury voters
-    def get_adjusted_jury_score(submission: Submission) -> int:
-        base_score = jury_votes.get(submission, 0)
-        if jury_voter_authors and submission.author_id in jury_voter_authors:
-            return base_score + 3
-        return base_score
+    The renderer of each location is kept in the render worker between two refreshes, and
+    replaced as soon as anything it was created with changed (entries, author names, titles).
+    A refresh handled by another worker than the previous one is a full render.
     
-    def get_adjusted_total_score(submission: Submission) -> tuple[int, int, int]:
-        return (get_adjusted_jury_score(submission), public_votes.get(submission, 0), -submission.submission_time)
+    Args:
+        location_id: Thread (or channel) of the board, to find its renderer again
+        competition: The competition
+        channel_name: Name of the channel/category
+        id2name: Mapping of user IDs to names
+        thread_name: Optional thread name for qualification boards
+        mode: "qualif" or "semis"
+        jury_voter_authors: Set of author IDs who voted as jury (for bonus display)
+    """
+    entries = tuple(competition.competing_entries)
+    inputs = (entries, tuple(id2name.get(sub.author_id) for sub in entries), channel_name, thread_name, mode)
+    known = _live_standings_renderers.get(location_id)
+    if known is None or known[0] != inputs:
+        known = inputs, CompetitionBoardRenderer(competition, channel_name, id2name, thread_name, mode=mode)
+        _live_standings_renderers[location_id] = known
+    return known[1].render_board(competition, jury_voter_authors)
+
 
-    # Use original submission order (not sorted by score)
-    submissions_to_display = competition.competing_entries
+class FinalResultsRenderer:
+    """Layered renderer for the final results board.
     
-    num_submissions = len(submissions_to_display)
-    num_rows = ceil(num_submissions / 2)
+    Everything that does not depend on the scores is prepared once: the background,
+    title, logo and column headers (one cached layer per header variant) and the
+    thumbnail of every finalist. Each render then only copies the matching layer,
+    pastes the cached thumbnails in the current ranking order and draws the texts
+    of the rows, which is what changes from one juror to the next during the reveal.
     
-    # Calculate dynamic height and spacing
-    img_height, spacing, start_y, thumb_size = calculate_board_dimensions(num_submissions, "qualif")
+    Args:
+        final_comp: The grand final competition
+        id2name: Mapping of user IDs to display names
+    """
     
-    img = Image.new("RGB", (950, img_height), color=BG_COLOR)
-    d = ImageDraw.Draw(img)
-
-    # Title
-    title = f"Qualification in {strip_emoji(channel_name)}" + (
-        "#" + strip_emoji(thread_name) if thread_name else ""
-    )
-    title_font = fnt_bold if len(title) < 46 else fnt_bold_small
-    title_bbox = d.textbbox((0, 0), title, font=title_font)
-    title_x = (950 - (title_bbox[2] - title_bbox[0])) // 2
-    d.text(
-        (title_x, 20),
-        title,
-        anchor="lt",
-        font=title_font,
-        fill="white",
-    )
-
-    # volt logo - position at bottom right
-    logo = Image.open("resource/logo_volt.png")
-    logo_size = 100
-    logo_y = img_height - logo_size - 20
-    img.paste(logo.resize((logo_size, logo_size)), (img.size[0] - logo_size - 20, logo_y))
-    
-    # Add column headers for Jury and Public points
-    draw_column_headers(d, 70)
-
-    # Determine qualifiers: top 2 by public, then top 6 by jury from remaining
-    # Determine qualifiers: top 2 by public, then top 6 by jury from remaining (with +3 bonus)
-    top_public = sorted(
-        competition.competing_entries,
-        key=lambda x: (public_votes.get(x, 0), get_adjusted_jury_score(x), -x.submission_time),
-        reverse=True,
-    )[:2]
-    top_jury = sorted(
-        [x for x in competition.competing_entries if x not in top_public],
-        key=lambda x: (get_adjusted_jury_score(x), public_votes.get(x, 0), -x.submission_time),
-        reverse=True,
-    )[:6]
-    qualifiers = set(top_public + top_jury)
-    
-    # Display in 2 columns (top-to-bottom, left-to-right)
-    for i, submission in enumerate(submissions_to_display):
-        # Fill left column first (top to bottom), then right column
-        if i < num_rows:
-            col = 0  # left column
-            row = i
-        else:
-            col = 1  # right column
-            row = i - num_rows
-        
-        x_offset = 95 if col == 0 else 560
-        y_pos = start_y + row * spacing
+    def __init__(self, final_comp: CompetitionInfo, id2name: Dict[int, str]):
+        self.entries = list(final_comp.competing_entries)
+        self.submission_to_photo_num = {sub: i+1 for i, sub in enumerate(self.entries)}
+        self.author_names = {
+            sub: strip_emoji(id2name.get(sub.author_id, f"User {sub.author_id}"))
+            for sub in self.entries
+        }
         
-        # Photo thumbnail
-        thumb = create_thumbnail(submission.local_save_path, thumb_size)
-        img.paste(thumb, (x_offset - 60, y_pos - 3))
+        # Calculate dynamic height based on number of rows (2 columns)
+        self.num_rows = ceil(len(self.entries) / 2)
         
-        # Photo number and author
-        photo_num = i + 1
-        author_name = strip_emoji(id2name.get(submission.author_id, f"User {submission.author_id}"))
+        # Optimized height calculation with increased spacing for thumbnails
+        self.thumb_size = (55, 55)
+        if self.num_rows <= 3:
+            self.row_spacing = 90
+        elif self.num_rows <= 6:
+            self.row_spacing = 85
+        else:
+            self.row_spacing = 80
+        self.img_height = 80 + self.num_rows * self.row_spacing + 180
         
-        # Determine if this submission qualifies
-        qualifies = submission in qualifiers
+        self.thumbnails = {sub: create_thumbnail(sub.local_save_path, self.thumb_size) for sub in self.entries}
+        self._layers: Dict[Tuple[bool, bool], Image.Image] = {}
+    
+    def _layer(self, with_subtitle: bool, with_new_column: bool) -> Image.Image:
+        """Return the static layer (background, title, logo and column headers) for a header variant."""
+        key = (with_subtitle, with_new_column)
+        if key in self._layers:
+            return self._layers[key]
         
-        # Select fonts and color based on qualifier status
-        color = "white" if qualifies else "#888888"
-        font_regular_choice, font_bold_choice, font_italic_choice = select_fonts(qualifies, num_rows)
+        img = Image.new("RGB", (950, self.img_height), color=BG_COLOR)
+        d = ImageDraw.Draw(img)
         
+        # Title
         d.text(
-            (x_offset, y_pos),
-            f"Photo #{photo_num}",
-            anchor="lm",
-            font=font_bold_choice,
-            fill=color,
-        )
-        d.text(
-            (x_offset, y_pos + 20),
-            f"by {author_name}",
-            anchor="lm",
-            font=font_italic_choice,
-            fill=color,
+            (475, 15),
+            "Final Results",
+            anchor="mt",
+            font=fonts.bold,
+            fill="white",
         )
-
-        # Points - show jury and public in separate columns
-        jury_points = jury_votes.get(submission, 0)
-        if jury_voter_authors and submission.author_id in jury_voter_authors:
-            jury_points += 3
-        public_points = public_votes.get(submission, 0)
         
-        # Calculate x positions based on column
-        jury_x = 335 if col == 0 else 800
-        public_x = 395 if col == 0 else 860
-
-        d.text(
-            (jury_x, y_pos + 10),
-            str(jury_points),
-            anchor="mm",
-            font=font_regular_choice,
-            fill=color,
-        )
-        d.text(
-            (public_x, y_pos + 10),
-            str(public_points),
-            anchor="mm",
-            font=font_regular_choice,
-            fill=color,
+        # volt logo - position at bottom right
+        logo_size = 100
+        logo_y = self.img_height - logo_size - 20
+        img.paste(get_logo(logo_size), (img.size[0] - logo_size - 20, logo_y))
+        
+        header_y = 75 if with_subtitle else 60
+        if with_new_column:
+            # Show both new points and total
+            for new_x, total_x in ((340, 400), (800, 860)):
+                d.text(
+                    (new_x, header_y),
+                    "+New",
+                    anchor="mm",
+                    font=fonts.regular,
+                    fill="white",
+                )
+                d.text(
+                    (total_x, header_y),
+                    "Total",
+                    anchor="mm",
+                    font=fonts.bold_small,
+                    fill="white",
+                )
+        else:
+            # Show only total points
+            for total_x in (400, 860):
+                d.text(
+                    (total_x, header_y),
+                    "Points",
+                    anchor="mm",
+                    font=fonts.bold_small,
+                    fill="white",
+                )
+        
+        self._layers[key] = img
+        return img
+    
+    def render(
+        self,
+        totals: Dict[Submission, int],
+        latest_voter_points: Optional[Dict[Submission, int]] = None,
+        subtitle: Optional[str] = None,
+    ) -> Image.Image:
+        """Render the board for the given running totals.
+        
+        Args:
+            totals: Points of each finalist so far
+            latest_voter_points: Optional points from the latest voter, shown in a "+New" column
+            subtitle: Optional subtitle under the title (e.g. the latest voter)
+        """
+        img = self._layer(subtitle is not None, bool(latest_voter_points)).copy()
+        d = ImageDraw.Draw(img)
+        
+        if subtitle is not None:
+            d.text(
+                (475, 45),
+                subtitle,
+                anchor="mt",
+                font=fonts.bold_small,
+                fill="white",
+            )
+            start_y = 105  # More space after subtitle and headers
+        else:
+            start_y = 90  # Standard spacing after headers
+        
+        # Rank all submissions with tie-breaking
+        ranked_submissions = sorted(
+            self.entries,
+            key=lambda x: (totals.get(x, 0), -x.submission_time),
+            reverse=True
         )
-
-    # Generate filename with category name and thread name
-    # Sanitize channel_name for filename (replace spaces and special chars)
-    safe_channel_name = channel_name.replace(" ", "_").replace("-", "_")
-    
-    save_path = f"photo_contest/generated_tables/{competition.type}_{safe_channel_name}"
-    if thread_name:
-        save_path += f"_thread{thread_name}"
-    save_path += ".png"
-    img.save(save_path)
-    return save_path
+        
+        # Display in 2 columns (top-to-bottom, left-to-right) - ranked order
+        for i, submission in enumerate(ranked_submissions):
+            # Fill left column first (top to bottom), then right column
+            if i < self.num_rows:
+                col = 0  # left column
+                row = i
+            else:
+                col = 1  # right column
+                row = i - self.num_rows
+            
+            x_offset = 95 if col == 0 else 560
+            y_pos = start_y + row * self.row_spacing
+            
+            # Photo thumbnail
+            img.paste(self.thumbnails[submission], (x_offset - 60, y_pos - 3))
+            
+            # Ranking position
+            position = i + 1
+            # Photo number based on original order in competing_entries
+            photo_num = self.submission_to_photo_num[submission]
+            
+            # Top 3 get special treatment
+            is_top3 = position <= 3
+            color = "white"
+            font_bold_choice = fonts.bold if is_top3 else fonts.bold_small
+            font_italic_choice = fonts.italic if is_top3 else fonts.light
+            
+            # Position text
+            ordinals = {1: "1st", 2: "2nd", 3: "3rd"}
+            position_text = ordinals.get(position, f"#{position}")
+            
+            d.text(
+                (x_offset, y_pos),
+                f"{position_text} - Photo #{photo_num}",
+                anchor="lm",
+                font=font_bold_choice,
+                fill=color,
+            )
+            d.text(
+                (x_offset, y_pos + 20),
+                f"by {self.author_names[submission]}",
+                anchor="lm",
+                font=font_italic_choice,
+                fill=color,
+            )
+            
+            # Calculate x position based on column
+            total_x = 400 if col == 0 else 860
+            new_x = 340 if col == 0 else 800
+            
+            # Show total points
+            d.text(
+                (total_x, y_pos + 5),
+                str(totals.get(submission, 0)),
+                anchor="mm",
+                font=fonts.bold_small,
+                fill=color,
+            )
+            
+            # Show new points from latest voter if provided
+            if latest_voter_points and submission in latest_voter_points:
+                new_points = latest_voter_points[submission]
+                if new_points > 0:
+                    # Choose font size based on points value (similar to live reveal)
+                    if new_points >= 10:
+                        font_choice = fonts.bold
+                    elif new_points >= 5:
+                        font_choice = fonts.bold_small
+                    else:
+                        font_choice = fonts.regular
+                    
+                    d.text(
+                        (new_x, y_pos + 5),
+                        f"+{new_points}",
+                        anchor="mm",
+                        font=font_choice,
+                        fill=color,
+                    )
+        
+        return img
 
 
 def gen_final_results_board(
@@ -305,7 +702,7 @@ def gen_final_results_board(
     latest_voter_name: Optional[str] = None,
     latest_voter_index: Optional[int] = None,
     total_voters: Optional[int] = None,
-) -> str:
+) -> RenderedBoard:
     """Generate final results board combining all category finals.
     
     Shows all finalists from all categories ranked together by their jury votes.
@@ -322,216 +719,96 @@ def gen_final_results_board(
     final_comp = contest.final_competition
     if not final_comp:
         raise ValueError("No final competition found")
-
-    # Get all entries and votes from the single grand final
-    all_entries = list(final_comp.competing_entries)
-    submission_to_photo_num = {sub: i+1 for i, sub in enumerate(all_entries)}
-    
-    # Get votes from the final competition
-    all_votes = final_comp.count_votes_jury()
-    
-    # Rank all submissions with tie-breaking
-    ranked_submissions = sorted(
-        all_entries,
-        key=lambda x: (all_votes.get(x, 0), -x.submission_time),
-        reverse=True
-    )
-    
-    num_submissions = len(ranked_submissions)
-    
-    # Calculate dynamic height based on number of rows (2 columns)
-    num_rows = ceil(num_submissions / 2)
-    
-    # Optimized height calculation with increased spacing for thumbnails
-    thumb_size = (55, 55)
-    if num_rows <= 3:
-        row_spacing = 90
-        img_height = 80 + num_rows * row_spacing + 180
-    elif num_rows <= 6:
-        row_spacing = 85
-        img_height = 80 + num_rows * row_spacing + 180
-    else:
-        row_spacing = 80
-        img_height = 80 + num_rows * row_spacing + 180
-    
-    spacing = row_spacing
-    
-    img = Image.new("RGB", (950, img_height), color=BG_COLOR)
-    d = ImageDraw.Draw(img)
-
-    # Title
-    title = "Final Results"
-    d.text(
-        (475, 15),
-        title,
-        anchor="mt",
-        font=fnt_bold,
-        fill="white",
-    )
     
     # Subtitle with voter name if provided
+    subtitle = None
     if latest_voter_name:
         subtitle = f"After votes from {latest_voter_name}"
         if latest_voter_index is not None and total_voters:
             subtitle += f" ({latest_voter_index}/{total_voters} voters)"
-        d.text(
-            (475, 45),
-            subtitle,
-            anchor="mt",
-            font=fnt_bold_small,
-            fill="white",
-        )
-        header_y = 75
-        start_y = 105  # More space after subtitle and headers
-    else:
-        header_y = 60
-        start_y = 90  # Standard spacing after headers
-
-    # volt logo - position at bottom right
-    logo = Image.open("resource/logo_volt.png")
-    logo_size = 100
-    logo_y = img_height - logo_size - 20
-    img.paste(logo.resize((logo_size, logo_size)), (img.size[0] - logo_size - 20, logo_y))
     
-    # Add column headers
-    if latest_voter_points:
-        # Show both new points and total
-        # Left column headers
-        d.text(
-            (340, header_y),
-            "+New",
-            anchor="mm",
-            font=fnt_regular,
-            fill="white",
-        )
-        d.text(
-            (400, header_y),
-            "Total",
-            anchor="mm",
-            font=fnt_bold_small,
-            fill="white",
-        )
-        # Right column headers
-        d.text(
-            (800, header_y),
-            "+New",
-            anchor="mm",
-            font=fnt_regular,
-            fill="white",
-        )
-        d.text(
-            (860, header_y),
-            "Total",
-            anchor="mm",
-            font=fnt_bold_small,
-            fill="white",
-        )
-    else:
-        # Show only total points
-        # Left column header
-        d.text(
-            (400, header_y),
-            "Points",
-            anchor="mm",
-            font=fnt_bold_small,
-            fill="white",
-        )
-        # Right column header
-        d.text(
-            (860, header_y),
-            "Points",
-            anchor="mm",
-            font=fnt_bold_small,
-            fill="white",
-        )
+    renderer = FinalResultsRenderer(final_comp, id2name)
+    img = renderer.render(final_comp.count_votes_jury(), latest_voter_points, subtitle)
+    
+    return encode_board(img, "final_results.png")
 
-    # Display in 2 columns (top-to-bottom, left-to-right) - ranked order
-    for i, submission in enumerate(ranked_submissions):
-        # Fill left column first (top to bottom), then right column
-        if i < num_rows:
-            col = 0  # left column
-            row = i
-        else:
-            col = 1  # right column
-            row = i - num_rows
-        
-        x_offset = 95 if col == 0 else 560
-        y_pos = start_y + row * spacing
-        
-        # Photo thumbnail
-        thumb = create_thumbnail(submission.local_save_path, thumb_size)
-        img.paste(thumb, (x_offset - 60, y_pos - 3))
-        
-        # Ranking position
-        position = i + 1
-        # Photo number based on original order in competing_entries
-        photo_num = submission_to_photo_num[submission]
-        author_name = strip_emoji(id2name.get(submission.author_id, f"User {submission.author_id}"))
-        
-        # Top 3 get special treatment
-        is_top3 = position <= 3
-        color = "white"
-        font_bold_choice = fnt_bold if is_top3 else fnt_bold_small
-        font_italic_choice = fnt_italic if is_top3 else fnt_light
-        
-        # Position text
-        ordinals = {1: "1st", 2: "2nd", 3: "3rd"}
-        position_text = ordinals.get(position, f"#{position}")
-        
-        d.text(
-            (x_offset, y_pos),
-            f"{position_text} - Photo #{photo_num}",
-            anchor="lm",
-            font=font_bold_choice,
-            fill=color,
-        )
-        d.text(
-            (x_offset, y_pos + 20),
-            f"by {author_name}",
-            anchor="lm",
-            font=font_italic_choice,
-            fill=color,
-        )
 
-        # Points - show jury points
-        points_sub = all_votes.get(submission, 0)
+def iter_final_reveal_frames(
+    final_comp: CompetitionInfo,
+    id2name: Dict[int, str],
+    voter_order: List[int],
+) -> Iterator[Image.Image]:
+    """Render every frame of the live final reveal in one pass.
+    
+    Yields one frame per juror, in the given order, with the running totals after
+    that juror and their points in the "+New" column, followed by the clean final
+    results frame. All frames share the static layers and thumbnails of a single
+    FinalResultsRenderer.
+    
+    Args:
+        final_comp: The grand final competition
+        id2name: Mapping of user IDs to display names (jurors included)
+        voter_order: Juror IDs in reveal order
+    """
+    renderer = FinalResultsRenderer(final_comp, id2name)
+    totals: Dict[Submission, int] = {}
+    total_voters = len(voter_order)
+    
+    for i, voter_id in enumerate(voter_order, start=1):
+        voter_points = final_comp.votes_jury[voter_id].points_to_submissions()
+        for submission, points in voter_points.items():
+            totals[submission] = totals.get(submission, 0) + points
         
-        # Calculate x position based on column
-        total_x = 400 if col == 0 else 860
-        new_x = 340 if col == 0 else 800
-
-        # Show total points
-        d.text(
-            (total_x, y_pos + 5),
-            str(points_sub),
-            anchor="mm",
-            font=fnt_bold_small,
-            fill=color,
+        voter_name = id2name.get(voter_id, f"Juror {voter_id}")
+        yield renderer.render(
+            totals,
+            voter_points,
+            f"After votes from {voter_name} ({i}/{total_voters} voters)",
         )
-        
-        # Show new points from latest voter if provided
-        if latest_voter_points and submission in latest_voter_points:
-            new_points = latest_voter_points[submission]
-            if new_points > 0:
-                # Choose font size based on points value (similar to live reveal)
-                if new_points >= 10:
-                    font_choice = fnt_bold
-                elif new_points >= 5:
-                    font_choice = fnt_bold_small
-                else:
-                    font_choice = fnt_regular
-                
-                d.text(
-                    (new_x, y_pos + 5),
-                    f"+{new_points}",
-                    anchor="mm",
-                    font=font_choice,
-                    fill=color,
-                )
+    
+    yield renderer.render(final_comp.count_votes_jury())
 
-    save_path = f"photo_contest/generated_tables/final_results.png"
-    img.save(save_path)
-    return save_path
+
+def gen_final_reveal_boards(
+    final_comp: CompetitionInfo,
+    id2name: Dict[int, str],
+    voter_order: List[int],
+    export_format: Optional[str] = None,
+    frame_duration: int = 2000,
+    final_duration: int = 8000,
+) -> List[RenderedBoard]:
+    """Pre-render every board of the live final reveal (see iter_final_reveal_frames).
+    
+    Args:
+        final_comp: The grand final competition
+        id2name: Mapping of user IDs to display names (jurors included)
+        voter_order: Juror IDs in reveal order
+        export_format: If set ("webp", "gif" or "zip"), also encode the same frames as
+            a single file holding the whole reveal
+        frame_duration: Milliseconds each juror frame stays on screen in the animation
+        final_duration: Milliseconds the final results stay on screen before looping
+    
+    Returns:
+        len(voter_order) juror boards, then the final board, then the whole reveal
+        in one file if export_format is set
+    """
+    frames = list(iter_final_reveal_frames(final_comp, id2name, voter_order))
+    
+    boards = [
+        encode_board(img, f"final_results_reveal_{i}.png")
+        for i, img in enumerate(frames[:-1], start=1)
+    ]
+    boards.append(encode_board(frames[-1], "final_results.png"))
+    
+    if export_format:
+        durations = [frame_duration] * (len(frames) - 1) + [final_duration]
+        data = encode_reveal(frames, export_format, durations)
+        board = RenderedBoard(f"final_results_reveal.{export_format}", data)
+        if BOARD_CACHE_DIR:
+            board.save(BOARD_CACHE_DIR)
+        boards.append(board)
+    
+    return boards
 
 
 def gen_semifinals_boards(
@@ -539,153 +816,77 @@ def gen_semifinals_boards(
     channel_names: Dict[int, str],
     id2name: Dict[int, str],
     jury_voter_authors: Optional[set[int]] = None,
-) -> List[str]:
+) -> List[RenderedBoard]:
     """Generate boards for all semifinal competitions."""
     
     # Get jury voter authors if not provided
     if jury_voter_authors is None:
         jury_voter_authors = contest.get_jury_voter_authors("semis")
     
-    semifinal_competitions = contest.semis_competitions
     generated_files = []
 
-    for i, semifinal in enumerate(semifinal_competitions):
+    for i, semifinal in enumerate(contest.semis_competitions):
         # Get the channel name for this specific semifinal
         channel_name = strip_emoji(channel_names.get(semifinal.channel_id, f"Category {i+1}"))
         
-        # Count votes
-        jury_votes = semifinal.count_votes_jury()
-        public_votes = semifinal.count_votes_public()
-        
-        # Calculate adjusted jury scores with +3 bonus for submissions from jury voters
-        def get_adjusted_jury_score(submission: Submission) -> int:
-            base_score = jury_votes.get(submission, 0)
-            if jury_voter_authors and submission.author_id in jury_voter_authors:
-                return base_score + 3
-            return base_score
+        renderer = CompetitionBoardRenderer(semifinal, channel_name, id2name, mode="semis")
+        generated_files.append(renderer.render_board(semifinal, jury_voter_authors))
 
-        # Use original submission order (not sorted by score)
-        submissions_to_display = semifinal.competing_entries
-        
-        num_submissions = len(submissions_to_display)
-        num_rows = ceil(num_submissions / 2)
-        
-        # Calculate dynamic height and spacing
-        img_height, spacing, start_y, thumb_size = calculate_board_dimensions(num_submissions, "semis")
-        
-        img = Image.new("RGB", (950, img_height), color=BG_COLOR)
-        d = ImageDraw.Draw(img)
+    return generated_files
 
-        # Title
-        semi_title = f"Semi final for {channel_name}"
-        semi_bbox = d.textbbox((0, 0), semi_title, font=fnt_bold)
-        semi_x = (950 - (semi_bbox[2] - semi_bbox[0])) // 2
-        d.text(
-            (semi_x, 20),
-            semi_title,
-            anchor="lt",
-            font=fnt_bold,
-            fill="white",
-        )
 
-        # volt logo - position at bottom right
-        logo = Image.open("resource/logo_volt.png")
-        logo_size = 100
-        logo_y = img_height - logo_size - 20
-        img.paste(logo.resize((logo_size, logo_size)), (img.size[0] - logo_size - 20, logo_y))
-        
-        # Add column headers for Jury and Public points
-        draw_column_headers(d, 80, "semis")
+def gen_contact_sheet(
+    competition: CompetitionInfo,
+    title: str,
+    columns: int = 6,
+    tile_size: int = 190,
+) -> RenderedBoard:
+    """Generate a numbered mosaic of all the entries of a competition, for quick browsing.
+    
+    Numbers match the "Submission #n" messages the votes are cast on.
+    
+    Args:
+        competition: The competition whose entries are shown, in order
+        title: Title of the sheet (e.g. category and thread names)
+        columns: Maximum number of tiles per row
+        tile_size: Width and height of each tile, in pixels
+    """
+    entries = competition.competing_entries
+    columns = max(1, min(columns, len(entries)))
+    num_rows = ceil(len(entries) / columns)
+    gap, margin, header_height = 10, 20, 70
+    
+    width = 2 * margin + columns * tile_size + (columns - 1) * gap
+    height = header_height + num_rows * (tile_size + gap) - gap + margin
+    img = Image.new("RGB", (width, height), color=BG_COLOR)
+    d = ImageDraw.Draw(img)
+    
+    # Title, shrunk if it doesn't fit next to the logo
+    title = strip_emoji(title)
+    title_font = fonts.bold if d.textlength(title, font=fonts.bold) < width - 2 * (margin + 60) else fonts.bold_small
+    d.text((width // 2, header_height // 2), title, anchor="mm", font=title_font, fill="white")
+    
+    # volt logo - top right, the grid takes the bottom of the sheet
+    logo_size = 50
+    img.paste(get_logo(logo_size), (width - logo_size - margin, (header_height - logo_size) // 2))
+    
+    # Tiles, left to right then top to bottom
+    for i, submission in enumerate(entries):
+        row, col = divmod(i, columns)
+        x = margin + col * (tile_size + gap)
+        y = header_height + row * (tile_size + gap)
+        img.paste(cached_thumbnail(submission.local_save_path, (tile_size, tile_size)), (x, y))
         
-        # Determine qualifiers: top 2 by public, then top 3 by jury from remaining = 5 total (with +3 bonus)
-        # Use same sorting as solve_semis: tiebreaker uses adjusted jury score (with +3 bonus)
-        top_public = sorted(
-            semifinal.competing_entries,
-            key=lambda x: (public_votes.get(x, 0), get_adjusted_jury_score(x), -x.submission_time),
-            reverse=True,
-        )[:2]
-        top_jury = sorted(
-            [x for x in semifinal.competing_entries if x not in top_public],
-            key=lambda x: (get_adjusted_jury_score(x), public_votes.get(x, 0), -x.submission_time),
-            reverse=True,
-        )[:3]
-        qualifiers = set(top_public + top_jury)
-
-        # Display submissions in 2 columns (top-to-bottom, left-to-right)
-        for j, submission in enumerate(submissions_to_display):
-            # Fill left column first (top to bottom), then right column
-            if j < num_rows:
-                col = 0  # left column
-                row = j
-            else:
-                col = 1  # right column
-                row = j - num_rows
-            
-            x_offset = 110 if col == 0 else 565
-            y_pos = start_y + row * spacing
-            
-            # Photo thumbnail
-            thumb = create_thumbnail(submission.local_save_path, thumb_size)
-            img.paste(thumb, (x_offset - 80, y_pos - 3))
-            
-            photo_num = j + 1
-            author_name = strip_emoji(id2name.get(submission.author_id, f"User {submission.author_id}"))
-            
-            # Qualification status
-            jury_points = jury_votes.get(submission, 0)
-            if jury_voter_authors and submission.author_id in jury_voter_authors:
-                jury_points += 3
-            public_points = public_votes.get(submission, 0)
-            
-            qualifies = submission in qualifiers
-            
-            color = "white" if qualifies else "#888888"
-            font_regular_choice = fnt_bold_small if qualifies else fnt_regular
-            font_bold_choice = fnt_bold if qualifies else fnt_bold_small
-            font_italic_choice = fnt_italic if qualifies else fnt_light
-            
-            d.text(
-                (x_offset, y_pos),
-                f"Photo #{photo_num}",
-                anchor="lm",
-                font=font_bold_choice,
-                fill=color,
-            )
-            d.text(
-                (x_offset, y_pos + 20),
-                f"by {author_name}",
-                anchor="lm",
-                font=font_italic_choice,
-                fill=color,
-            )
-            
-            # Points - show jury and public in separate columns
-            # Calculate x positions based on column
-            jury_x = 355 if col == 0 else 805
-            public_x = 415 if col == 0 else 865
-            
-            d.text(
-                (jury_x, y_pos + 10),
-                str(jury_points),
-                anchor="mm",
-                font=font_regular_choice,
-                fill=color,
-            )
-            d.text(
-                (public_x, y_pos + 10),
-                str(public_points),
-                anchor="mm",
-                font=font_regular_choice,
-                fill=color,
-            )
-
-        # Generate filename with category name
-        safe_channel_name = channel_name.replace(" ", "_").replace("-", "_")
-        save_path = f"photo_contest/generated_tables/semifinal_{safe_channel_name}.png"
-        img.save(save_path)
-        generated_files.append(save_path)
-
-    return generated_files
+        # Number badge in the top left corner
+        label = f"#{i+1}"
+        label_width = d.textlength(label, font=fonts.bold_small)
+        d.rectangle((x, y, x + label_width + 12, y + 28), fill=BG_COLOR)
+        d.text((x + 6, y + 14), label, anchor="lm", font=fonts.bold_small, fill="white")
+    
+    name = f"contact_sheet_{competition.channel_id}"
+    if competition.thread_id:
+        name += f"_thread{competition.thread_id}"
+    return encode_board(img, name + ".png")
 
 
 def gen_photo_vote_details(
@@ -696,7 +897,7 @@ def gen_photo_vote_details(
     thread_name: Optional[str] = None,
     photo_num: Optional[int] = None,
     jury_voter_authors: Optional[set[int]] = None,
-) -> str:
+) -> RenderedBoard:
     """Generate detailed vote board for a specific photo with snippet, similar to genSemiThread."""
     
     img = Image.new("RGB", (750, 600), color=BG_COLOR)
@@ -714,21 +915,20 @@ def gen_photo_vote_details(
         (375, 20),
         title,
         anchor="mt",
-        font=fnt_bold if len(title) < 46 else fnt_bold_small,
+        font=fonts.bold if len(title) < 46 else fonts.bold_small,
         fill="white",
     )
     d.text(
         (375, 50),
         f"submitted by {strip_emoji(id2name.get(submission.author_id, f'User {submission.author_id}'))}",
         anchor="mt",
-        font=fnt_italic,
+        font=fonts.italic,
         fill="white",
     )
 
     # volt logo - position at bottom right
-    logo = Image.open("resource/logo_volt.png")
     logo_size = 100
-    img.paste(logo.resize((logo_size, logo_size)), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
+    img.paste(get_logo(logo_size), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
 
     # snippet of the photo (preserve aspect ratio with letterbox)
     snippet = create_thumbnail(submission.local_save_path, (360, 250))
@@ -765,7 +965,7 @@ def gen_photo_vote_details(
         (50, 365),
         f"{points_str} from the jury{jury_rank_str}",
         anchor="lt",
-        font=fnt_bold_small,
+        font=fonts.bold_small,
         fill="white",
     )
     
@@ -787,7 +987,7 @@ def gen_photo_vote_details(
         y_left = y_offset
         for i, points in enumerate(point_groups[:mid_point]):
             voters = jury_by_points[points]
-            fnt = fnt_light
+            fnt = fonts.light
             
             # Wrap text to fit within available width (170 pixels for left column)
             prefix = f"{points} pt: "
@@ -820,7 +1020,7 @@ def gen_photo_vote_details(
             for line in lines:
                 bbox = d.textbbox((0, 0), line, font=fnt)
                 if bbox[2] - bbox[0] > max_width:
-                    final_fnt = fnt_light
+                    final_fnt = fonts.light
                     break
             
             # Draw all lines
@@ -838,7 +1038,7 @@ def gen_photo_vote_details(
         y_right = y_offset
         for i, points in enumerate(point_groups[mid_point:]):
             voters = jury_by_points[points]
-            fnt = fnt_light
+            fnt = fonts.light
             
             # Wrap text to fit within available width (170 pixels for right column)
             prefix = f"{points} pt: "
@@ -871,7 +1071,7 @@ def gen_photo_vote_details(
             for line in lines:
                 bbox = d.textbbox((0, 0), line, font=fnt)
                 if bbox[2] - bbox[0] > max_width:
-                    final_fnt = fnt_light
+                    final_fnt = fonts.light
                     break
             
             # Draw all lines
@@ -888,7 +1088,7 @@ def gen_photo_vote_details(
         # Single column for 5 or fewer point groups
         for points in point_groups:
             voters = jury_by_points[points]
-            fnt = fnt_light
+            fnt = fonts.light
             
             # Wrap text to fit within available width (350 pixels from x=50)
             prefix = f"{points} pt: "
@@ -921,7 +1121,7 @@ def gen_photo_vote_details(
             for line in lines:
                 bbox = d.textbbox((0, 0), line, font=fnt)
                 if bbox[2] - bbox[0] > max_width:
-                    final_fnt = fnt_regular
+                    final_fnt = fonts.regular
                     break
             
             # Draw all lines
@@ -958,7 +1158,7 @@ def gen_photo_vote_details(
         (400, 100),
         f"{total_public_points} point{'s' if total_public_points != 1 else ''} in the public vote{public_rank_str}",
         anchor="lt",
-        font=fnt_bold_small,
+        font=fonts.bold_small,
         fill="white",
     )
     
@@ -972,7 +1172,7 @@ def gen_photo_vote_details(
     y_offset = 135
     for points in sorted(public_by_points.keys(), reverse=True):
         voters = public_by_points[points]
-        fnt = fnt_light
+        fnt = fonts.light
         
         # Wrap text to fit within available width (330 pixels from x=400)
         prefix = f"{points} pt: "
@@ -1005,7 +1205,7 @@ def gen_photo_vote_details(
         for line in lines:
             bbox = d.textbbox((0, 0), line, font=fnt)
             if bbox[2] - bbox[0] > max_width:
-                final_fnt = fnt_regular
+                final_fnt = fonts.regular
                 break
         
         # Draw all lines
@@ -1022,23 +1222,16 @@ def gen_photo_vote_details(
         # Add extra spacing between different point groups (public votes)
         y_offset += 10
 
-    # Save in generated_tables with category-based naming
+    # Category-based naming
     safe_category = re.sub(r"[^A-Za-z0-9]+", "", strip_emoji(channel_name))
     if not safe_category:
         safe_category = f"Category{competition.channel_id}"
 
     if competition.type == "qualif" and competition.thread_id is not None:
-        filename = (
-            f"photo_contest/generated_tables/"
-            f"photo_{competition.type}_{safe_category}_{competition.thread_id}_{photo_num}.png"
-        )
+        filename = f"photo_{competition.type}_{safe_category}_{competition.thread_id}_{photo_num}.png"
     else:
-        filename = (
-            f"photo_contest/generated_tables/"
-            f"photo_{competition.type}_{safe_category}_{photo_num}.png"
-        )
-    img.save(filename)
-    return filename
+        filename = f"photo_{competition.type}_{safe_category}_{photo_num}.png"
+    return encode_board(img, filename)
 
 
 def gen_final_photo_vote_details(
@@ -1047,7 +1240,7 @@ def gen_final_photo_vote_details(
     id2name: Dict[int, str],
     photo_num: Optional[int] = None,
     contest: Optional[Contest] = None,
-) -> str:
+) -> RenderedBoard:
     """Generate detailed vote board for a specific final submission with Eurovision-style voting."""
     
     img = Image.new("RGB", (750, 600), color=BG_COLOR)
@@ -1061,20 +1254,19 @@ def gen_final_photo_vote_details(
         (375, 20),
         title,
         anchor="mt",
-        font=fnt_bold if len(title) < 46 else fnt_bold_small,
+        font=fonts.bold if len(title) < 46 else fonts.bold_small,
         fill="white",
     )
     d.text(
         (375, 50),
         f"submitted by {strip_emoji(id2name.get(submission.author_id, f'User {submission.author_id}'))}",
         anchor="mt",
-        font=fnt_italic,
+        font=fonts.italic,
         fill="white",
     )
 
-    logo = Image.open("resource/logo_volt.png")
     logo_size = 100
-    img.paste(logo.resize((logo_size, logo_size)), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
+    img.paste(get_logo(logo_size), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
 
     snippet = create_thumbnail(submission.local_save_path, (360, 250))
     img.paste(snippet, (20, 100))
@@ -1124,7 +1316,7 @@ def gen_final_photo_vote_details(
         (50, 365),
         f"{points_str} {rank_str}",
         anchor="lt",
-        font=fnt_bold_small,
+        font=fonts.bold_small,
         fill="white",
     )
     
@@ -1144,7 +1336,7 @@ def gen_final_photo_vote_details(
         y_left = y_offset
         for points in point_groups[:mid_point]:
             voters = jury_by_points[points]
-            fnt = fnt_light
+            fnt = fonts.light
             
             prefix = f"{points} pt: "
             max_width = 170
@@ -1171,7 +1363,7 @@ def gen_final_photo_vote_details(
             for line in lines:
                 bbox = d.textbbox((0, 0), line, font=fnt)
                 if bbox[2] - bbox[0] > max_width:
-                    final_fnt = fnt_light
+                    final_fnt = fonts.light
                     break
             
             for line in lines:
@@ -1181,7 +1373,7 @@ def gen_final_photo_vote_details(
         y_right = y_offset
         for points in point_groups[mid_point:]:
             voters = jury_by_points[points]
-            fnt = fnt_light
+            fnt = fonts.light
             
             prefix = f"{points} pt: "
             max_width = 170
@@ -1208,7 +1400,7 @@ def gen_final_photo_vote_details(
             for line in lines:
                 bbox = d.textbbox((0, 0), line, font=fnt)
                 if bbox[2] - bbox[0] > max_width:
-                    final_fnt = fnt_light
+                    final_fnt = fonts.light
                     break
             
             for line in lines:
@@ -1217,7 +1409,7 @@ def gen_final_photo_vote_details(
     else:
         for points in point_groups:
             voters = jury_by_points[points]
-            fnt = fnt_light
+            fnt = fonts.light
             
             prefix = f"{points} pt: "
             max_width = 350
@@ -1244,7 +1436,7 @@ def gen_final_photo_vote_details(
             for line in lines:
                 bbox = d.textbbox((0, 0), line, font=fnt)
                 if bbox[2] - bbox[0] > max_width:
-                    final_fnt = fnt_regular
+                    final_fnt = fonts.regular
                     break
             
             for line in lines:
@@ -1351,26 +1543,24 @@ def gen_final_photo_vote_details(
         x_label = x_right
         x_value = x_right + 200
         if qualif_jury_rank is not None:
-            d.text((x_label, y_right), "Qualification Jury:", anchor="lt", font=fnt_bold_small, fill="white")
-            d.text((x_value, y_right), f"#{qualif_jury_rank}/{qualif_total} ({qualif_jury_pts}pts)", anchor="lt", font=fnt_regular, fill="white")
+            d.text((x_label, y_right), "Qualification Jury:", anchor="lt", font=fonts.bold_small, fill="white")
+            d.text((x_value, y_right), f"#{qualif_jury_rank}/{qualif_total} ({qualif_jury_pts}pts)", anchor="lt", font=fonts.regular, fill="white")
             y_right += 22
             
-            d.text((x_label, y_right), "Qualification Public:", anchor="lt", font=fnt_bold_small, fill="white")
-            d.text((x_value, y_right), f"#{qualif_pub_rank}/{qualif_total} ({qualif_pub_pts}pts)", anchor="lt", font=fnt_regular, fill="white")
+            d.text((x_label, y_right), "Qualification Public:", anchor="lt", font=fonts.bold_small, fill="white")
+            d.text((x_value, y_right), f"#{qualif_pub_rank}/{qualif_total} ({qualif_pub_pts}pts)", anchor="lt", font=fonts.regular, fill="white")
             y_right += 30
         
         # Draw semis rankings (two columns: label | value)
         if semis_jury_rank is not None:
-            d.text((x_label, y_right), "Semi final Jury:", anchor="lt", font=fnt_bold_small, fill="white")
-            d.text((x_value, y_right), f"#{semis_jury_rank}/{semis_total} ({semis_jury_pts}pts)", anchor="lt", font=fnt_regular, fill="white")
+            d.text((x_label, y_right), "Semi final Jury:", anchor="lt", font=fonts.bold_small, fill="white")
+            d.text((x_value, y_right), f"#{semis_jury_rank}/{semis_total} ({semis_jury_pts}pts)", anchor="lt", font=fonts.regular, fill="white")
             y_right += 22
             
-            d.text((x_label, y_right), "Semi final Public:", anchor="lt", font=fnt_bold_small, fill="white")
-            d.text((x_value, y_right), f"#{semis_pub_rank}/{semis_total} ({semis_pub_pts}pts)", anchor="lt", font=fnt_regular, fill="white")
+            d.text((x_label, y_right), "Semi final Public:", anchor="lt", font=fonts.bold_small, fill="white")
+            d.text((x_value, y_right), f"#{semis_pub_rank}/{semis_total} ({semis_pub_pts}pts)", anchor="lt", font=fonts.regular, fill="white")
 
-    filename = f"photo_contest/generated_tables/photo_final_GrandFinal_{photo_num}.png"
-    img.save(filename)
-    return filename
+    return encode_board(img, f"photo_final_GrandFinal_{photo_num}.png")
 
 
 def gen_winner_announcement_board(
@@ -1381,7 +1571,7 @@ def gen_winner_announcement_board(
     id2name: Dict[int, str],
     final_competition: Optional[CompetitionInfo] = None,
     contest: Optional[Contest] = None,
-) -> str:
+) -> RenderedBoard:
     """Generate winner announcement board with winner photo and support recap."""
     
     img = Image.new("RGB", (900, 500), color=BG_COLOR)
@@ -1392,7 +1582,7 @@ def gen_winner_announcement_board(
         (450, 20),
         f"Winner for {strip_emoji(category_name)}",
         anchor="mt",
-        font=fnt_bold,
+        font=fonts.bold,
         fill="white",
     )
 
@@ -1426,7 +1616,7 @@ def gen_winner_announcement_board(
     resolved_winner = ranked[0] if ranked else winner
 
     # Winner photo (large, on the left) - preserve aspect ratio with letterboxing
-    winner_photo = Image.open(resolved_winner.local_save_path)
+    winner_photo = open_picture(resolved_winner.local_save_path)
     winner_photo.thumbnail((400, 350), Image.Resampling.LANCZOS)
     bg = Image.new("RGB", (400, 350), color=BG_COLOR)
     x_offset = (400 - winner_photo.width) // 2
@@ -1437,9 +1627,9 @@ def gen_winner_announcement_board(
     # Winner text
     author_name = strip_emoji(id2name.get(resolved_winner.author_id, f"User {resolved_winner.author_id}"))
     congrats_text = f"Congratulations, {author_name}!"
-    congrats_font = fnt_bold
+    congrats_font = fonts.bold
     max_congrats_width = 390
-    for candidate_font in (fnt_bold, fnt_bold_small, fnt_regular, fnt_light):
+    for candidate_font in (fonts.bold, fonts.bold_small, fonts.regular, fonts.light):
         bbox = d.textbbox((0, 0), congrats_text, font=candidate_font)
         if bbox[2] - bbox[0] <= max_congrats_width:
             congrats_font = candidate_font
@@ -1449,14 +1639,14 @@ def gen_winner_announcement_board(
         while fallback_name:
             fallback_name = fallback_name[:-1]
             truncated = f"Congratulations, {fallback_name}...!"
-            bbox = d.textbbox((0, 0), truncated, font=fnt_light)
+            bbox = d.textbbox((0, 0), truncated, font=fonts.light)
             if bbox[2] - bbox[0] <= max_congrats_width:
                 congrats_text = truncated
-                congrats_font = fnt_light
+                congrats_font = fonts.light
                 break
         if not fallback_name:
             congrats_text = "Congratulations!"
-            congrats_font = fnt_light
+            congrats_font = fonts.light
 
     d.text(
         (220, 440),
@@ -1471,7 +1661,7 @@ def gen_winner_announcement_board(
         (680, 60),
         "Why this photo won",
         anchor="mt",
-        font=fnt_bold_small,
+        font=fonts.bold_small,
         fill="white",
     )
 
@@ -1480,7 +1670,7 @@ def gen_winner_announcement_board(
     second_points = score_for_submission(ranked[1]) if len(ranked) > 1 else 0
     lead = winner_points - second_points
 
-    d.text((470, 100), f"Total: {winner_points} pts", anchor="lt", font=fnt_bold_small, fill="white")
+    d.text((470, 100), f"Total: {winner_points} pts", anchor="lt", font=fonts.bold_small, fill="white")
     if len(ranked) > 1:
         if lead > 0:
             lead_text = f"Lead: +{lead} over #2"
@@ -1488,7 +1678,7 @@ def gen_winner_announcement_board(
             lead_text = "Lead: tied with #2"
         else:
             lead_text = f"Lead: {lead} vs #2"
-        d.text((470, 128), lead_text, anchor="lt", font=fnt_regular, fill="white")
+        d.text((470, 128), lead_text, anchor="lt", font=fonts.regular, fill="white")
 
     # Jury support recap for top point groups (7 and 5)
     votes_by_id: Dict[int, int] = {}
@@ -1523,14 +1713,14 @@ def gen_winner_announcement_board(
 
     def draw_wrapped_support(prefix: str, names: List[str], y_start: int) -> int:
         if not names:
-            d.text((470, y_start), f"{prefix} —", anchor="lt", font=fnt_light, fill="#DDDDDD")
+            d.text((470, y_start), f"{prefix} —", anchor="lt", font=fonts.light, fill="#DDDDDD")
             return y_start + 22
 
         lines: List[str] = []
         current_line = f"{prefix} "
         for idx, name in enumerate(names):
             candidate = current_line + (name if idx == 0 else f", {name}")
-            bbox = d.textbbox((0, 0), candidate, font=fnt_regular)
+            bbox = d.textbbox((0, 0), candidate, font=fonts.regular)
             if bbox[2] - bbox[0] > 390 and current_line != f"{prefix} ":
                 lines.append(current_line)
                 current_line = f"   {name}"
@@ -1542,12 +1732,12 @@ def gen_winner_announcement_board(
 
         y_cursor = y_start
         for line in lines:
-            d.text((470, y_cursor), line, anchor="lt", font=fnt_regular, fill="white")
+            d.text((470, y_cursor), line, anchor="lt", font=fonts.regular, fill="white")
             y_cursor += 22
         return y_cursor
 
     y_offset = 170
-    d.text((470, y_offset), "Top support", anchor="lt", font=fnt_bold_small, fill="white")
+    d.text((470, y_offset), "Top support", anchor="lt", font=fonts.bold_small, fill="white")
     y_offset += 28
     for idx, points in enumerate(groups_to_show):
         y_offset = draw_wrapped_support(f"{points} pts:", supporters_by_points.get(points, []), y_offset)
@@ -1591,7 +1781,7 @@ def gen_winner_announcement_board(
                             break
                     
                     y_offset += 15
-                    d.text((470, y_offset), "Jury Winner", anchor="lt", font=fnt_bold_small, fill="white")
+                    d.text((470, y_offset), "Jury Winner", anchor="lt", font=fonts.bold_small, fill="white")
                     y_offset += 26
                     
                     # Thumbnail
@@ -1602,26 +1792,22 @@ def gen_winner_announcement_board(
                     # Author name
                     juror_name = strip_emoji(id2name.get(juror_winner.author_id, f"User {juror_winner.author_id}"))
                     photo_label = f"Photo #{juror_photo_num}" if juror_photo_num else "Photo"
-                    d.text((545, y_offset + 10), photo_label, anchor="lt", font=fnt_regular, fill="white")
-                    d.text((545, y_offset + 32), juror_name, anchor="lt", font=fnt_regular, fill="white")
+                    d.text((545, y_offset + 10), photo_label, anchor="lt", font=fonts.regular, fill="white")
+                    d.text((545, y_offset + 32), juror_name, anchor="lt", font=fonts.regular, fill="white")
 
     # Volt logo - position at bottom right
-    logo = Image.open("resource/logo_volt.png")
     logo_size = 100
-    img.paste(logo.resize((logo_size, logo_size)), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
+    img.paste(get_logo(logo_size), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
 
-    # Save
     safe_name = category_name.replace(" ", "_").replace("-", "_")
-    filename = f"photo_contest/generated_tables/winner_{safe_name}.png"
-    img.save(filename)
-    return filename
+    return encode_board(img, f"winner_{safe_name}.png")
 
 
 def gen_live_final_reveal(
     competition: CompetitionInfo,
     category_name: str,
     id2name: Dict[int, str],
-) -> Iterator[Tuple[str, Optional[int], bool, bool]]:
+) -> Iterator[Tuple[RenderedBoard, Optional[int], bool, bool]]:
     """Generate live Eurovision-style voting reveal boards for final competition.
     
     Yields boards one at a time as votes are revealed in random order.
@@ -1632,8 +1818,8 @@ def gen_live_final_reveal(
         id2name: Mapping of user IDs to display names
     
     Yields:
-        Tuple of (board_path, voter_id, is_initial, is_final)
-        - board_path: Path to the generated PNG file
+        Tuple of (board, voter_id, is_initial, is_final)
+        - board: The generated RenderedBoard
         - voter_id: ID of the voter whose votes are being shown (None for initial/final)
         - is_initial: True if this is the initial zero-score board
         - is_final: True if this is the final results board
@@ -1651,10 +1837,10 @@ def gen_live_final_reveal(
     # Find the closest valid ranking length (should match JuryVote validation)
     if num_entries >= 10:
         points = POINTS_SETS[10][:num_entries]
-    elif num_entries >= 6:
-        points = POINTS_SETS[6][:num_entries]
+    elif num_entries >= 5:
+        points = POINTS_SETS[5][:num_entries]
     else:
-        points = POINTS_SETS[4][:num_entries]
+        points = POINTS_SETS[3][:num_entries]
     
     # Calculate layout
     half_nb_entries = ceil(num_entries / 2)
@@ -1671,12 +1857,11 @@ def gen_live_final_reveal(
         d = ImageDraw.Draw(img)
         
         title = f"Winner for {category_name}"
-        d.text((375, 20), title, anchor="mt", font=fnt_bold, fill="white")
+        d.text((375, 20), title, anchor="mt", font=fonts.bold, fill="white")
         
         # Volt logo - position at bottom right
-        logo = Image.open("resource/logo_volt.png")
         logo_size = 100
-        img.paste(logo.resize((logo_size, logo_size)), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
+        img.paste(get_logo(logo_size), (img.size[0] - logo_size - 20, img.size[1] - logo_size - 20))
         
         return img, d
     
@@ -1709,23 +1894,22 @@ def gen_live_final_reveal(
             y = 150 + 125 * (i % half_nb_entries)
             
             # Draw photo number and total score
-            d.text((x_title, y), title, anchor="lm", font=fnt_bold, fill="white")
-            d.text((x_title + 325, y), str(running_totals[sub]), anchor="rm", font=fnt_bold, fill="white")
+            d.text((x_title, y), title, anchor="lm", font=fonts.bold, fill="white")
+            d.text((x_title + 325, y), str(running_totals[sub]), anchor="rm", font=fonts.bold, fill="white")
             
             # Underline the leader
             if i == 0:
-                x1, _, x2, y2 = d.textbbox((x_title, y), title, anchor="lm", font=fnt_bold)
+                x1, _, x2, y2 = d.textbbox((x_title, y), title, anchor="lm", font=fonts.bold)
                 d.line((x1, y2 + 5, x2, y2 + 5), width=2, fill="white")
             
             # Show new points if provided
             if new_voter_points and sub in new_voter_points and new_voter_points[sub] > 0:
                 nbP = new_voter_points[sub]
-                font_choice = fnt_bold if nbP == top_p1 else (fnt_bold_small if nbP == top_p2 else fnt_regular)
+                font_choice = fonts.bold if nbP == top_p1 else (fonts.bold_small if nbP == top_p2 else fonts.regular)
                 d.text((x_title + 250, y), str(nbP), anchor="lm", font=font_choice, fill="white")
     
-    # Generate save path
+    # One file name per frame, so that frames of the same reveal never overwrite each other
     safe_category = category_name.replace(" ", "_").replace("-", "_")
-    save_file = f"photo_contest/generated_tables/live_reveal_{safe_category}.png"
     
     # Initial board with all zeros
     img, d = draw_base()
@@ -1733,11 +1917,10 @@ def gen_live_final_reveal(
         photo_num = sub_to_num[sub]
         x_title = 50 if i < half_nb_entries else 400
         y = 150 + 125 * (i % half_nb_entries)
-        d.text((x_title, y), f"Photo #{photo_num}", anchor="lm", font=fnt_bold, fill="white")
-        d.text((x_title + 325, y), "0", anchor="rm", font=fnt_bold, fill="white")
+        d.text((x_title, y), f"Photo #{photo_num}", anchor="lm", font=fonts.bold, fill="white")
+        d.text((x_title + 325, y), "0", anchor="rm", font=fonts.bold, fill="white")
     
-    img.save(save_file)
-    yield save_file, None, True, False
+    yield encode_board(img, f"live_reveal_{safe_category}_0.png"), None, True, False
     
     # Reveal each voter's contribution
     total_voters = len(jury_votes_list)
@@ -1761,18 +1944,16 @@ def gen_live_final_reveal(
             (375, 60),
             f"After votes from {voter_name} ({vote_index}/{total_voters} voters)",
             anchor="mt",
-            font=fnt_bold_small,
+            font=fonts.bold_small,
             fill="white",
         )
         draw_scores(d, voter_points, voter_top_points)
         
-        img.save(save_file)
-        yield save_file, voter_id, False, False
+        yield encode_board(img, f"live_reveal_{safe_category}_{vote_index}.png"), voter_id, False, False
     
     # Final results board
     img, d = draw_base()
-    d.text((375, 60), "Final results", anchor="mt", font=fnt_bold, fill="white")
+    d.text((375, 60), "Final results", anchor="mt", font=fonts.bold, fill="white")
     draw_scores(d)
     
-    img.save(save_file)
-    yield save_file, None, False, True
+    yield encode_board(img, f"live_reveal_{safe_category}_final.png"), None, False, True
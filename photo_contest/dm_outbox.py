@@ -0,0 +1,361 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import nextcord as discord
+
+from executors import executors, write_atomic
+from photo_contest.board_gen import RenderedBoard
+from photo_contest.posting import RateBucket, _retry_after
+
+logger = logging.getLogger("photo_contest_bot")
+
+# Discord allows 10 embeds per message: coalesced confirmations are grouped up to that
+MAX_EMBEDS_PER_MESSAGE = 10
+
+
+@dataclass
+class OutgoingDM:
+    """A DM waiting in the outbox.
+
+    Attributes:
+        id: Unique id of the DM
+        user_id: Recipient
+        content: Text of the message
+        embeds: Embeds, as Embed.to_dict() (so that the outbox can be saved)
+        attachment: File sent with the message, copied in the outbox folder
+        coalesce: DMs to the same user with the same coalesce key are sent as one message
+        attempts: Failed attempts so far
+        not_before: Don't send before this time (retry backoff)
+    """
+    id: str
+    user_id: int
+    content: str = ""
+    embeds: List[Dict[str, Any]] = field(default_factory=list)
+    attachment: Optional[str] = None
+    coalesce: Optional[str] = None
+    attempts: int = 0
+    not_before: float = 0.0
+
+
+@dataclass
+class OutboxStats:
+    sent: int = 0  # messages sent
+    delivered: int = 0  # DMs delivered (a coalesced message delivers several)
+    failed: int = 0  # DMs given up (DMs closed, user gone, or too many failures)
+    retries: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.delivered} DMs delivered in {self.sent} messages, {self.failed} failed, {self.retries} retries"
+
+
+class DMOutbox:
+    """Background queue of the DMs of the bot.
+
+    Handlers enqueue DMs and go on instead of waiting for Discord. The outbox is written to
+    an append-only log (like the transition journal), so DMs still waiting when the bot
+    stops are sent after the restart. The log entries (and the attachments) are written in
+    batches off the event loop, with one fsync per batch, and a DM is only sent once its
+    entry is on disk. The log is compacted to the waiting DMs when it grows too long, and
+    it is loaded on first use. A single worker sends the DMs, paced globally and per
+    user, retrying rate limits and server errors with a backoff. DMs to the same user with
+    the same coalesce key (e.g. vote confirmations) that are waiting together are merged into
+    one message. When the queue drains after a burst, delivery statistics are reported.
+
+    DMs with buttons (views) can't be saved: those are still sent directly with send_dm_safe.
+
+    Args:
+        path: Log of the outbox; attachments are kept in a folder next to it
+        global_limit: At most (calls, per seconds) DMs for the whole bot
+        per_user_interval: Minimum seconds between two DMs to the same user
+        max_attempts: Attempts before giving up on a DM
+        report_threshold: Report the statistics of a burst once the queue drains, if it had at least this many DMs
+        progress_interval: Seconds between two progress logs while DMs are waiting
+        compact_threshold: Compact the log once it has this many entries (and twice as many as waiting DMs)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        global_limit: tuple = (5, 1.0),
+        per_user_interval: float = 2.0,
+        max_attempts: int = 5,
+        report_threshold: int = 10,
+        progress_interval: float = 30.0,
+        compact_threshold: int = 1000,
+    ):
+        self.path = path
+        self.attachments_dir = os.path.splitext(path)[0]
+        self.global_limit = global_limit
+        self.per_user_interval = per_user_interval
+        self.max_attempts = max_attempts
+        self.report_threshold = report_threshold
+        self.progress_interval = progress_interval
+        self.compact_threshold = compact_threshold
+
+        self.pending: Dict[str, OutgoingDM] = {}
+        self.stats = OutboxStats()
+        self._burst = OutboxStats()
+        self._user_ready: Dict[int, float] = {}
+        self._wakeup = asyncio.Event()
+        self._task: "Optional[asyncio.Task[None]]" = None
+        self._loaded = False
+        self._log_size = 0  # entries in the log file
+        # Waiting to be written by the flush task: log entries, attachments to write and to remove
+        self._unflushed: List[str] = []
+        self._unwritten_files: List[Tuple[str, bytes]] = []
+        self._unremoved_files: List[str] = []
+        self._flush_task: "Optional[asyncio.Task[None]]" = None
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn last line
+                if "add" in entry:
+                    dm = OutgoingDM(**entry["add"])
+                    self.pending[dm.id] = dm
+                elif "retry" in entry and entry["retry"] in self.pending:
+                    self.pending[entry["retry"]].attempts = entry["attempts"]
+                    self.pending[entry["retry"]].not_before = entry["not_before"]
+                elif "done" in entry:
+                    self.pending.pop(entry["done"], None)
+
+        # Compact the log: only the DMs still waiting
+        with open(self.path + ".tmp", "w") as f:
+            for dm in self.pending.values():
+                f.write(json.dumps({"add": asdict(dm)}) + "\n")
+        os.replace(self.path + ".tmp", self.path)
+        self._log_size = len(self.pending)
+        if self.pending:
+            logger.info(f"DM outbox: {len(self.pending)} DMs waiting from before the restart")
+
+    def _append(self, entry: Dict[str, Any]):
+        self._unflushed.append(json.dumps(entry) + "\n")
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    def _write(self, files: List[Tuple[str, bytes]], lines: List[str], compacted: bool, removals: List[str]):
+        """Write a batch (in the I/O pool): attachments first, then the log entries, then the removals."""
+        if files:
+            os.makedirs(self.attachments_dir, exist_ok=True)
+        for path, data in files:
+            with open(path, "wb") as f:
+                f.write(data)
+        if compacted:
+            write_atomic(self.path, "".join(lines).encode())
+        elif lines:
+            with open(self.path, "a") as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+        for path in removals:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def _flush(self):
+        while self._unflushed or self._unwritten_files or self._unremoved_files:
+            files, self._unwritten_files = self._unwritten_files, []
+            removals, self._unremoved_files = self._unremoved_files, []
+            compacted = self._log_size + len(self._unflushed) > max(self.compact_threshold, 2 * len(self.pending))
+            if compacted:
+                # The waiting DMs already include every entry not written yet
+                lines = [json.dumps({"add": asdict(dm)}) + "\n" for dm in self.pending.values()]
+            else:
+                lines = self._unflushed
+            self._unflushed = []
+            try:
+                await executors.run_io(self._write, files, lines, compacted, removals)
+            except Exception as e:
+                logger.error(f"DM outbox: could not write the log: {e}")
+                # Try again a bit later, in order with what came since
+                self._unwritten_files[:0] = files
+                self._unremoved_files[:0] = removals
+                if not compacted:
+                    self._unflushed[:0] = lines
+                await asyncio.sleep(1.0)
+                continue
+            self._log_size = len(lines) if compacted else self._log_size + len(lines)
+
+    async def flush(self):
+        """Wait until everything enqueued so far is written to the log."""
+        while self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+
+    def enqueue(
+        self,
+        user_id: int,
+        content: str = "",
+        embed: Optional[discord.Embed] = None,
+        file: Optional[RenderedBoard] = None,
+        coalesce: Optional[str] = None,
+    ):
+        """Queue a DM; it is saved and sent in the background.
+
+        Args:
+            user_id: Recipient
+            content: Text of the message
+            embed: Embed of the message
+            file: Board attached to the message
+            coalesce: Key of the kind of DM that can be merged with the other DMs of that kind to the same user
+        """
+        self._load()
+        dm = OutgoingDM(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            content=content,
+            embeds=[embed.to_dict()] if embed else [],
+            coalesce=None if file else coalesce,
+        )
+        if file is not None:
+            dm.attachment = os.path.join(self.attachments_dir, f"{dm.id}_{file.name}")
+            self._unwritten_files.append((dm.attachment, file.data))
+        self._append({"add": asdict(dm)})
+        self.pending[dm.id] = dm
+        self._wakeup.set()
+
+    def _done(self, dm: OutgoingDM):
+        self.pending.pop(dm.id, None)
+        if dm.attachment:
+            self._unremoved_files.append(dm.attachment)
+        self._append({"done": dm.id})
+
+    def _next_batch(self, now: float) -> List[OutgoingDM]:
+        """The oldest DM that can be sent now, with the DMs it can be merged with."""
+        for dm in self.pending.values():
+            if dm.not_before > now or self._user_ready.get(dm.user_id, 0.0) > now:
+                continue
+            if dm.coalesce is None:
+                return [dm]
+            batch = [
+                other for other in self.pending.values()
+                if other.user_id == dm.user_id and other.coalesce == dm.coalesce and other.not_before <= now
+            ]
+            merged, nb_embeds = [], 0
+            for other in batch:
+                if nb_embeds + len(other.embeds) > MAX_EMBEDS_PER_MESSAGE:
+                    break
+                merged.append(other)
+                nb_embeds += len(other.embeds)
+            return merged or [dm]
+        return []
+
+    def _next_time(self, now: float) -> Optional[float]:
+        """When the next DM can be sent, None if the outbox is empty."""
+        times = [max(dm.not_before, self._user_ready.get(dm.user_id, 0.0)) for dm in self.pending.values()]
+        return max(min(times), now) if times else None
+
+    async def _send(self, bot: discord.Client, batch: List[OutgoingDM]):
+        first = batch[0]
+        user = bot.get_user(first.user_id) or await bot.fetch_user(first.user_id)
+        content = "\n".join(dm.content for dm in batch if dm.content)
+        embeds = [discord.Embed.from_dict(embed) for dm in batch for embed in dm.embeds]
+        kwargs: Dict[str, Any] = {}
+        if content:
+            kwargs["content"] = content
+        if embeds:
+            kwargs["embeds"] = embeds
+        if first.attachment:
+            kwargs["file"] = discord.File(first.attachment, filename=os.path.basename(first.attachment).split("_", 1)[1])
+        await user.send(**kwargs)
+
+    async def _deliver(self, bot: discord.Client, batch: List[OutgoingDM]):
+        user_id = batch[0].user_id
+        self._user_ready[user_id] = time.time() + self.per_user_interval
+        try:
+            await self._send(bot, batch)
+        except (discord.Forbidden, discord.NotFound) as e:
+            logger.info(f"DM outbox: could not DM {user_id} ({type(e).__name__})")
+            for stats in (self.stats, self._burst):
+                stats.failed += len(batch)
+            for dm in batch:
+                self._done(dm)
+            return
+        except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            delay = _retry_after(e) if isinstance(e, discord.HTTPException) else 0.0
+            for dm in batch:
+                dm.attempts += 1
+                if delay is None or dm.attempts >= self.max_attempts:
+                    logger.warning(f"DM outbox: giving up on a DM to {user_id}: {e}")
+                    for stats in (self.stats, self._burst):
+                        stats.failed += 1
+                    self._done(dm)
+                else:
+                    dm.not_before = time.time() + delay + 5 * 2 ** (dm.attempts - 1)
+                    self._append({"retry": dm.id, "attempts": dm.attempts, "not_before": dm.not_before})
+            if delay is not None:
+                for stats in (self.stats, self._burst):
+                    stats.retries += 1
+            return
+
+        for stats in (self.stats, self._burst):
+            stats.sent += 1
+            stats.delivered += len(batch)
+        for dm in batch:
+            self._done(dm)
+
+    async def run(self, bot: discord.Client, report: Optional[Callable[[str], Awaitable[Any]]] = None):
+        """Send the DMs of the outbox as they come (runs forever)."""
+        bucket = RateBucket(*self.global_limit)
+        last_progress = time.monotonic()
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            batch = self._next_batch(now)
+            if batch:
+                # Only send DMs that would be sent again after a restart
+                await self.flush()
+                await bucket.acquire()
+                try:
+                    await self._deliver(bot, batch)
+                except Exception as e:
+                    # Unexpected: drop the batch rather than retrying it forever
+                    logger.error(f"DM outbox: could not send a DM to {batch[0].user_id}: {e}")
+                    for dm in batch:
+                        self._done(dm)
+                if time.monotonic() - last_progress >= self.progress_interval:
+                    last_progress = time.monotonic()
+                    logger.info(f"DM outbox: {len(self.pending)} DMs waiting, {self._burst} since the last report")
+                continue
+
+            burst_total = self._burst.delivered + self._burst.failed
+            if not self.pending and burst_total:
+                if report is not None and burst_total >= self.report_threshold:
+                    try:
+                        await report(f"📬 DM outbox drained: {self._burst}.")
+                    except Exception as e:
+                        logger.warning(f"DM outbox: could not report the statistics: {e}")
+                logger.info(f"DM outbox drained: {self._burst}")
+                self._burst = OutboxStats()
+
+            # Forget the pacing of the users who can be DMed again
+            self._user_ready = {user_id: ready for user_id, ready in self._user_ready.items() if ready > now}
+
+            next_time = self._next_time(now)
+            timeout = None if next_time is None else next_time - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self, bot: discord.Client, report: Optional[Callable[[str], Awaitable[Any]]] = None):
+        """Start sending in the background (no-op if it is already running)."""
+        self._load()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(bot, report))
+
+
+dm_outbox = DMOutbox("photo_contest/dm_outbox.jsonl")
@@ -0,0 +1,206 @@
+"""Checks of the picture downloader against a misbehaving local HTTP server.
+
+A stand-in for the Discord CDN (aiohttp.web, on a free local port) serves one route per
+way a download can go wrong: slow server, stalled body, oversized picture (announced or
+streamed), wrong content type, not a picture, truncated body, transient and permanent
+server errors. Each case drives ImageDownloader.download and checks the outcome: the
+result or the DownloadError, how many requests it took (i.e. whether it was retried),
+and that no partial file is left behind. Two concurrent downloads of the same picture
+must share a single request.
+
+Usage:
+    python -m photo_contest.download_check
+
+The exit code is 1 if a case did not behave as expected.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from io import BytesIO
+from typing import List, Optional
+
+from aiohttp import web
+from PIL import Image
+
+from photo_contest.downloader import DownloadError, ImageDownloader
+
+# Small limits, so that the slow and oversized cases are quick to check
+MAX_BYTES = 200_000
+READ_TIMEOUT = 0.5
+RETRIES = 1
+
+
+def sample_jpeg() -> bytes:
+    """A noisy picture, big enough to be sent in several chunks (but under MAX_BYTES)."""
+    buffer = BytesIO()
+    Image.frombytes("RGB", (160, 120), os.urandom(160 * 120 * 3)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@dataclass
+class Case:
+    """A download and what it must give.
+
+    Attributes:
+        name: Route of the stand-in server (and name of the case)
+        error: Part of the DownloadError message expected, None if the download must succeed
+        requests: Requests the server must receive (RETRIES + 1 if the failure is retried)
+    """
+    name: str
+    error: Optional[str]
+    requests: int
+
+
+CASES = [
+    Case("ok.jpg", None, 1),
+    Case("flaky.jpg", None, 2),  # 503, then the picture
+    Case("slow.jpg", "Timeout", RETRIES + 1),  # no response before the read timeout
+    Case("stalled.jpg", "Timeout", RETRIES + 1),  # the body stops halfway
+    Case("big.jpg", "too big", 1),  # announced size over the limit
+    Case("big-streamed.jpg", "too big", 1),  # no announced size, the body goes over the limit
+    Case("page.jpg", "is not an image", 1),  # text/html
+    Case("fake.jpg", "is not a JPEG, PNG or WebP picture", 1),  # image/jpeg, but HTML inside
+    Case("animated.gif", "is not a JPEG, PNG or WebP picture", 1),
+    Case("empty.jpg", "is empty", 1),
+    Case("truncated.jpg", "Could not download", RETRIES + 1),  # closed before Content-Length
+    Case("error.jpg", "HTTP 500", RETRIES + 1),
+    Case("missing.jpg", "HTTP 404", 1),
+]
+
+
+class StandInServer:
+    """The misbehaving CDN: one route per case, counting the requests it receives."""
+
+    def __init__(self):
+        self.picture = sample_jpeg()
+        self.requests: "Counter[str]" = Counter()
+        self.url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{name}", self._serve)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _stream(self, request: web.Request, chunks: List[bytes], length: Optional[int] = None, pause: float = 0.0) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "image/jpeg"})
+        if length is not None:
+            response.content_length = length
+        await response.prepare(request)
+        try:
+            for i, chunk in enumerate(chunks):
+                if i:
+                    await asyncio.sleep(pause)
+                await response.write(chunk)
+        except ConnectionResetError:
+            pass  # the downloader gave up on this response, as it should
+        return response
+
+    async def _serve(self, request: web.Request) -> web.StreamResponse:
+        name = request.match_info["name"]
+        self.requests[name] += 1
+        picture = self.picture
+
+        if name in ("ok.jpg", "shared.jpg"):
+            await asyncio.sleep(0.2 if name == "shared.jpg" else 0.0)
+            return web.Response(body=picture, content_type="image/jpeg")
+        if name == "flaky.jpg":
+            if self.requests[name] == 1:
+                return web.Response(status=503)
+            return web.Response(body=picture, content_type="image/jpeg")
+        if name == "slow.jpg":
+            await asyncio.sleep(READ_TIMEOUT * 4)
+            return web.Response(body=picture, content_type="image/jpeg")
+        if name == "stalled.jpg":
+            return await self._stream(request, [picture[: len(picture) // 2], picture[len(picture) // 2 :]], len(picture), pause=READ_TIMEOUT * 4)
+        if name == "big.jpg":
+            return await self._stream(request, [picture], MAX_BYTES + 1)
+        if name == "big-streamed.jpg":
+            return await self._stream(request, [picture] + [b"\0" * 64 * 1024] * 8)
+        if name == "page.jpg":
+            return web.Response(text="<html>Not found</html>", content_type="text/html")
+        if name == "fake.jpg":
+            return web.Response(body=b"<html>Not found</html>", content_type="image/jpeg")
+        if name == "animated.gif":
+            return web.Response(body=b"GIF89a" + b"\0" * 100, content_type="image/gif")
+        if name == "empty.jpg":
+            return web.Response(body=b"", content_type="image/jpeg")
+        if name == "truncated.jpg":
+            response = await self._stream(request, [picture[: len(picture) // 2]], len(picture))
+            assert request.transport is not None
+            request.transport.close()
+            return response
+        if name == "error.jpg":
+            return web.Response(status=500)
+        return web.Response(status=404)
+
+
+async def run_checks(folder: str) -> bool:
+    """Run every case, print a report and return whether they all behaved as expected."""
+    server = StandInServer()
+    await server.start()
+    downloader = ImageDownloader(max_bytes=MAX_BYTES, timeout=10.0, read_timeout=READ_TIMEOUT, retries=RETRIES)
+    failures = 0
+    try:
+        for case in CASES:
+            dest_path = os.path.join(folder, case.name)
+            try:
+                result = await downloader.download(f"{server.url}/{case.name}", dest_path)
+                outcome = f"ok ({result.format}, {result.size} bytes)"
+                problem = None if case.error is None else f"expected a DownloadError ({case.error})"
+                if problem is None and result.sha256 != hashlib.sha256(server.picture).hexdigest():
+                    problem = "wrong SHA-256"
+            except DownloadError as e:
+                outcome = f"DownloadError: {e}"
+                problem = "expected a success" if case.error is None else None if case.error in str(e) else f"expected {case.error!r}"
+            if problem is None and server.requests[case.name] != case.requests:
+                problem = f"{server.requests[case.name]} request(s), expected {case.requests}"
+            leftovers = [name for name in os.listdir(folder) if name.endswith(".part")]
+            if problem is None and leftovers:
+                problem = f"partial files left: {leftovers}"
+            if problem is None and (case.error is None) != os.path.exists(dest_path):
+                problem = "the destination file should exist only after a success"
+            failures += problem is not None
+            print(f"{'PASS' if problem is None else 'FAIL'}  {case.name:<18} {outcome}" + (f"\n      {problem}" if problem else ""))
+
+        # The background restore and the picture store can ask for the same picture at once
+        dest_path = os.path.join(folder, "shared.jpg")
+        results = await asyncio.gather(*(downloader.download(f"{server.url}/shared.jpg", dest_path) for _ in range(2)))
+        problem = None
+        if server.requests["shared.jpg"] != 1:
+            problem = f"{server.requests['shared.jpg']} requests, expected 1"
+        elif results[0] != results[1] or not os.path.exists(dest_path):
+            problem = "the two downloads did not get the same picture"
+        failures += problem is not None
+        print(f"{'PASS' if problem is None else 'FAIL'}  {'concurrent':<18} 2 downloads of the same picture" + (f"\n      {problem}" if problem else ""))
+    finally:
+        await downloader.close()
+        await server.close()
+
+    print(f"{len(CASES) + 1 - failures}/{len(CASES) + 1} cases passed")
+    return failures == 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m photo_contest.download_check", description="Check the picture downloader against a misbehaving server")
+    parser.parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="download_check_") as folder:
+        ok = asyncio.run(run_checks(folder))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
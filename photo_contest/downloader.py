@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger("photo_contest_bot")
+
+# Magic bytes of the accepted formats (static images only: GIFs are refused)
+IMAGE_SIGNATURES = {
+    "jpeg": (b"\xff\xd8\xff",),
+    "png": (b"\x89PNG\r\n\x1a\n",),
+}
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadError(Exception):
+    """The picture could not be downloaded, or what was downloaded is not an accepted picture."""
+
+
+def image_format(head: bytes) -> Optional[str]:
+    """Format of an image from its first bytes ("jpeg", "png" or "webp"), None if it is none of them."""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    for fmt, signatures in IMAGE_SIGNATURES.items():
+        if head.startswith(signatures):
+            return fmt
+    return None
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read by chunks (blocking: run it in a thread for big files)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class DownloadResult:
+    format: str  # "jpeg", "png" or "webp"
+    size: int  # bytes
+    sha256: str
+
+
+class _RetriableError(Exception):
+    pass
+
+
+class ImageDownloader:
+    """Streams pictures to disk over a connection pool shared by the whole bot.
+
+    Downloads never block the event loop: the body is read chunk by chunk and written to a
+    temporary file, which replaces the destination only once the picture is complete and
+    checked. A download is refused as soon as it goes over max_bytes, or when the server
+    announces something else than an image. Connection errors, timeouts and server errors
+    are retried with a backoff. Concurrent downloads to the same destination share a single
+    download.
+
+    Args:
+        max_bytes: Largest picture accepted
+        timeout: Timeout of the whole download, in seconds
+        read_timeout: Longest wait for the next chunk of data, in seconds
+        retries: Attempts after the first one
+        max_connections: Size of the connection pool
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 25 * 1024 * 1024,
+        timeout: float = 60.0,
+        read_timeout: float = 15.0,
+        retries: int = 2,
+        max_connections: int = 20,
+    ):
+        self.max_bytes = max_bytes
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=10.0, sock_read=read_timeout)
+        self.retries = retries
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._in_flight: Dict[str, "asyncio.Task[DownloadResult]"] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared session, created in the running event loop on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def download(self, url: str, dest_path: str) -> DownloadResult:
+        """Download the picture at url to dest_path.
+
+        Returns:
+            The format, size and SHA-256 of the picture
+
+        Raises:
+            DownloadError: if the download failed after all retries, was too big, or is not a picture
+        """
+        task = self._in_flight.get(dest_path)
+        if task is None:
+            task = self._in_flight[dest_path] = asyncio.create_task(self._download(url, dest_path))
+            task.add_done_callback(lambda _: self._in_flight.pop(dest_path, None))
+        return await asyncio.shield(task)
+
+    async def _download(self, url: str, dest_path: str) -> DownloadResult:
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._download_once(url, dest_path)
+            except (_RetriableError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise DownloadError(f"Could not download {url}: {e or type(e).__name__}") from e
+                delay = 2 ** attempt
+                logger.warning(f"Download of {url} failed ({e or type(e).__name__}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _download_once(self, url: str, dest_path: str) -> DownloadResult:
+        tmp_path: Optional[str] = None
+        try:
+            async with self.session.get(url) as response:
+                if response.status == 429 or response.status >= 500:
+                    raise _RetriableError(f"HTTP {response.status}")
+                if response.status != 200:
+                    raise DownloadError(f"HTTP {response.status} for {url}")
+
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                if content_type and not (content_type.startswith("image/") or content_type == "application/octet-stream"):
+                    raise DownloadError(f"{url} is not an image ({content_type})")
+                if response.content_length is not None and response.content_length > self.max_bytes:
+                    raise DownloadError(f"{url} is too big ({response.content_length} bytes)")
+
+                fmt = None
+                size = 0
+                digest = hashlib.sha256()
+                # A file of its own, next to the destination so that os.replace is atomic
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest_path) or ".", prefix=os.path.basename(dest_path) + ".", suffix=".part")
+                with os.fdopen(fd, "wb") as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        if fmt is None:
+                            # The first chunk can be tiny: check the signature on the first 12 bytes
+                            if len(chunk) < 12:
+                                try:
+                                    chunk += await response.content.readexactly(12 - len(chunk))
+                                except asyncio.IncompleteReadError as e:
+                                    chunk += e.partial
+                            fmt = image_format(chunk)
+                            if fmt is None:
+                                raise DownloadError(f"{url} is not a JPEG, PNG or WebP picture")
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            raise DownloadError(f"{url} is too big (over {self.max_bytes} bytes)")
+                        digest.update(chunk)
+                        f.write(chunk)
+
+                if fmt is None:
+                    raise DownloadError(f"{url} is empty")
+
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, dest_path)
+            return DownloadResult(fmt, size, digest.hexdigest())
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+downloader = ImageDownloader()
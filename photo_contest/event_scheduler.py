@@ -0,0 +1,110 @@
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, List, Set
+
+from photo_contest.journal import TransitionJournal
+
+logger = logging.getLogger("photo_contest_bot")
+
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """Something the bot has to do at a given time.
+
+    Attributes:
+        timestamp: When to run it (UNIX time)
+        key: Unique name of the event; include the timestamp so that a schedule change makes a new event
+        action: What to run
+        persistent: Persistent events run exactly once, even across restarts (fired events are
+            journaled). Others are only skipped once fired in this process, and dropped when
+            they are more than `stale_after` seconds late (e.g. after a restart).
+    """
+    timestamp: float
+    key: str = field(compare=False)
+    action: Callable[[], Awaitable[Any]] = field(compare=False, repr=False)
+    persistent: bool = field(default=True, compare=False)
+
+
+class EventScheduler:
+    """Sleeps until the next contest event and runs it, instead of polling the schedule.
+
+    The events are recomputed from `load_events` after every wake-up, so that changes of the
+    schedule are picked up; call `reschedule` to wake the scheduler up right away after one.
+    The contest has a few dozen events at most: a heap of them is all the timer wheel needed.
+
+    Args:
+        load_events: Returns every event of the contest, past ones included
+        journal: Where fired persistent events are recorded (as "event/<key>" steps)
+        max_sleep: Longest sleep between two checks, as a safety net against clock changes
+        stale_after: Non persistent events later than this many seconds are dropped
+    """
+
+    def __init__(
+        self,
+        load_events: Callable[[], Iterable[ScheduledEvent]],
+        journal: TransitionJournal,
+        max_sleep: float = 3600.0,
+        stale_after: float = 60.0,
+    ):
+        self.load_events = load_events
+        self.journal = journal
+        self.max_sleep = max_sleep
+        self.stale_after = stale_after
+        self._fired: Set[str] = set()  # non persistent events fired, and events that failed, in this process
+        self._wakeup = asyncio.Event()
+        self._task: "asyncio.Task[None] | None" = None
+
+    def _is_fired(self, event: ScheduledEvent) -> bool:
+        return event.key in self._fired or (event.persistent and self.journal.is_done(f"event/{event.key}"))
+
+    def pending(self, now: float) -> List[ScheduledEvent]:
+        """Events still to run, soonest first."""
+        events = [
+            event for event in self.load_events()
+            if not self._is_fired(event) and (event.persistent or event.timestamp >= now - self.stale_after)
+        ]
+        heapq.heapify(events)
+        return [heapq.heappop(events) for _ in range(len(events))]
+
+    def reschedule(self):
+        """Recompute the events now (e.g. after the schedule or the contest changed)."""
+        self._wakeup.set()
+
+    async def _fire(self, event: ScheduledEvent):
+        late = time.time() - event.timestamp
+        logger.info(f"Running scheduled event {event.key} ({late:.1f}s after its time)")
+        try:
+            if event.persistent:
+                await self.journal.step(f"event/{event.key}", event.action)
+            else:
+                self._fired.add(event.key)
+                await event.action()
+        except Exception as e:
+            # Not retried in this process (it would loop); a persistent event is retried after a restart
+            self._fired.add(event.key)
+            logger.error(f"Scheduled event {event.key} failed: {e}")
+
+    async def run_forever(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            events = self.pending(now)
+            due = [event for event in events if event.timestamp <= now]
+            if due:
+                for event in due:
+                    await self._fire(event)
+                continue
+
+            delay = min(events[0].timestamp - now, self.max_sleep) if events else self.max_sleep
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the scheduler in the background (no-op if it is already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
@@ -2,18 +2,14 @@ from math import ceil
 from random import shuffle
 from typing import Dict, List, Optional, Set, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+from photo_contest.assets import fonts, get_logo
 
 BG_COLOR = "#502379"
 Submission = Tuple[str, int, int]
 PhotoId = Tuple[int, str, str, int]  # photo #, url, local path and id of the author
 
-fnt_light = ImageFont.truetype("resource/Ubuntu-Light.ttf", 15)
-fnt_italic = ImageFont.truetype("resource/Ubuntu-LightItalic.ttf", 15)
-fnt_regular = ImageFont.truetype("resource/Ubuntu-Regular.ttf", 20)
-fnt_bold_small = ImageFont.truetype("resource/Ubuntu-Bold.ttf", 20)
-fnt_bold = ImageFont.truetype("resource/Ubuntu-Bold.ttf", 30)
-
 points_full = [12, 10, 8, 7, 6, 5, 4, 3, 2, 1]
 points_part = [7, 5, 3, 2, 1, 0]
 
@@ -38,20 +34,19 @@ def genSemiThread(
         (375, 20),
         title,
         anchor="mt",
-        font=fnt_bold if len(title) < 46 else fnt_bold_small,
+        font=fonts.bold if len(title) < 46 else fonts.bold_small,
         fill="white",
     )
     d.text(
         (375, 50),
         f"submitted by {id2name[photo_author]}",
         anchor="mt",
-        font=fnt_italic,
+        font=fonts.italic,
         fill="white",
     )
 
     # volt logo
-    logo = Image.open("resource/logo_volt.png")
-    img.paste(logo.resize((150, 150)), (585, 435))
+    img.paste(get_logo(150), (585, 435))
 
     # snippet of the photo
     img_snippet = Image.open(photo_path)
@@ -77,16 +72,16 @@ def genSemiThread(
         (50, 365),
         f"{total_jury_points} point{'s' if total_jury_points != 1 else ''} from the jury",
         anchor="lt",
-        font=fnt_bold_small,
+        font=fonts.bold_small,
         fill="white",
     )
     for i, (juror, points) in enumerate(
         sorted(points_per_juror.items(), key=lambda x: x[1], reverse=True)
     ):
         fnt = (
-            fnt_bold_small
+            fonts.bold_small
             if points == 12
-            else (fnt_regular if points in (8, 10) else fnt_light)
+            else (fonts.regular if points in (8, 10) else fonts.light)
         )
         d.text(
             (50, 395 + i * 25),
@@ -110,16 +105,16 @@ def genSemiThread(
         (400, 100),
         f"{total_points} point{'s' if total_points != 1 else ''} from the global vote",
         anchor="lt",
-        font=fnt_bold_small,
+        font=fonts.bold_small,
         fill="white",
     )
     for i, (voter, points) in enumerate(
         sorted(points_per_voter.items(), key=lambda x: x[1], reverse=True)
     ):
         fnt = (
-            fnt_bold_small
+            fonts.bold_small
             if points == 3
-            else (fnt_regular if points == 2 else fnt_light)
+            else (fonts.regular if points == 2 else fonts.light)
         )
         d.text(
             (400, 135 + i * 25),
@@ -153,11 +148,10 @@ def genVoteAnimFinal(
         d = ImageDraw.Draw(img)
 
         title = f"Winner for {channel_name}"
-        d.text((375, 20), title, anchor="mt", font=fnt_bold, fill="white")
+        d.text((375, 20), title, anchor="mt", font=fonts.bold, fill="white")
 
         # volt logo
-        logo = Image.open("resource/logo_volt.png")
-        img.paste(logo.resize((150, 150)), (585, 435))
+        img.paste(get_logo(150), (585, 435))
 
         return img, d
 
@@ -201,14 +195,14 @@ def genVoteAnimFinal(
             title = f"Photo #{sub2photoid[sub]}"
             x_title = 50 if i < half_nb_entries else 400
             y = 150 + 125 * (i % half_nb_entries)
-            d.text((x_title, y), title, anchor="lm", font=fnt_bold, fill="white")
+            d.text((x_title, y), title, anchor="lm", font=fonts.bold, fill="white")
             d.text(
-                (x_title + 325, y), str(nbP), anchor="rm", font=fnt_bold, fill="white"
+                (x_title + 325, y), str(nbP), anchor="rm", font=fonts.bold, fill="white"
             )
 
             if i == 0:  # underline the winner
                 x1, _, x2, y2 = d.textbbox(
-                    (x_title, y), title, anchor="lm", font=fnt_bold
+                    (x_title, y), title, anchor="lm", font=fonts.bold
                 )
                 d.line((x1, y2 + 5, x2, y2 + 5), width=2, fill="white")
 
@@ -218,9 +212,9 @@ def genVoteAnimFinal(
                     (x_title + 250, y),
                     str(nbP),
                     anchor="lm",
-                    font=fnt_bold
+                    font=fonts.bold
                     if nbP == points[0]
-                    else (fnt_bold_small if nbP == points[1] else fnt_regular),
+                    else (fonts.bold_small if nbP == points[1] else fonts.regular),
                     fill="white",
                 )
 
@@ -231,14 +225,14 @@ def genVoteAnimFinal(
             (50 + 350 * (i >= half_nb_entries), 150 + 125 * (i % half_nb_entries)),
             f"Photo #{i + 1}",
             anchor="lm",
-            font=fnt_bold,
+            font=fonts.bold,
             fill="white",
         )
         d.text(
             (375 + 350 * (i < half_nb_entries), 150 + 125 * (i % half_nb_entries)),
             "0",
             anchor="rm",
-            font=fnt_bold,
+            font=fonts.bold,
             fill="white",
         )
 
@@ -252,7 +246,7 @@ def genVoteAnimFinal(
             (375, 60),
             f"Votes by {id2name[voter]}",
             anchor="mt",
-            font=fnt_bold_small,
+            font=fonts.bold_small,
             fill="white",
         )
 
@@ -264,7 +258,7 @@ def genVoteAnimFinal(
 
     # final results
     img, d = drawBase()
-    d.text((375, 60), "Final results", anchor="mt", font=fnt_bold, fill="white")
+    d.text((375, 60), "Final results", anchor="mt", font=fonts.bold, fill="white")
     drawPoints(d, *partialPoints())
 
     img.save(save_file)
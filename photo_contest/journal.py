@@ -0,0 +1,129 @@
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from executors import executors, write_atomic
+
+
+class TransitionJournal:
+    """Append-only record of the Discord side effects of the period transitions.
+
+    Each step of a transition (create a thread, post submission i, add its reactions...)
+    has a unique key. `step` runs the action of a key once and records its result (usually
+    the id of what was created), so that after a crash, running the transition again skips
+    every step already done and reuses their results instead of calling Discord again.
+
+    The journal lives next to the contest file, one JSON object per line, written and
+    flushed to disk (in the I/O thread pool) right after each step: rewriting the whole
+    contest YAML after every message would cost much more than the messages themselves.
+
+    A step is also marked as started before its action runs. If the bot dies between the
+    Discord call and the record, the step is started but not done: a `reconcile` function
+    can then look for what the call created (e.g. the last messages of the channel) before
+    deciding to run the action again.
+
+    A crash can also leave the last line half written. It is cut off when the journal is
+    loaded, before anything is appended, so that the next entry starts on a line of its own.
+
+    Args:
+        path: Journal file, created on the first record
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._results: Dict[str, Any] = {}
+        self._started: Set[str] = set()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            lines = f.read().split(b"\n")
+        tail = lines.pop()  # after the last newline: nothing, or a line torn by a crash
+        if tail:
+            lines.append(tail)
+
+        kept = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn: the step it recorded did not complete
+            kept.append(line)
+            if entry.get("reset"):
+                self._forget(entry["reset"])
+            elif "result" in entry:
+                self._results[entry["step"]] = entry["result"]
+            else:
+                self._started.add(entry["step"])
+
+        if tail or len(kept) < len(lines):
+            # Rewrite the complete entries only: appending after a torn line would glue the
+            # next entry onto it, and lose it on the next load
+            write_atomic(self.path, b"".join(line + b"\n" for line in kept))
+
+    def _write(self, line: str):
+        with open(self.path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _append(self, entry: Dict[str, Any]):
+        await executors.run_io(self._write, json.dumps(entry) + "\n")
+
+    def _forget(self, prefix: str):
+        self._results = {key: value for key, value in self._results.items() if not key.startswith(prefix)}
+        self._started = {key for key in self._started if not key.startswith(prefix)}
+
+    def is_done(self, key: str) -> bool:
+        return key in self._results
+
+    def result(self, key: str) -> Any:
+        """Recorded result of a step, None if it is not done."""
+        return self._results.get(key)
+
+    def has_started(self, prefix: str) -> bool:
+        """Whether any step whose key starts with prefix was started (e.g. "prep_qualif/")."""
+        return any(key.startswith(prefix) for key in self._started) or any(key.startswith(prefix) for key in self._results)
+
+    async def record(self, key: str, result: Any = True):
+        """Record a step as done with its result (must be JSON serializable)."""
+        await self._append({"step": key, "result": result})
+        self._results[key] = result
+
+    async def reset(self, prefix: str = ""):
+        """Forget the steps whose key starts with prefix (everything by default), to run them again."""
+        await self._append({"reset": prefix})
+        self._forget(prefix)
+
+    async def step(
+        self,
+        key: str,
+        action: Callable[[], Awaitable[Any]],
+        result: Callable[[Any], Any] = lambda _: True,
+        reconcile: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """Run action unless the step is already done, and return the result of the step.
+
+        Args:
+            key: Unique key of the step
+            action: The side effect, e.g. lambda: thread.send(...)
+            result: Turns what action returned into what is recorded, e.g. lambda msg: msg.id
+            reconcile: Called if the step was started but not recorded; returns the result of
+                the interrupted action if it did go through, or None to run the action again
+        """
+        if key in self._results:
+            return self._results[key]
+
+        if key in self._started and reconcile is not None:
+            found = await reconcile()
+            if found is not None:
+                await self.record(key, found)
+                return found
+
+        await self._append({"step": key})
+        self._started.add(key)
+        value = result(await action())
+        await self.record(key, value)
+        return value
@@ -0,0 +1,440 @@
+"""End-to-end load test: a whole photo contest replayed against a fake Discord.
+
+The real photo_contest_bot runs with its REST calls and gateway events served by
+fake_discord.FakeDiscord, while thousands of synthetic users take part in the contest:
+submissions (photo, confirmation button), qualifications and semi-finals (public votes
+with the 0-3 reactions, jury votes through the DM buttons), the final (jury votes) and
+the reveal of the results. Periods are entered the way the scheduler does it, with
+transition_to, right after the previous one is played.
+
+At the end, for each phase: its duration, the latency percentiles of the bot's handlers
+(gateway event to end of handler, interactions to their response, submissions from the
+post to the reposted photo) and the API calls the bot made, by route.
+
+The bot runs in a temporary folder (contest, journal, pictures and outboxes are written
+there, `resource` is linked from the repository), with a contest whose submission period
+is open now. `constantes` must be importable like for the bot itself.
+
+Usage:
+    python -m photo_contest.load_scenario --users 3000 --photos 150 --public-votes 5000 --jury 40
+
+    # Without pacing the bot to Discord's rate limits, to see what its own work costs
+    python -m photo_contest.load_scenario --unpaced
+
+    # Fail (exit code 1) if the event loop was blocked for more than 0.2s at any time
+    python -m photo_contest.load_scenario --fail-on-stalls 0.2
+
+    # Benchmark: the reaction latencies while every board of the contest is being rendered
+    # over and over during the votes (compare with a run without --render-boards)
+    python -m photo_contest.load_scenario --unpaced --render-boards --fail-on-stalls 0.2
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from fake_discord import FakeDiscord, LoadStats, buttons
+from photo_contest.photo_contest_data import Period, Schedule, make_contest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Ids of the synthetic users and of the contest's category channels
+FIRST_USER_ID = 100_000
+FIRST_CATEGORY_ID = 2_000
+
+PUBLIC_VOTE_EMOJIS = ("0️⃣", "1️⃣", "2️⃣", "3️⃣")
+
+
+def prepare_workdir(folder: str, category_ids: List[int]):
+    """Folder the bot runs in: `resource` from the repository, and a contest open for submissions."""
+    os.makedirs(os.path.join(folder, "photo_contest"), exist_ok=True)
+    if not os.path.exists(os.path.join(folder, "resource")):
+        os.symlink(os.path.join(REPOSITORY, "resource"), os.path.join(folder, "resource"))
+
+    now, day = time.time(), 24 * 3600
+    schedule = Schedule(
+        Period(now - 60, now + 30 * day),
+        Period(now + 31 * day, now + 32 * day),
+        Period(now + 33 * day, now + 34 * day),
+        Period(now + 35 * day, now + 36 * day),
+    )
+    make_contest(category_ids, schedule).save(os.path.join(folder, "photo_contest/contest2026.yaml"))
+
+
+def photo_bytes(rng: random.Random) -> bytes:
+    """A small JPEG photo (the bot downloads, stores and thumbnails each of them)."""
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (320, 240), tuple(rng.randrange(256) for _ in range(3)))
+    d = ImageDraw.Draw(img)
+    for _ in range(4):
+        x, y, r = rng.randrange(320), rng.randrange(240), rng.randrange(10, 80)
+        d.ellipse((x - r, y - r, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+    out = BytesIO()
+    img.save(out, "JPEG", quality=85)
+    return out.getvalue()
+
+
+class ContestScenario:
+    """Plays a whole contest against photo_contest_bot through a FakeDiscord.
+
+    Args:
+        users: Number of synthetic members of the guild
+        photos: Number of photos submitted (spread evenly over the categories)
+        categories: Number of category channels (a category needs 25 photos to get qualif threads)
+        public_votes: Number of public vote reactions in qualifs and in semis each
+        jury: Number of jury votes in each voting stage
+        submission_rate: Photos posted per second
+        vote_rate: Public vote reactions per second
+        closed_dms: Share of the users who don't accept DMs
+        think_time: Seconds a user takes before clicking a button (left out of the end to end latencies)
+        api_latency: Seconds each fake API call takes
+        settle_timeout: Maximum seconds to wait for the background work (saves, DMs, cleanup) after each phase
+        unpaced: Lift the bot's own pacing to Discord's rate limits (posting and DM outbox)
+        render_boards: Render the full board set of the contest in a loop during the votes
+        seed: Seed of the users' choices
+    """
+
+    def __init__(
+        self,
+        users: int = 2000,
+        photos: int = 100,
+        categories: int = 3,
+        public_votes: int = 3000,
+        jury: int = 30,
+        submission_rate: float = 5.0,
+        vote_rate: float = 200.0,
+        closed_dms: float = 0.05,
+        think_time: float = 0.3,
+        api_latency: float = 0.03,
+        settle_timeout: float = 300.0,
+        unpaced: bool = False,
+        render_boards: bool = False,
+        seed: int = 0,
+    ):
+        self.nb_users = users
+        self.nb_photos = photos
+        self.category_ids = [FIRST_CATEGORY_ID + i for i in range(categories)]
+        self.nb_public_votes = public_votes
+        self.nb_jury = jury
+        self.submission_rate = submission_rate
+        self.vote_rate = vote_rate
+        self.closed_dms = closed_dms
+        self.think_time = think_time
+        self.api_latency = api_latency
+        self.settle_timeout = settle_timeout
+        self.unpaced = unpaced
+        self.render_boards = render_boards
+        self.rng = random.Random(seed)
+        self.stats = LoadStats()
+        self.user_ids = [FIRST_USER_ID + i for i in range(users)]
+        self.bot: Any = None
+        self.fake: Optional[FakeDiscord] = None
+        self.failures: Dict[str, int] = {}
+
+    # Setup ##################################################################
+
+    def _load_bot(self):
+        import photo_contest_bot as pcb
+        from photo_contest import posting
+
+        pcb.final_reveal_delay = 0
+        if self.unpaced:
+            for kind in posting.ROUTE_LIMITS:
+                posting.ROUTE_LIMITS[kind] = (1000, 1.0)
+            posting.GLOBAL_LIMIT = (1000, 1.0)
+            pcb.dm_outbox.global_limit = (1000, 1.0)
+            pcb.dm_outbox.per_user_interval = 0.0
+        self.pcb = pcb
+
+    async def _start(self):
+        pcb = self.pcb
+        channels = {channel_id: f"category-{i + 1}" for i, channel_id in enumerate(self.category_ids)}
+        channels[pcb.save_channel_id] = "photo-contest-saves"
+        channels[pcb.announcement_channel_id] = "photo-contest"
+        self.fake = fake = FakeDiscord(pcb.voltServer, channels, api_latency=self.api_latency, stats=self.stats)
+        fake.add_user(pcb.organizer_id, "organizer", roles=[pcb.discord_team_role_id])
+        for user_id in self.user_ids:
+            fake.add_user(user_id, f"user{user_id}", dms_open=self.rng.random() >= self.closed_dms)
+
+        self.bot, _ = pcb.main()
+        fake.attach(self.bot)
+        await fake.start()
+        await self._until(lambda: self.pcb.current_period == self.pcb.ContestPeriod.SUBMISSION, 60)
+
+    async def _until(self, predicate, timeout: float, step: float = 0.05) -> bool:
+        """Poll for state the fake is not told about (the bot's globals)."""
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(step)
+        return True
+
+    async def _settle(self):
+        """Wait for the work the handlers left in the background: batched saves, DMs, reaction cleanup."""
+        from photo_contest.vote_pipeline import reaction_cleaner
+
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self.pcb.vote_pipeline.drain(), self.settle_timeout)
+        except asyncio.TimeoutError:
+            pass
+        remaining = max(0.0, self.settle_timeout - (time.monotonic() - start))
+        if not await self._until(lambda: not self.pcb.dm_outbox.pending and reaction_cleaner.queue.empty(), remaining, 0.2):
+            print(f"  still pending after {self.settle_timeout:.0f}s: {len(self.pcb.dm_outbox.pending)} DMs, "
+                  f"{reaction_cleaner.queue.qsize()} reaction removals")
+
+    def _failed(self, what: str):
+        self.failures[what] = self.failures.get(what, 0) + 1
+
+    # Users ##################################################################
+
+    async def _submit(self, user_id: int, channel_id: int, photo: bytes):
+        """Post a photo, confirm it when the bot asks, and wait for its anonymous repost."""
+        fake = self.fake
+        assert fake is not None
+        start = time.perf_counter()
+        message_id = fake.post(user_id, channel_id, "", files=[(f"photo{user_id}.jpg", photo)])
+
+        def confirmation():
+            for message in reversed(fake.messages_in(channel_id)):
+                if message.get("message_reference", {}).get("message_id") == str(message_id) and buttons(message):
+                    return message
+            return None
+
+        try:
+            message = await fake.wait_for(confirmation, 30)
+            confirm = next(b for b in buttons(message) if b["label"].startswith("I confirm"))
+            await asyncio.sleep(self.think_time)
+            fake.click(user_id, int(message["id"]), confirm["custom_id"])
+            await fake.wait_for(lambda: message_id not in fake.messages, 120)
+        except asyncio.TimeoutError:
+            self._failed("submission")
+            return
+        self.stats.latency("submission (end to end)", time.perf_counter() - start - self.think_time)
+
+    async def _public_votes(self, locations: List[Tuple[int, List[int]]]):
+        """React with 0-3 on random submissions of the stage, at vote_rate per second."""
+        fake = self.fake
+        assert fake is not None
+        burst = max(1, int(self.vote_rate / 20))
+        for k in range(self.nb_public_votes):
+            location_id, message_ids = self.rng.choice(locations)
+            user_id = self.rng.choice(self.user_ids)
+            fake.react(user_id, location_id, self.rng.choice(message_ids), self.rng.choice(PUBLIC_VOTE_EMOJIS))
+            if k % burst == burst - 1:
+                await asyncio.sleep(burst / self.vote_rate)
+
+    async def _jury_vote(self, user_id: int, location_id: int, vote_message_id: int):
+        """Ask for the jury DM with 🗳️, click a full ranking in it, then confirm."""
+        fake = self.fake
+        assert fake is not None
+        start, thinking = time.perf_counter(), 0.0
+        nb_dms = len(fake.dms_of(user_id))
+        fake.react(user_id, location_id, vote_message_id, "🗳️")
+
+        def voting_messages():
+            pages = [m for m in fake.dms_of(user_id)[nb_dms:] if any(b["custom_id"].startswith("vote_") for b in buttons(m))]
+            if not pages or ("(Page 1/2)" in pages[0]["content"] and len(pages) < 2):
+                return None
+            return pages
+
+        try:
+            pages = await fake.wait_for(voting_messages, 60)
+            while True:
+                await asyncio.sleep(self.think_time)
+                thinking += self.think_time
+                choices = [(m, b) for m in pages for b in buttons(m) if b["custom_id"].startswith("vote_") and not b.get("disabled")]
+                confirm = next((
+                    (m, b) for m in pages for b in buttons(m) if b.get("label") == "Confirm Vote"
+                ), None)
+                if confirm is not None:
+                    message, button = confirm
+                    nb_dms = len(fake.dms_of(user_id))
+                    fake.click(user_id, int(message["id"]), button["custom_id"])
+                    await fake.wait_for(lambda: any("Your vote has been saved" in m["content"] for m in fake.dms_of(user_id)[nb_dms:]), 60)
+                    break
+                message, button = self.rng.choice(choices)
+                token = fake.click(user_id, int(message["id"]), button["custom_id"])
+                await fake.wait_for(lambda: fake.interactions[token]["responded"], 30)
+        except (asyncio.TimeoutError, IndexError):
+            self._failed("jury vote")
+            return
+        self.stats.latency("jury vote (end to end)", time.perf_counter() - start - thinking)
+
+    def _vote_message(self, location_id: int) -> Optional[int]:
+        """The bot's message of a voting location that carries its own 🗳️ reaction."""
+        assert self.fake is not None
+        for message in self.fake.messages_in(location_id):
+            if self.fake.bot_id in self.fake.reacted_by(int(message["id"]), "🗳️"):
+                return int(message["id"])
+        return None
+
+    async def _jury(self, locations: List[int]):
+        voting = [(location_id, self._vote_message(location_id)) for location_id in locations]
+        voting = [(location_id, message_id) for location_id, message_id in voting if message_id is not None]
+        if not voting:
+            print("  no jury vote message found")
+            return
+        jurors = self.rng.sample([u for u in self.user_ids if u not in self.fake.closed_dms], self.nb_jury)
+        await asyncio.gather(*(self._jury_vote(user_id, *self.rng.choice(voting)) for user_id in jurors))
+
+    # Phases #################################################################
+
+    async def _phase(self, name: str, period: Any = None):
+        """Start measuring a phase, entering `period` the way the scheduler does."""
+        self.stats.start_phase(name)
+        print(f"== {name}")
+        if period is not None:
+            await self.pcb.transition_to(period, self.bot)
+            await self.pcb.save_contest(self.pcb.contest)
+
+    async def submissions(self):
+        await self._phase("submissions")
+        photos = [photo_bytes(self.rng) for _ in range(min(self.nb_photos, 50))]
+        # At most 6 photos per author and category: each author posts at most once per category
+        authors = self.rng.sample(self.user_ids, min(self.nb_users, self.nb_photos))
+        tasks = []
+        for k in range(self.nb_photos):
+            channel_id = self.category_ids[k % len(self.category_ids)]
+            author = authors[k % len(authors)]
+            tasks.append(asyncio.create_task(self._submit(author, channel_id, photos[k % len(photos)])))
+            await asyncio.sleep(1 / self.submission_rate)
+        await asyncio.gather(*tasks)
+        await self._settle()
+
+    async def qualifs(self):
+        await self._phase("qualif", self.pcb.ContestPeriod.QUALIF)
+        comps = [c for c in self.pcb.contest.qualif_competitions if c.thread_id]
+        locations = [(c.thread_id, list(c.msg_to_sub)) for c in comps if c.msg_to_sub]
+        await self._stage(locations, [c.thread_id for c in comps])
+
+    async def semis(self):
+        await self._phase("semis", self.pcb.ContestPeriod.SEMIS)
+        comps = self.pcb.contest.semis_competitions
+        locations = [(c.channel_id, list(c.msg_to_sub)) for c in comps if c.msg_to_sub]
+        await self._stage(locations, [c.channel_id for c in comps])
+
+    async def _stage(self, locations: List[Tuple[int, List[int]]], jury_locations: List[int]):
+        if not locations:
+            print("  nothing to vote on (not enough photos per category?)")
+            return
+        votes = asyncio.gather(self._public_votes(locations), self._jury(jury_locations))
+        if self.render_boards:
+            await asyncio.gather(votes, self._render_board_sets(votes))
+        else:
+            await votes
+        await self._settle()
+
+    async def _render_board_sets(self, votes: "asyncio.Future[Any]"):
+        """Render every board of the contest in the bot's render pool, again and again until the votes are over."""
+        from photo_contest.render_farm import build_offline_id2name, collect_jobs
+        from photo_contest.render_service import render_service
+
+        while not votes.done():
+            contest = self.pcb.contest
+            jobs = collect_jobs(contest, build_offline_id2name(contest))
+            if not jobs:
+                return
+            start = time.perf_counter()
+            async for result in render_service.stream(jobs):
+                if result.error is not None:
+                    self._failed(f"{result.job.renderer} render")
+            self.stats.latency(f"board set render ({len(jobs)} jobs)", time.perf_counter() - start)
+
+    async def final(self):
+        await self._phase("final", self.pcb.ContestPeriod.FINAL)
+        await self._jury([self.pcb.final_channel_id])
+        await self._settle()
+
+    async def reveal(self):
+        await self._phase("reveal", self.pcb.ContestPeriod.IDLE)
+        await self._settle()
+
+    async def run(self) -> LoadStats:
+        self._load_bot()
+        await self._start()
+        try:
+            await self.submissions()
+            await self.qualifs()
+            await self.semis()
+            await self.final()
+            await self.reveal()
+        finally:
+            assert self.fake is not None
+            await self.fake.close()
+        return self.stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m photo_contest.load_scenario", description="Photo contest load test against a fake Discord")
+    parser.add_argument("--users", type=int, default=2000, help="synthetic members of the guild")
+    parser.add_argument("--photos", type=int, default=100, help="photos submitted (a category needs 25 for qualifs)")
+    parser.add_argument("--categories", type=int, default=3)
+    parser.add_argument("--public-votes", type=int, default=3000, help="public vote reactions per voting stage")
+    parser.add_argument("--jury", type=int, default=30, help="jury votes per voting stage")
+    parser.add_argument("--submission-rate", type=float, default=5.0, help="photos posted per second")
+    parser.add_argument("--vote-rate", type=float, default=200.0, help="public vote reactions per second")
+    parser.add_argument("--closed-dms", type=float, default=0.05, help="share of the users who don't accept DMs")
+    parser.add_argument("--think-time", type=float, default=0.3, help="seconds a user takes before clicking a button")
+    parser.add_argument("--api-latency", type=float, default=0.03, help="seconds per fake API call")
+    parser.add_argument("--settle-timeout", type=float, default=300.0, help="maximum wait for the background work after a phase")
+    parser.add_argument("--unpaced", action="store_true", help="lift the bot's pacing to Discord's rate limits")
+    parser.add_argument("--render-boards", action="store_true", help="render every board of the contest in a loop during the votes")
+    parser.add_argument("--fail-on-stalls", type=float, metavar="SECONDS", help="fail if the event loop was ever blocked that long")
+    parser.add_argument("--workdir", help="folder the bot runs in (a temporary one by default)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    scenario = ContestScenario(
+        users=args.users,
+        photos=args.photos,
+        categories=args.categories,
+        public_votes=args.public_votes,
+        jury=args.jury,
+        submission_rate=args.submission_rate,
+        vote_rate=args.vote_rate,
+        closed_dms=args.closed_dms,
+        think_time=args.think_time,
+        api_latency=args.api_latency,
+        settle_timeout=args.settle_timeout,
+        unpaced=args.unpaced,
+        render_boards=args.render_boards,
+        seed=args.seed,
+    )
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="photo_contest_load_")
+    prepare_workdir(workdir, scenario.category_ids)
+    # The bot works with paths relative to where it runs
+    sys.path.insert(0, REPOSITORY)
+    os.chdir(workdir)
+    print(f"Running in {workdir}")
+
+    from loop_watchdog import LoopStalled, loop_watchdog
+
+    if args.fail_on_stalls is not None:
+        loop_watchdog.threshold = args.fail_on_stalls
+    stats = asyncio.run(scenario.run())
+    logging.shutdown()
+    print(stats.report())
+    for what, count in scenario.failures.items():
+        print(f"{count} {what}(s) did not complete")
+    failed = bool(scenario.failures)
+    if args.fail_on_stalls is not None:
+        try:
+            loop_watchdog.check()
+        except LoopStalled as e:
+            print(e)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
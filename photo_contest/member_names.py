@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import nextcord as discord
+
+from executors import dump_json, executors
+
+logger = logging.getLogger("photo_contest_bot")
+
+# Discord answers at most 100 members per query_members request
+QUERY_BATCH_SIZE = 100
+
+
+class MemberNameCache:
+    """Names of the contest participants, resolved with as few Discord calls as possible.
+
+    A name is looked up in the gateway member cache first, then in a cache on disk (names
+    are kept for `ttl` seconds, so a restart does not resolve everyone again), and the
+    remaining ids are asked to Discord in batches of 100 with query_members. Members who
+    left the server are remembered too, so they are not asked for again until the TTL.
+    The disk cache is read on the first resolve and written off the event loop.
+
+    Args:
+        path: JSON file of the disk cache
+        ttl: Seconds a name resolved from Discord is trusted
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._names: Dict[int, Tuple[Optional[str], float]] = {}  # user id -> (name or None if not a member, resolved at)
+        self._loaded = False
+        self.nb_queries = 0
+
+    def _read(self) -> Dict[int, Tuple[Optional[str], float]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return {int(user_id): (name, resolved_at) for user_id, (name, resolved_at) in data.items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring the member name cache {self.path}: {e}")
+            return {}
+
+    async def _load(self):
+        if self._loaded:
+            return
+        names = await executors.run_io(self._read)
+        if not self._loaded:  # unless a concurrent resolve loaded it first
+            self._names = names
+            self._loaded = True
+
+    async def _save(self):
+        try:
+            await dump_json({str(user_id): list(entry) for user_id, entry in self._names.items()}, self.path)
+        except OSError as e:
+            # Not critical: the names are resolved again after a restart
+            logger.warning(f"Could not save the member name cache {self.path}: {e}")
+
+    def _fresh(self, user_id: int, now: float) -> bool:
+        return user_id in self._names and now - self._names[user_id][1] < self.ttl
+
+    async def resolve(self, guild: discord.Guild, user_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """Names of the given users, None for the ones who are not members of the guild."""
+        await self._load()
+        now = time.time()
+        names: Dict[int, Optional[str]] = {}
+        missing: List[int] = []
+        changed = False
+
+        for user_id in dict.fromkeys(user_ids):
+            member = guild.get_member(user_id)
+            if member is not None:
+                names[user_id] = member.name
+                if self._names.get(user_id, (None,))[0] != member.name or not self._fresh(user_id, now):
+                    self._names[user_id] = (member.name, now)
+                    changed = True
+            elif self._fresh(user_id, now):
+                names[user_id] = self._names[user_id][0]
+            else:
+                missing.append(user_id)
+
+        for start in range(0, len(missing), QUERY_BATCH_SIZE):
+            batch = missing[start:start + QUERY_BATCH_SIZE]
+            try:
+                self.nb_queries += 1
+                members = await guild.query_members(user_ids=batch, limit=len(batch))
+            except Exception as e:
+                # Not cached: asked again next time
+                logger.warning(f"Could not query {len(batch)} members: {e}")
+                continue
+            found = {member.id: member.name for member in members}
+            for user_id in batch:
+                names[user_id] = found.get(user_id)
+                self._names[user_id] = (found.get(user_id), now)
+                changed = True
+
+        if changed:
+            await self._save()
+        return names
+
+
+member_names = MemberNameCache("photo_contest/member_names.json")
@@ -1,16 +1,45 @@
 from copy import deepcopy
-from dataclasses import dataclass, field, is_dataclass, fields
+from dataclasses import dataclass, field, is_dataclass, fields, replace
+import functools
 from random import shuffle
-from time import time
-from typing import Any, Literal, Optional, Union
+from time import perf_counter, time
+from typing import Any, Callable, Literal, Optional, TypeVar, Union
 
+import hashlib
 import os
+import tempfile
 import yaml
 from dacite import from_dict, Config
 
 from mistralai import Mistral
 
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Called after each Contest mutation with its name and duration in seconds, if set (see set_mutation_hook)
+_mutation_hook: Optional[Callable[[str, float], None]] = None
+
+
+def set_mutation_hook(hook: Optional[Callable[[str, float], None]]):
+    """Have `hook(name, seconds)` called after each Contest mutation, e.g. to time them (None to stop)."""
+    global _mutation_hook
+    _mutation_hook = hook
+
+
+def _mutation(method: F) -> F:
+    """Report each call of a Contest mutation to the mutation hook."""
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _mutation_hook is None:
+            return method(*args, **kwargs)
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _mutation_hook(method.__name__, perf_counter() - start)
+    return wrapper  # type: ignore[return-value]
+
+
 # Points awarded based on ranking position for different competition sizes
 POINTS_SETS: dict[int, list[int]] = {
     10: [12, 10, 8, 7, 6, 5, 4, 3, 2, 1],
@@ -153,6 +182,8 @@ class CompetitionInfo:
     # Cached vote breakdowns for efficient querying (not serialized)
     _jury_breakdown: dict[Submission, dict[int, int]] = field(default_factory=dict, init=False, repr=False, compare=False)  # submission -> (voter_id -> points)
     _public_breakdown: dict[Submission, dict[int, int]] = field(default_factory=dict, init=False, repr=False, compare=False)  # submission -> (voter_id -> points)
+    # Reverse of msg_to_sub (not serialized): index within self.competing_entries -> message_id of its first post
+    _sub_to_msg: dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def _rebuild_vote_breakdowns(self):
         """Rebuild cached vote breakdowns from raw votes. Called after deserialization."""
@@ -174,6 +205,18 @@ class CompetitionInfo:
             current = self._public_breakdown[submission].get(voter_id, 0)
             self._public_breakdown[submission][voter_id] = current + public_vote.nb_points
 
+    def _rebuild_message_index(self):
+        """Rebuild the index -> message_id map from msg_to_sub."""
+        self._sub_to_msg = {}
+        for message_id, index in self.msg_to_sub.items():
+            self._sub_to_msg.setdefault(index, message_id)
+
+    def message_id_of(self, submission_index: int) -> Optional[int]:
+        """Message ID of the submission at the given index (its first post), None if it has none."""
+        if submission_index not in self._sub_to_msg and len(self._sub_to_msg) != len(set(self.msg_to_sub.values())):
+            self._rebuild_message_index()  # msg_to_sub was filled directly
+        return self._sub_to_msg.get(submission_index)
+
     @property
     def needs_qualification(self) -> bool:
         """Check if this category needs qualification rounds (has >= 25 submissions)."""
@@ -183,6 +226,7 @@ class CompetitionInfo:
         copy = deepcopy(self)
         copy.competing_entries.append(submission)
         copy.msg_to_sub[message_id] = len(copy.competing_entries) - 1
+        copy._sub_to_msg.setdefault(len(copy.competing_entries) - 1, message_id)
 
         return copy
 
@@ -223,6 +267,7 @@ class CompetitionInfo:
         
         copy = deepcopy(self)
         copy.msg_to_sub[message_id] = submission_index
+        copy._sub_to_msg.setdefault(submission_index, message_id)
         return copy
 
     def add_jury_vote(self, vote: JuryVote) -> "CompetitionInfo":
@@ -241,20 +286,26 @@ class CompetitionInfo:
             raise ValueError("Not allowed to vote for yourself")
 
         copy = deepcopy(self)
+        copy._record_public_vote(vote)
+        return copy
+
+    def _record_public_vote(self, vote: PublicVote):
+        """Add a public vote in place (on a copy), replacing the voter's previous vote for that submission."""
+        if vote.voter_id == vote.submission.author_id:
+            raise ValueError("Not allowed to vote for yourself")
         
-        # Remove any existing vote from this voter for this submission
-        copy.votes_public = [
-            v for v in copy.votes_public 
-            if not (v.voter_id == vote.voter_id and v.submission == vote.submission)
-        ]
-        copy.votes_public.append(vote)
+        # Remove any existing vote from this voter for this submission (the breakdown tells if there is one)
+        if vote.voter_id in self._public_breakdown.get(vote.submission, {}):
+            self.votes_public = [
+                v for v in self.votes_public 
+                if not (v.voter_id == vote.voter_id and v.submission == vote.submission)
+            ]
+        self.votes_public.append(vote)
         
         # Update cached breakdown
-        if vote.submission not in copy._public_breakdown:
-            copy._public_breakdown[vote.submission] = {}
-        copy._public_breakdown[vote.submission][vote.voter_id] = vote.nb_points
-
-        return copy
+        if vote.submission not in self._public_breakdown:
+            self._public_breakdown[vote.submission] = {}
+        self._public_breakdown[vote.submission][vote.voter_id] = vote.nb_points
 
     def count_votes_jury(self) -> dict[Submission, int]:
         points: dict[Submission, int] = dict()
@@ -274,6 +325,23 @@ class CompetitionInfo:
 
         return points
 
+    def tally_fingerprint(self) -> str:
+        """Digest of everything the result boards of this competition depend on.
+        
+        Covers the competing entries (in order, since photo numbers come from it) and every
+        jury and public vote, independently of the order in which votes were cast.
+        Message ids are left out: they never show up on a board.
+        """
+        digest = hashlib.sha1(f"{self.type}/{self.channel_id}/{self.thread_id}".encode())
+        for sub in self.competing_entries:
+            digest.update(f"|e{sub.author_id}/{sub.submission_time}/{sub.discord_save_path}".encode())
+        for voter_id in sorted(self.votes_jury):
+            ranking = "/".join(sub.discord_save_path for sub in self.votes_jury[voter_id].ranking)
+            digest.update(f"|j{voter_id}:{ranking}".encode())
+        for vote in sorted(self.votes_public, key=lambda v: (v.voter_id, v.submission.discord_save_path, v.nb_points)):
+            digest.update(f"|p{vote.voter_id}:{vote.nb_points}:{vote.submission.discord_save_path}".encode())
+        return digest.hexdigest()
+
     def get_jury_votes_per_juror(self, submission: Submission) -> dict[int, int]:
         """Get a breakdown of jury points for a specific submission by juror.
         
@@ -307,6 +375,7 @@ class CompetitionInfo:
             for mid, idx in copy.msg_to_sub.items()
             if mid != message_id
         }
+        copy._rebuild_message_index()
 
         return copy, submission
 
@@ -400,6 +469,8 @@ class Contest:
     commentaries: dict[str, dict[int, str]] = field(default_factory=dict)  # key: discord_save_path, value: {author_id: commentary_text}
     commentary_summaries: dict[str, str] = field(default_factory=dict)  # key: discord_save_path, value: summary_text
     submission_posts: dict[str, list[dict[str, Any]]] = field(default_factory=dict)  # key: discord_save_path, value: list of {"message_id": int, "channel_id": int, "thread_id": Optional[int], "is_summary": bool}
+    standings_posts: dict[int, dict[str, Any]] = field(default_factory=dict)  # key: thread_id (or channel_id), value: {"message_id": int, "fingerprint": str} of the live standings board
+    picture_hashes: dict[str, str] = field(default_factory=dict)  # key: discord_save_path, value: SHA-256 of the local copy of the picture
     
     @property
     def submissions(self) -> list[Submission]:
@@ -537,6 +608,7 @@ class Contest:
         # Rebuild cached vote breakdowns for each competition
         for competition in contest.competitions:
             competition._rebuild_vote_breakdowns()
+            competition._rebuild_message_index()
 
         return contest
 
@@ -571,6 +643,29 @@ class Contest:
                 return i, competition
         return None
 
+    def competition_from_location(self, location_id: int, prefer_type: Optional[str] = None) -> Optional[tuple[int, CompetitionInfo]]:
+        """Find a competition from the id of the channel or thread its messages are in.
+
+        Raw gateway events only give that id, not the parent channel of a thread.
+
+        Args:
+            location_id: The thread ID of the competition, or its channel ID for main channels
+            prefer_type: If provided, prefer competitions of this type (same as competition_from_channel_thread)
+
+        Returns:
+            Tuple of (index, competition) if found, None otherwise
+        """
+        if prefer_type:
+            for i, competition in enumerate(self.competitions):
+                if competition.type == prefer_type and (competition.thread_id or competition.channel_id) == location_id:
+                    return i, competition
+
+        for i in range(len(self.competitions) - 1, -1, -1):
+            competition = self.competitions[i]
+            if (competition.thread_id or competition.channel_id) == location_id:
+                return i, competition
+        return None
+
     def get_submission_count(
         self, channel_id: int, thread_id: Optional[int] = None
     ) -> int:
@@ -650,6 +745,7 @@ class Contest:
             return competition.get_submission_from_message(message_id)
         return None
 
+    @_mutation
     def set_message_id(
         self, channel_id: int, thread_id: Optional[int], submission_index: int, message_id: int
     ) -> "Contest":
@@ -678,6 +774,7 @@ class Contest:
                 f"Unable to find a valid competition from the (channel_id, thread_id) provided: ({channel_id}, {thread_id})"
             )
 
+    @_mutation
     def add_submission(
         self, submission: Submission, channel_id: int, message_id: int, thread_id: Optional[int] = None
     ) -> "Contest":
@@ -707,6 +804,7 @@ class Contest:
                 f"Unable to find a valid competition from the (channel_id, thread_id) provided: ({channel_id}, {thread_id})"
             )
 
+    @_mutation
     def withdraw_submission(
         self, channel_id: int, message_id: int, thread_id: Optional[int] = None
     ) -> "Contest":
@@ -737,6 +835,7 @@ class Contest:
                 ret.append(len(list_subs_qualif))
         return ret
 
+    @_mutation
     def make_qualifs(self, list_thread_ids: list[list[int]]) -> "Contest":
         submission_competitions = self.submission_competitions
 
@@ -764,6 +863,18 @@ class Contest:
 
         return copy
 
+    def _with_competition(self, i: int, competition: CompetitionInfo) -> "Contest":
+        """Copy of the contest where competition i is replaced.
+        
+        Only the list of competitions is copied: the other competitions are shared with this
+        contest, which is fine as long as a Contest is never modified in place. A single vote
+        thus copies one competition instead of the whole contest.
+        """
+        competitions = list(self.competitions)
+        competitions[i] = competition
+        return replace(self, competitions=competitions)
+
+    @_mutation
     def save_jury_vote(
         self, channel_id: int, thread_id: Optional[int], voter_id: int, ranking: list[Submission], period: Optional[str] = None
     ) -> "Contest":
@@ -784,17 +895,13 @@ class Contest:
         res = self.competition_from_channel_thread(channel_id, thread_id, prefer_type=period)
         if res:
             i, competition = res
-            competition_new = competition.add_jury_vote(vote)
-
-            copy = deepcopy(self)
-            copy.competitions[i] = competition_new
-
-            return copy
+            return self._with_competition(i, competition.add_jury_vote(vote))
         else:
             raise ValueError(
                 f"Unable to find a valid competition from the (channel_id, thread_id) provided: ({channel_id}, {thread_id})"
             )
 
+    @_mutation
     def save_public_vote(
         self, channel_id: int, thread_id: Optional[int], voter_id: int, nb_points: Union[Literal[0], Literal[1], Literal[2], Literal[3]], submission: Submission, period: Optional[str] = None
     ) -> "Contest":
@@ -817,17 +924,32 @@ class Contest:
 
         if res:
             i, competition = res
-            competition_new = competition.add_public_vote(vote)
-
-            copy = deepcopy(self)
-            copy.competitions[i] = competition_new
-
-            return copy
+            return self._with_competition(i, competition.add_public_vote(vote))
         else:
             raise ValueError(
                 f"Unable to find a valid competition from the (channel_id, thread_id) provided: ({channel_id}, {thread_id})"
             )
 
+    @_mutation
+    def save_public_votes(self, votes: list[tuple[int, PublicVote]]) -> tuple["Contest", list[PublicVote]]:
+        """Save several public votes at once, with a single copy of the contest.
+        
+        Args:
+            votes: (index of the competition in self.competitions, vote), in the order they were cast
+            
+        Returns:
+            Updated Contest, and the votes that were refused (votes for one's own photo)
+        """
+        copy = deepcopy(self)
+        rejected = []
+        for i, vote in votes:
+            try:
+                copy.competitions[i]._record_public_vote(vote)
+            except ValueError:
+                rejected.append(vote)
+        return copy, rejected
+
+    @_mutation
     def solve_qualifs(self) -> tuple["Contest", set[int]]:
         qualif_competitions = self.qualif_competitions
         submission_competitions = self.submission_competitions
@@ -881,7 +1003,9 @@ class Contest:
     def _copy_public_votes_to_semis_internal(contest: "Contest") -> tuple["Contest", set[int]]:
         """Internal method to copy public votes from qualif to semis.
 
-        Uses the immutable pattern - save_public_vote creates new Contest objects.
+        The votes are recorded in place: `contest` must be a copy of its own (solve_qualifs
+        passes the one it just made), so that transferring thousands of votes does not copy
+        the contest once per vote.
         Returns tuple of (updated Contest, set of voter_ids whose votes were transferred).
         """
         voters_transferred: set[int] = set()
@@ -898,13 +1022,8 @@ class Contest:
                         continue
 
                     try:
-                        contest = contest.save_public_vote(
-                            semi.channel_id,
-                            None,
-                            vote.voter_id,
-                            vote.nb_points,
-                            vote.submission,
-                            period="semis"
+                        semi._record_public_vote(
+                            PublicVote(voter_id=vote.voter_id, nb_points=vote.nb_points, submission=vote.submission)
                         )
                         voters_transferred.add(vote.voter_id)
                     except ValueError:
@@ -912,6 +1031,7 @@ class Contest:
 
         return contest, voters_transferred
 
+    @_mutation
     def solve_semis(self, final_channel_id: int) -> "Contest":
         """Solve semi-finals and create the grand final competition.
         
@@ -1066,6 +1186,7 @@ class Contest:
         
         return summary if summary else commentary_texts
 
+    @_mutation
     def add_commentary(
         self, channel_id: int, thread_id: Optional[int], submission: Submission, author_id: int, text: str
     ) -> "Contest":
@@ -1149,6 +1270,7 @@ class Contest:
                     result.append((submission, self.commentary_summaries[key]))
         return result
 
+    @_mutation
     def add_submission_post(
         self, discord_save_path: str, message_id: int, channel_id: int, thread_id: Optional[int], is_summary: bool = False
     ) -> "Contest":
@@ -1181,6 +1303,83 @@ class Contest:
         
         return copy
 
+    @_mutation
+    def set_submission_messages(
+        self, channel_id: int, thread_id: Optional[int], message_ids: dict[int, int]
+    ) -> "Contest":
+        """Record the vote messages posted for several submissions of a competition at once.
+        
+        Same as set_message_id followed by add_submission_post for each submission,
+        with a single copy of the contest.
+        
+        Args:
+            channel_id: The channel ID of the competition
+            thread_id: The thread ID of the competition (None for main channels)
+            message_ids: submission index -> Discord message ID
+            
+        Returns:
+            Updated Contest
+        """
+        res = self.competition_from_channel_thread(channel_id, thread_id)
+        if not res or not message_ids:
+            return self
+        
+        i, competition = res
+        copy = deepcopy(self)
+        for submission_index, message_id in message_ids.items():
+            competition = competition.set_message_id(submission_index, message_id)
+            
+            discord_save_path = competition.competing_entries[submission_index].discord_save_path
+            posts = copy.submission_posts.setdefault(discord_save_path, [])
+            posts[:] = [p for p in posts if p["message_id"] != message_id]
+            posts.append(self._make_submission_post(message_id, channel_id, thread_id, is_summary=False))
+        copy.competitions[i] = competition
+        return copy
+
+    @_mutation
+    def clear_votes(self) -> tuple["Contest", int]:
+        """Remove every jury and public vote, keeping the submissions.
+        
+        Returns:
+            Updated Contest, and the number of votes removed
+        """
+        copy = deepcopy(self)
+        nb_votes = 0
+        for comp in copy.competitions:
+            nb_votes += len(comp.votes_jury) + len(comp.votes_public)
+            comp.votes_jury.clear()
+            comp.votes_public.clear()
+            comp._rebuild_vote_breakdowns()
+        return copy, nb_votes
+
+    @_mutation
+    def set_standings_posts(self, posts: dict[int, dict[str, Any]]) -> "Contest":
+        """Track the live standings boards, in one go for all the threads refreshed together.
+        
+        Args:
+            posts: thread_id (or channel_id) -> {"message_id": int, "fingerprint": str}
+            
+        Returns:
+            Updated Contest
+        """
+        copy = deepcopy(self)
+        copy.standings_posts.update(posts)
+        return copy
+
+    @_mutation
+    def set_picture_hashes(self, hashes: dict[str, str]) -> "Contest":
+        """Record the SHA-256 of the local copies of pictures, to detect corrupt or partial files.
+        
+        Args:
+            hashes: discord_save_path -> SHA-256 of the local file
+            
+        Returns:
+            Updated Contest
+        """
+        copy = deepcopy(self)
+        copy.picture_hashes.update(hashes)
+        return copy
+
     def get_submission_posts(self, discord_save_path: str) -> list[tuple[int, int, Optional[int], bool]]:
         """Get all posts for a submission.
         
@@ -1194,7 +1393,10 @@ class Contest:
         return [self._parse_submission_post(p) for p in posts]
 
     def save(self, path: str):
-        """Save contest to YAML file, excluding cached vote breakdowns."""
+        """Save contest to YAML file, excluding cached vote breakdowns.
+
+        The file is replaced at once, so a concurrent from_file never reads it half written.
+        """
         def safe_asdict(obj):
             # Dataclass: convert to dict, skipping private fields
             if is_dataclass(obj):
@@ -1229,9 +1431,17 @@ class Contest:
             # primitives
             return obj
 
-        data = safe_asdict(self)
-        with open(path, "w") as f:
-            yaml.dump(data, f)
+        data = yaml.dump(safe_asdict(self))
+        # Through a temporary file, so that readers never see the contest half written
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
 
 
 # The contest contains everything
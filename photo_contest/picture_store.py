@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Set
+
+from PIL import Image
+
+from executors import executors
+from photo_contest.downloader import DownloadError, downloader
+from photo_contest.photo_contest_data import CompetitionInfo, Contest, JuryVote, Submission
+
+logger = logging.getLogger("photo_contest_bot")
+
+THUMBNAILS_DIR = "photo_contest/pictures/thumbnails"
+# Thumbnails kept when an original is evicted: big enough for every thumbnail drawn on the boards
+THUMBNAIL_SIZE = (400, 400)
+
+
+def thumbnail_path(img_path: str) -> str:
+    """Where the kept thumbnail of a picture is stored."""
+    name = os.path.splitext(os.path.basename(img_path))[0]
+    return os.path.join(THUMBNAILS_DIR, f"{name}.jpg")
+
+
+def save_thumbnail(img_path: str) -> str:
+    """Write the kept thumbnail of a picture (blocking) and return its path."""
+    path = thumbnail_path(img_path)
+    os.makedirs(THUMBNAILS_DIR, exist_ok=True)
+    with Image.open(img_path) as img:
+        img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+        img.convert("RGB").save(path + ".tmp", format="JPEG", quality=90)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def open_picture(img_path: str) -> Image.Image:
+    """Open a picture for a thumbnail: the original if it is on disk, else its kept thumbnail."""
+    if not os.path.exists(img_path) and os.path.exists(thumbnail_path(img_path)):
+        return Image.open(thumbnail_path(img_path))
+    return Image.open(img_path)
+
+
+def submissions_in(value: Any) -> Set[Submission]:
+    """Every submission referenced by render arguments (competitions, contests, votes, dicts...)."""
+    found: Set[Submission] = set()
+
+    def walk(value: Any):
+        if isinstance(value, Submission):
+            found.add(value)
+        elif isinstance(value, Contest):
+            for comp in value.competitions:
+                walk(comp)
+        elif isinstance(value, CompetitionInfo):
+            found.update(value.competing_entries)
+        elif isinstance(value, JuryVote):
+            found.update(value.ranking)
+        elif isinstance(value, dict):
+            for k, v in value.items():
+                walk(k)
+                walk(v)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            for v in value:
+                walk(v)
+
+    walk(value)
+    return found
+
+
+class PictureStore:
+    """Local copies of the submitted pictures, fetched when a board needs them.
+
+    Boards are rendered in worker processes that read the pictures from disk, so the
+    pictures of a render job are materialised (downloaded from discord_save_path if they
+    are missing) right before the job is sent to a worker. Concurrent requests for the
+    same picture share one download.
+
+    Above the disk quota, the originals that were not used for the longest time are
+    deleted. Their thumbnail is kept, which is all the boards draw (see open_picture);
+    the original is downloaded again when it is asked for explicitly.
+
+    Args:
+        pictures_dir: Folder of the originals
+        quota_bytes: Disk space the originals may use
+        keep_recent: Originals used less than this many seconds ago are never evicted
+    """
+
+    def __init__(self, pictures_dir: str, quota_bytes: int = 2 * 1024 ** 3, keep_recent: float = 3600.0):
+        self.pictures_dir = pictures_dir
+        self.quota_bytes = quota_bytes
+        self.keep_recent = keep_recent
+        self._fetches: Dict[str, "asyncio.Task[None]"] = {}
+        self._evicting = False
+
+    async def ensure(self, submission: Submission, original: bool = False, refetch: bool = False) -> str:
+        """Return the path of the picture, downloading it first if needed.
+
+        Args:
+            submission: Whose picture
+            original: If False, the kept thumbnail of an evicted original is enough (it is for the boards)
+            refetch: Download the picture even if there is a local copy (e.g. a corrupt one)
+
+        Raises:
+            DownloadError: if the picture is missing and could not be downloaded
+        """
+        path = submission.local_save_path
+        if not refetch:
+            if os.path.exists(path):
+                os.utime(path)  # last use, for the eviction
+                return path
+            if not original and os.path.exists(thumbnail_path(path)):
+                return thumbnail_path(path)
+        if not submission.discord_save_path:
+            raise DownloadError(f"{path} is missing and has no URL to download it from")
+
+        if path not in self._fetches:
+            self._fetches[path] = asyncio.create_task(self._fetch(submission))
+        try:
+            await asyncio.shield(self._fetches[path])
+        finally:
+            if path in self._fetches and self._fetches[path].done():
+                del self._fetches[path]
+        return path
+
+    async def _fetch(self, submission: Submission):
+        logger.info(f"Fetching picture {submission.local_save_path} on demand")
+        await downloader.download(submission.discord_save_path, submission.local_save_path)
+        await executors.run_io(save_thumbnail, submission.local_save_path)
+        if not self._evicting:
+            self._evicting = True
+            try:
+                await executors.run_io(self.evict)
+            finally:
+                self._evicting = False
+
+    async def ensure_all(self, submissions: Iterable[Submission]) -> List[Submission]:
+        """Materialise several pictures concurrently.
+
+        Returns:
+            The submissions whose picture could not be fetched (already logged)
+        """
+        submissions = list(submissions)
+        results = await asyncio.gather(*(self.ensure(sub) for sub in submissions), return_exceptions=True)
+        failed = []
+        for submission, result in zip(submissions, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Could not fetch {submission.local_save_path}: {result}")
+                failed.append(submission)
+        return failed
+
+    def evict(self):
+        """Delete the least recently used originals above the quota, keeping their thumbnails (blocking)."""
+        originals = []
+        for entry in os.scandir(self.pictures_dir):
+            if entry.is_file() and not entry.name.endswith((".part", ".tmp")):
+                stat = entry.stat()
+                originals.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in originals)
+        if total <= self.quota_bytes:
+            return
+
+        now = time.time()
+        originals.sort()
+        for last_use, size, path in originals:
+            if total <= self.quota_bytes or now - last_use < self.keep_recent:
+                break
+            try:
+                if not os.path.exists(thumbnail_path(path)):
+                    save_thumbnail(path)
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                logger.warning(f"Could not evict {path}: {e}")
+            except Exception as e:  # not a picture PIL can read: leave it alone
+                logger.warning(f"Not evicting {path}, no thumbnail could be made: {e}")
+        logger.info(f"Pictures folder down to {total / 1024 ** 2:.0f} MiB")
+
+
+picture_store = PictureStore("photo_contest/pictures")
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger("photo_contest_bot")
+
+T = TypeVar("T")
+
+# Discord rate limits we pace ourselves to, as (calls, per seconds): per route kind and channel,
+# and for the whole bot. The library still waits on 429s, this is to avoid getting them at all.
+ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "send": (5, 5.0),
+    "reaction": (4, 1.0),
+    "edit": (5, 5.0),
+}
+GLOBAL_LIMIT: Tuple[int, float] = (45, 1.0)
+
+# Calls that can safely be sent again after a server error (a send might have gone through)
+IDEMPOTENT_ROUTES = {"reaction", "edit", "fetch"}
+
+
+class RateBucket:
+    """Token bucket: at most `calls` acquisitions per `per` seconds, bursts included."""
+
+    def __init__(self, calls: int, per: float):
+        self.capacity = calls
+        self.refill_rate = calls / per
+        self.tokens = float(calls)
+        self.last_refill = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds to wait before retrying a call that failed with `error`, or None if it must not be retried."""
+    status = getattr(error, "status", None)
+    if status == 429:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is None:
+            response = getattr(error, "response", None)
+            try:
+                retry_after = float(response.headers.get("Retry-After"))  # type: ignore[union-attr]
+            except (AttributeError, TypeError, ValueError):
+                retry_after = 1.0
+        return float(retry_after)
+    if isinstance(status, int) and status >= 500:
+        return 0.0  # backoff added by the caller
+    return None
+
+
+class PostingScheduler:
+    """Runs the Discord calls of independent channels concurrently, in order within each channel.
+
+    Each lane is a coroutine (typically: everything posted in one thread) whose calls go through
+    `call`, so messages keep their order inside a lane while lanes progress side by side.
+    Calls are paced per route (kind of call and channel) and globally, rate limited calls are
+    retried after the delay Discord asked for, and progress is logged while lanes run.
+
+    Args:
+        name: Name used in the progress logs (e.g. "qualif prep")
+        max_lanes: Maximum number of lanes running at the same time
+        max_retries: Attempts per call on 429 (and server errors for idempotent calls)
+        progress_interval: Seconds between two progress logs
+    """
+
+    def __init__(self, name: str, max_lanes: int = 20, max_retries: int = 5, progress_interval: float = 30.0):
+        self.name = name
+        self.max_lanes = max_lanes
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+        self._buckets: Dict[Tuple[str, int], RateBucket] = {}
+        self._global_bucket = RateBucket(*GLOBAL_LIMIT)
+        self.nb_calls = 0
+        self.nb_retries = 0
+
+    def _bucket(self, route: Tuple[str, int]) -> Optional[RateBucket]:
+        kind = route[0]
+        if kind not in ROUTE_LIMITS:
+            return None
+        if route not in self._buckets:
+            self._buckets[route] = RateBucket(*ROUTE_LIMITS[kind])
+        return self._buckets[route]
+
+    async def call(self, route: Tuple[str, int], fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Await fn(*args, **kwargs) once the rate limits of the route allow it.
+
+        Args:
+            route: (kind of call, channel id), e.g. ("send", thread.id); kinds are the ROUTE_LIMITS keys
+            fn: The API call, e.g. thread.send
+        """
+        bucket = self._bucket(route)
+        attempt = 0
+        while True:
+            if bucket:
+                await bucket.acquire()
+            await self._global_bucket.acquire()
+            self.nb_calls += 1
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                delay = _retry_after(e)
+                retriable = delay is not None and (getattr(e, "status", None) == 429 or route[0] in IDEMPOTENT_ROUTES)
+                if not retriable or attempt >= self.max_retries:
+                    raise
+                delay = (delay or 0.0) + 2 ** attempt * 0.5
+                attempt += 1
+                self.nb_retries += 1
+                logger.warning(f"{self.name}: {route[0]} in {route[1]} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def run(self, lanes: Dict[Hashable, Coroutine[Any, Any, Any]]) -> Dict[Hashable, BaseException]:
+        """Run the lanes concurrently (at most max_lanes at once) and wait for all of them.
+
+        A failing lane does not stop the others.
+
+        Returns:
+            The errors of the lanes that failed, by lane key
+        """
+        semaphore = asyncio.Semaphore(self.max_lanes)
+        errors: Dict[Hashable, BaseException] = {}
+        done = 0
+        start = time.perf_counter()
+
+        async def run_lane(key: Hashable, lane: Coroutine[Any, Any, Any]):
+            nonlocal done
+            async with semaphore:
+                try:
+                    await lane
+                except Exception as e:
+                    logger.error(f"{self.name}: lane {key} failed: {e}")
+                    errors[key] = e
+                finally:
+                    done += 1
+
+        async def report_progress():
+            while True:
+                await asyncio.sleep(self.progress_interval)
+                logger.info(
+                    f"{self.name}: {done}/{len(lanes)} done after {time.perf_counter() - start:.0f}s "
+                    f"({self.nb_calls} API calls, {self.nb_retries} retries)"
+                )
+
+        reporter = asyncio.create_task(report_progress())
+        try:
+            await asyncio.gather(*(run_lane(key, lane) for key, lane in lanes.items()))
+        finally:
+            reporter.cancel()
+
+        logger.info(
+            f"{self.name}: {len(lanes) - len(errors)}/{len(lanes)} done in {time.perf_counter() - start:.1f}s "
+            f"({self.nb_calls} API calls, {self.nb_retries} retries)"
+        )
+        return errors
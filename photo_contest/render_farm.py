@@ -0,0 +1,394 @@
+"""Offline render farm: regenerate every board of a contest in parallel.
+
+Renders all the boards board_gen can produce for a saved contest, records how long
+each render took, and optionally compares every board pixel by pixel with golden
+images, so that renderers can be optimised without changing their output.
+
+Usage:
+    # Build a synthetic contest (photos, votes, every stage) to render offline
+    python -m photo_contest.render_farm fixture photo_contest/fixture
+
+    # Record golden images from a known good version of the renderers...
+    python -m photo_contest.render_farm render photo_contest/fixture/contest.yaml \\
+        --golden photo_contest/fixture/golden --update-golden
+
+    # ...then check the current renderers against them and against time budgets
+    python -m photo_contest.render_farm render photo_contest/fixture/contest.yaml \\
+        --golden photo_contest/fixture/golden --budget 2 --budget-for gen_live_final_reveal=10
+
+The exit code is 1 if a board failed to render, differs from its golden image,
+has no golden image, or took longer than its budget.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageDraw
+
+from photo_contest.board_gen import RenderedBoard
+from photo_contest.photo_contest_data import (
+    POINTS_SETS,
+    CompetitionInfo,
+    Contest,
+    Period,
+    Schedule,
+    Submission,
+    make_contest,
+)
+from photo_contest.render_service import BoardRenderService, RenderJob, RenderResult
+
+# Seed handed to renderers that shuffle (live reveal), so that their output can be compared
+RENDER_SEED = 2026
+
+
+def category_name(channel_id: int) -> str:
+    return f"Category {channel_id}"
+
+
+def thread_name(comp: CompetitionInfo) -> Optional[str]:
+    return f"Thread {comp.thread_id}" if comp.thread_id else None
+
+
+def build_offline_id2name(contest: Contest) -> Dict[int, str]:
+    """Deterministic display names for every author and voter (there is no Discord offline)."""
+    id2name = {}
+    for comp in contest.competitions:
+        for submission in comp.competing_entries:
+            id2name[submission.author_id] = f"Author {submission.author_id}"
+        for voter_id in comp.votes_jury:
+            id2name.setdefault(voter_id, f"Juror {voter_id}")
+        for vote in comp.votes_public:
+            id2name.setdefault(vote.voter_id, f"Voter {vote.voter_id}")
+    return id2name
+
+
+def collect_jobs(contest: Contest, id2name: Dict[int, str]) -> List[RenderJob]:
+    """One render job per board (or group of boards) the contest can produce, as the bot renders them.
+
+    Each job is tagged with a short label used in the report.
+    """
+    jobs: List[RenderJob] = []
+    qualif_jury_voter_authors = contest.get_jury_voter_authors("qualif")
+    semis_jury_voter_authors = contest.get_jury_voter_authors("semis")
+
+    for comp in contest.qualif_competitions:
+        jobs.append(RenderJob(
+            "gen_competition_board",
+            (comp, category_name(comp.channel_id), id2name, thread_name(comp), qualif_jury_voter_authors),
+            tag=f"qualif board {comp.channel_id}/{comp.thread_id}",
+        ))
+        jobs.append(RenderJob(
+            "gen_contact_sheet",
+            (comp, f"{category_name(comp.channel_id)} - {thread_name(comp)}"),
+            tag=f"qualif contact sheet {comp.channel_id}/{comp.thread_id}",
+        ))
+        for i, submission in enumerate(comp.competing_entries):
+            jobs.append(RenderJob(
+                "gen_photo_vote_details",
+                (submission, comp, category_name(comp.channel_id), id2name, thread_name(comp)),
+                {"jury_voter_authors": qualif_jury_voter_authors},
+                tag=f"qualif details {comp.channel_id}/{comp.thread_id} #{i+1}",
+            ))
+
+    if contest.semis_competitions:
+        channel_names = {comp.channel_id: category_name(comp.channel_id) for comp in contest.semis_competitions}
+        jobs.append(RenderJob("gen_semifinals_boards", (contest, channel_names, id2name), tag="semis boards"))
+
+    for comp in contest.semis_competitions:
+        for i, submission in enumerate(comp.competing_entries):
+            jobs.append(RenderJob(
+                "gen_photo_vote_details",
+                (submission, comp, category_name(comp.channel_id), id2name, None),
+                {"jury_voter_authors": semis_jury_voter_authors},
+                tag=f"semis details {comp.channel_id} #{i+1}",
+            ))
+
+    final_comp = contest.final_competition
+    if final_comp:
+        jobs.append(RenderJob("gen_final_results_board", (contest, id2name), tag="final board"))
+        for i, submission in enumerate(final_comp.competing_entries):
+            jobs.append(RenderJob(
+                "gen_final_photo_vote_details",
+                (submission, final_comp, id2name),
+                {"contest": contest},
+                tag=f"final details #{i+1}",
+            ))
+
+        if final_comp.votes_jury:
+            jury_scores = final_comp.count_votes_jury()
+            winner = max(final_comp.competing_entries, key=lambda x: (jury_scores.get(x, 0), -x.submission_time))
+            jobs.append(RenderJob(
+                "gen_winner_announcement_board",
+                (winner, final_comp.competing_entries, jury_scores, "Grand Final", id2name),
+                {"final_competition": final_comp, "contest": contest},
+                tag="winner board",
+            ))
+            jobs.append(RenderJob(
+                "gen_live_final_reveal",
+                (final_comp, "Grand Final", id2name),
+                tag="live final reveal",
+                seed=RENDER_SEED,
+            ))
+
+    return jobs
+
+
+def boards_of(result: RenderResult) -> List[RenderedBoard]:
+    """Flatten what a renderer returned into the list of its boards."""
+    output = result.board
+    if isinstance(output, RenderedBoard):
+        return [output]
+    # Multi-board renderers return lists; the live reveal yields (board, voter_id, is_initial, is_final)
+    return [item[0] if isinstance(item, tuple) else item for item in output or []]
+
+
+def compare_with_golden(board: RenderedBoard, golden_dir: str, out_dir: str) -> Optional[str]:
+    """Compare a board with its golden image pixel by pixel.
+
+    Returns:
+        None if identical, else a description of the difference (a diff image is written to out_dir)
+    """
+    golden_path = os.path.join(golden_dir, board.name)
+    if not os.path.exists(golden_path):
+        return "no golden image"
+
+    with Image.open(board.open()) as img, Image.open(golden_path) as golden:
+        img, golden = img.convert("RGB"), golden.convert("RGB")
+        if img.size != golden.size:
+            return f"size {img.size} instead of {golden.size}"
+
+        diff = ImageChops.difference(img, golden)
+        bbox = diff.getbbox()
+        if bbox is None:
+            return None
+
+        diff.save(os.path.join(out_dir, f"diff_{board.name}"))
+        return f"pixels differ in {bbox}"
+
+
+async def run_farm(
+    contest: Contest,
+    out_dir: str,
+    golden_dir: Optional[str] = None,
+    update_golden: bool = False,
+    workers: Optional[int] = None,
+    budget: Optional[float] = None,
+    budgets: Optional[Dict[str, float]] = None,
+) -> bool:
+    """Render every board of the contest, print a timing report and return whether everything passed."""
+    os.makedirs(out_dir, exist_ok=True)
+    if golden_dir:
+        os.makedirs(golden_dir, exist_ok=True)
+    budgets = budgets or {}
+
+    id2name = build_offline_id2name(contest)
+    jobs = collect_jobs(contest, id2name)
+    service = BoardRenderService(max_workers=workers)
+
+    rows: List[Tuple[str, str, int, float, str]] = []  # (renderer, label, number of boards, seconds, status)
+    seen_names: Dict[str, str] = {}
+    failures = 0
+
+    start = time.perf_counter()
+    try:
+        async for result in service.stream(jobs):
+            renderer, label = result.job.renderer, result.job.tag
+            problems = []
+
+            if result.error is not None:
+                problems.append(f"render failed: {result.error!r}")
+                boards = []
+            else:
+                boards = boards_of(result)
+
+            for board in boards:
+                if board.name in seen_names:
+                    problems.append(f"{board.name} also produced by {seen_names[board.name]}")
+                seen_names[board.name] = label
+                board.save(out_dir)
+
+                if golden_dir and update_golden:
+                    board.save(golden_dir)
+                elif golden_dir:
+                    difference = compare_with_golden(board, golden_dir, out_dir)
+                    if difference:
+                        problems.append(f"{board.name}: {difference}")
+
+            limit = budgets.get(renderer, budget)
+            if limit is not None and result.seconds > limit:
+                problems.append(f"over budget ({result.seconds:.2f}s > {limit:.2f}s)")
+
+            failures += bool(problems)
+            rows.append((renderer, label, len(boards), result.seconds, "; ".join(problems) or "ok"))
+    finally:
+        service.shutdown()
+    wall_time = time.perf_counter() - start
+
+    rows.sort(key=lambda row: row[3], reverse=True)
+    for renderer, label, nb_boards, seconds, status in rows:
+        print(f"{seconds:7.3f}s  {label:<32} {nb_boards:>3} board{'s' if nb_boards != 1 else ' '}  {status}")
+
+    print()
+    print("Per renderer (count, total, max):")
+    per_renderer: Dict[str, List[float]] = {}
+    for renderer, _, _, seconds, _ in rows:
+        per_renderer.setdefault(renderer, []).append(seconds)
+    for renderer, times in sorted(per_renderer.items()):
+        print(f"  {renderer:<32} {len(times):>4}  {sum(times):7.2f}s  {max(times):6.3f}s")
+
+    total_boards = sum(row[2] for row in rows)
+    print(f"\n{total_boards} boards from {len(rows)} jobs in {wall_time:.2f}s wall time "
+          f"({sum(row[3] for row in rows):.2f}s of rendering), {failures} failing job{'s' if failures != 1 else ''}")
+    if golden_dir and update_golden:
+        print(f"Golden images written to {golden_dir}")
+
+    return failures == 0
+
+
+def make_synthetic_photo(path: str, rng: random.Random):
+    """A photo-like image: random size and aspect ratio, gradient background and a few shapes."""
+    width, height = rng.choice([(1200, 800), (800, 1200), (1000, 1000), (1600, 900), (640, 480)])
+    c1 = tuple(rng.randrange(256) for _ in range(3))
+    c2 = tuple(rng.randrange(256) for _ in range(3))
+
+    gradient = Image.linear_gradient("L").resize((width, height))
+    img = Image.composite(Image.new("RGB", (width, height), c2), Image.new("RGB", (width, height), c1), gradient)
+    d = ImageDraw.Draw(img)
+    for _ in range(6):
+        x, y = rng.randrange(width), rng.randrange(height)
+        r = rng.randrange(20, min(width, height) // 3)
+        d.ellipse((x - r, y - r, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+    img.save(path, quality=90)
+
+
+def make_fixture_contest(
+    folder: str,
+    seed: int = 0,
+    categories: Tuple[int, ...] = (30, 12),
+    nb_authors: int = 15,
+    nb_jurors: int = 12,
+    nb_public_voters: int = 25,
+) -> str:
+    """Build a complete synthetic contest (photos, votes, qualifs, semis and final) in `folder`.
+
+    The first category is large enough to be split in qualification threads, the second
+    one goes straight to the semi-finals. Everything is derived from `seed`.
+
+    Returns:
+        Path to the saved contest YAML
+    """
+    rng = random.Random(seed)
+    random.seed(seed)  # the contest itself shuffles when splitting threads and building the final
+
+    pictures_dir = os.path.join(folder, "pictures")
+    os.makedirs(pictures_dir, exist_ok=True)
+
+    base_time = 1767225600  # 2026-01-01
+    day = 86400
+    schedule = Schedule(
+        Period(base_time, base_time + 7 * day),
+        Period(base_time + 7 * day, base_time + 10 * day),
+        Period(base_time + 10 * day, base_time + 13 * day),
+        Period(base_time + 13 * day, base_time + 15 * day),
+    )
+    channel_ids = [100 + i for i in range(len(categories))]
+    final_channel_id = 999
+    authors = [1000 + i for i in range(nb_authors)]
+    # A few authors also vote as jury, so that the jury bonus shows up on the boards
+    jurors = authors[:3] + [2000 + i for i in range(nb_jurors - 3)]
+    public_voters = [3000 + i for i in range(nb_public_voters)]
+
+    contest = make_contest(channel_ids, schedule)
+    message_id = 5000
+    for channel_id, nb_photos in zip(channel_ids, categories):
+        i, comp = contest.competition_from_channel_thread(channel_id, None)
+        for k in range(nb_photos):
+            path = os.path.join(pictures_dir, f"{channel_id}_{k}.jpg")
+            make_synthetic_photo(path, rng)
+            submission = Submission(rng.choice(authors), base_time + message_id, path, f"https://example.com/{channel_id}/{k}.jpg")
+            comp = comp.add_sub(submission, message_id)
+            message_id += 1
+        # add_submission only works during the submission period, the fixture is built after the fact
+        contest.competitions[i] = comp
+
+    def vote_everywhere(contest: Contest, competitions: List[CompetitionInfo], period: str) -> Contest:
+        for comp in competitions:
+            ranking_length = max(k for k in POINTS_SETS if k <= len(comp.competing_entries))
+            for juror in jurors:
+                candidates = [s for s in comp.competing_entries if s.author_id != juror]
+                if len(candidates) >= ranking_length:
+                    contest = contest.save_jury_vote(comp.channel_id, comp.thread_id, juror, rng.sample(candidates, ranking_length), period=period)
+            if period == "final":
+                continue
+            for voter in public_voters:
+                for submission in rng.sample(comp.competing_entries, min(3, len(comp.competing_entries))):
+                    contest = contest.save_public_vote(comp.channel_id, comp.thread_id, voter, rng.randint(0, 3), submission, period=period)
+        return contest
+
+    thread_ids = iter(range(200, 300))
+    contest = contest.make_qualifs([[next(thread_ids) for _ in range(n)] for n in contest.count_qualifs()])
+    contest = vote_everywhere(contest, contest.qualif_competitions, "qualif")
+    contest, _ = contest.solve_qualifs()
+    contest = vote_everywhere(contest, contest.semis_competitions, "semis")
+    contest = contest.solve_semis(final_channel_id)
+    contest = vote_everywhere(contest, [contest.final_competition], "final")
+
+    path = os.path.join(folder, "contest.yaml")
+    contest.save(path)
+    return path
+
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = {}
+    for value in values:
+        renderer, _, seconds = value.partition("=")
+        if not seconds:
+            raise argparse.ArgumentTypeError(f"Expected RENDERER=SECONDS, got {value!r}")
+        budgets[renderer] = float(seconds)
+    return budgets
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m photo_contest.render_farm", description="Offline board render farm")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fixture = commands.add_parser("fixture", help="build a synthetic contest with generated photos")
+    fixture.add_argument("folder", help="where to write contest.yaml and the pictures")
+    fixture.add_argument("--seed", type=int, default=0)
+
+    render = commands.add_parser("render", help="render every board of a contest")
+    render.add_argument("contest", help="contest YAML file")
+    render.add_argument("--out", default="photo_contest/generated_tables/render_farm", help="where to write the boards")
+    render.add_argument("--golden", help="folder of golden images to compare against")
+    render.add_argument("--update-golden", action="store_true", help="write the boards as the new golden images")
+    render.add_argument("--workers", type=int, help="number of render processes (default: one per CPU)")
+    render.add_argument("--budget", type=float, help="maximum seconds per render job")
+    render.add_argument("--budget-for", action="append", default=[], metavar="RENDERER=SECONDS",
+                        help="budget for one renderer, e.g. gen_live_final_reveal=10 (repeatable)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "fixture":
+        path = make_fixture_contest(args.folder, args.seed)
+        print(f"Fixture contest written to {path}")
+        return 0
+
+    contest = Contest.from_file(args.contest)
+    ok = asyncio.run(run_farm(
+        contest,
+        args.out,
+        golden_dir=args.golden,
+        update_golden=args.update_golden,
+        workers=args.workers,
+        budget=args.budget,
+        budgets=parse_budgets(args.budget_for),
+    ))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
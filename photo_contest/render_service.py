@@ -0,0 +1,131 @@
+import asyncio
+import inspect
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from bot_metrics import metrics
+from executors import Executors, executors
+from photo_contest import board_gen
+from photo_contest.assets import warm_up
+from photo_contest.board_gen import RenderedBoard
+from photo_contest.picture_store import picture_store, submissions_in
+
+
+@dataclass
+class RenderJob:
+    """A board render request that can be shipped to a worker process.
+
+    Args:
+        renderer: Name of the board_gen function to call (e.g. "gen_photo_vote_details")
+        args: Positional arguments, must be picklable snapshots (contest dataclasses, dicts, sets)
+        kwargs: Keyword arguments, same constraint as args
+        tag: Caller data handed back with the result; stays in the bot process and is never pickled
+        seed: If set, the worker seeds `random` with it first (for renderers that shuffle, e.g. live reveals)
+    """
+    renderer: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    tag: Any = None
+    seed: Optional[int] = None
+
+
+@dataclass
+class RenderResult:
+    """Outcome of a RenderJob.
+    
+    Attributes:
+        job: The job that was rendered
+        board: What the renderer returned (a RenderedBoard, or a list of them for multi-board renderers)
+        error: The error raised while rendering, if any
+        seconds: Time spent rendering in the worker
+    """
+    job: RenderJob
+    board: Optional[Union[RenderedBoard, List[Any]]] = None
+    error: Optional[BaseException] = None
+    seconds: float = 0.0
+
+
+def _run_job(renderer: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], seed: Optional[int] = None) -> Tuple[Any, float]:
+    """Worker-side entry point: look up the board_gen renderer, run it and time it.
+    
+    Generators (e.g. gen_live_final_reveal) cannot be sent back to the bot process,
+    so they are run to completion and returned as a list.
+    """
+    if seed is not None:
+        random.seed(seed)
+    start = time.perf_counter()
+    output = getattr(board_gen, renderer)(*args, **kwargs)
+    if inspect.isgenerator(output):
+        output = list(output)
+    return output, time.perf_counter() - start
+
+
+class BoardRenderService:
+    """Renders boards in a process pool and streams the results back to the event loop.
+
+    Boards are rendered in the render pool shared by the bots (see executors), created on
+    first use, so importing this module is free. Each worker loads the fonts and the logo
+    once when it starts instead of on every board. The pictures a job needs are fetched by
+    the picture store before the job goes to a worker.
+
+    Args:
+        max_workers: Size of a render pool of its own (e.g. for the render farm); by default,
+            the shared pool is used
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.executors = executors if max_workers is None else Executors(render_workers=max_workers)
+        self.executors.on_worker_start(warm_up)
+
+    async def _submit(self, job: RenderJob) -> Tuple[Any, float]:
+        """Fetch the pictures the job needs, then run it in a worker."""
+        await picture_store.ensure_all(submissions_in((job.args, job.kwargs)))
+        output, seconds = await self.executors.run_render(_run_job, job.renderer, job.args, job.kwargs, job.seed)
+        metrics.observe("board_render_seconds", seconds, renderer=job.renderer)
+        return output, seconds
+
+    async def render(self, job: RenderJob) -> Any:
+        """Render off the event loop and return what the renderer returned (usually a RenderedBoard)."""
+        output, _ = await self._submit(job)
+        return output
+
+    async def stream(self, jobs: Iterable[RenderJob], ready: Iterable[RenderResult] = ()) -> AsyncIterator[RenderResult]:
+        """Submit all jobs at once and yield each result as soon as it is ready.
+
+        Results come back in completion order, not submission order; use `RenderJob.tag`
+        to match them with their context. A failing render is yielded with `error` set
+        instead of aborting the remaining jobs. Results passed as `ready` (e.g. from a
+        cache) are yielded first, while the jobs are already rendering.
+        """
+        pending: Dict[asyncio.Future, RenderJob] = {
+            asyncio.ensure_future(self._submit(job)): job
+            for job in jobs
+        }
+
+        try:
+            for result in ready:
+                yield result
+
+            while pending:
+                done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    job = pending.pop(future)
+                    try:
+                        output, seconds = future.result()
+                        result = RenderResult(job, board=output, seconds=seconds)
+                    except Exception as e:
+                        result = RenderResult(job, error=e)
+                    yield result
+        finally:
+            # The consumer stopped early: drop the jobs that have not started yet
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        """Stop the worker processes (pending jobs are cancelled)."""
+        self.executors.shutdown()
+
+
+render_service = BoardRenderService()
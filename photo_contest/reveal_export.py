@@ -0,0 +1,126 @@
+import io
+import sys
+import time
+import zipfile
+from typing import List, Sequence, Tuple, Union
+
+from PIL import Image
+
+# Formats understood by encode_reveal: a single animated file, or a zip of numbered PNG frames
+# (the ffmpeg-free export, e.g. `ffmpeg -i frame_%03d.png` or any video editor can pick them up)
+EXPORT_FORMATS = ("webp", "gif", "zip")
+
+
+def encode_animation(
+    frames: Sequence[Image.Image],
+    fmt: str = "webp",
+    durations: Union[int, Sequence[int]] = 2000,
+) -> bytes:
+    """Encode frames into a single looping animated WebP or GIF.
+
+    Args:
+        frames: The frames, all of the same size
+        fmt: "webp" or "gif"
+        durations: Display time in milliseconds, for all frames or per frame
+
+    Returns:
+        The encoded file
+    """
+    if not frames:
+        raise ValueError("Cannot encode an animation without frames")
+
+    first, *others = frames
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        # method 4 is the default speed/size trade-off; quality 90 keeps the text crisp
+        first.save(buffer, format="WEBP", save_all=True, append_images=others,
+                   duration=durations, loop=0, quality=90, method=4)
+    elif fmt == "gif":
+        # Boards are mostly flat colors, so an adaptive palette per frame stays close to the PNG;
+        # Pillow then only stores the part of each frame that changed
+        frames = [frame.convert("RGB").convert("P", palette=Image.Palette.ADAPTIVE) for frame in frames]
+        first, *others = frames
+        first.save(buffer, format="GIF", save_all=True, append_images=others,
+                   duration=durations, loop=0, optimize=True, disposal=1)
+    else:
+        raise ValueError(f"Unknown animation format: {fmt}")
+    return buffer.getvalue()
+
+
+def encode_frame_sequence(frames: Sequence[Image.Image], prefix: str = "frame") -> bytes:
+    """Encode frames as numbered PNGs ({prefix}_000.png, ...) in a single zip archive."""
+    buffer = io.BytesIO()
+    # PNGs are already compressed: storing them is as small and much faster
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for i, frame in enumerate(frames):
+            png = io.BytesIO()
+            frame.save(png, format="PNG")
+            archive.writestr(f"{prefix}_{i:03d}.png", png.getvalue())
+    return buffer.getvalue()
+
+
+def encode_reveal(
+    frames: Sequence[Image.Image],
+    fmt: str = "webp",
+    durations: Union[int, Sequence[int]] = 2000,
+) -> bytes:
+    """Encode a reveal sequence in one of EXPORT_FORMATS (durations are ignored for "zip")."""
+    if fmt == "zip":
+        return encode_frame_sequence(frames)
+    return encode_animation(frames, fmt, durations)
+
+
+def benchmark(
+    frames: Sequence[Image.Image],
+    formats: Sequence[str] = EXPORT_FORMATS,
+) -> List[Tuple[str, float, int]]:
+    """Encode the same frames in each format.
+
+    Returns:
+        List of (format, encode time in seconds, output size in bytes)
+    """
+    results = []
+    for fmt in formats:
+        start = time.perf_counter()
+        data = encode_reveal(frames, fmt)
+        results.append((fmt, time.perf_counter() - start, len(data)))
+    return results
+
+
+def main(contest_path: str = "photo_contest/contest2026.yaml"):
+    """Benchmark the export of the final reveal of a saved contest.
+
+    Usage: python -m photo_contest.reveal_export [contest.yaml]
+    """
+    from photo_contest.board_gen import iter_final_reveal_frames
+    from photo_contest.photo_contest_data import Contest
+
+    contest = Contest.from_file(contest_path)
+    final_comp = contest.final_competition
+    if not final_comp or not final_comp.votes_jury:
+        print(f"No final votes in {contest_path}, nothing to export")
+        return
+
+    voter_order = list(final_comp.votes_jury.keys())
+    id2name = {voter_id: f"Juror {voter_id}" for voter_id in voter_order}
+    for submission in final_comp.competing_entries:
+        id2name.setdefault(submission.author_id, f"User {submission.author_id}")
+
+    start = time.perf_counter()
+    frames = list(iter_final_reveal_frames(final_comp, id2name, voter_order))
+    render_time = time.perf_counter() - start
+
+    png_size = 0
+    for frame in frames:
+        png = io.BytesIO()
+        frame.save(png, format="PNG")
+        png_size += len(png.getvalue())
+
+    print(f"{len(frames)} frames of {frames[0].width}x{frames[0].height} rendered in {render_time:.2f}s")
+    print(f"{'one PNG per frame':<20} {png_size / 1024:>10.1f} KiB in {len(frames)} uploads")
+    for fmt, seconds, size in benchmark(frames):
+        print(f"{fmt:<20} {size / 1024:>10.1f} KiB in 1 upload, encoded in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
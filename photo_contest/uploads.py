@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import nextcord as discord
+
+logger = logging.getLogger("photo_contest_bot")
+
+# Discord accepts up to 10 attachments per message, and 2000 characters of content
+MAX_FILES_PER_MESSAGE = 10
+MAX_CONTENT_LENGTH = 2000
+
+
+@dataclass
+class _PendingUpload:
+    channel: discord.abc.Messageable
+    file: discord.File
+    description: str
+    future: "asyncio.Future[str]"
+
+
+class UploadBatcher:
+    """Uploads files in messages of up to 10 attachments to get their permanent CDN URLs.
+
+    Callers upload one file each and get the URL of their own attachment back, but the
+    files uploaded around the same time go out together: the batcher waits `linger`
+    seconds for more files before sending a message, unless it already has 10.
+
+    Args:
+        linger: Seconds to wait for more files before sending a message that is not full
+    """
+
+    def __init__(self, linger: float = 0.5):
+        self.linger = linger
+        self._pending: List[_PendingUpload] = []
+        self._flusher: "Optional[asyncio.Task[None]]" = None
+        self._full = asyncio.Event()
+        self.nb_messages = 0
+        self.nb_files = 0
+
+    async def upload(self, channel: discord.abc.Messageable, file: discord.File, description: str) -> str:
+        """Upload a file to channel and return the URL of the attachment.
+
+        Raises:
+            RuntimeError: if the upload failed
+        """
+        future: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingUpload(channel, file, description, future))
+        if len(self._pending) >= MAX_FILES_PER_MESSAGE:
+            self._full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return await future
+
+    async def _flush_loop(self):
+        while self._pending:
+            if len(self._pending) < MAX_FILES_PER_MESSAGE:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.linger)
+                except asyncio.TimeoutError:
+                    pass
+
+            # One message per channel: take the next files going to the same channel as the oldest one
+            channel = self._pending[0].channel
+            batch = [upload for upload in self._pending if upload.channel is channel][:MAX_FILES_PER_MESSAGE]
+            self._pending = [upload for upload in self._pending if upload not in batch]
+            await self._send(channel, batch)
+
+    async def _send(self, channel: discord.abc.Messageable, batch: List[_PendingUpload]):
+        # Attachments are matched back by position, but names must be unique within a message
+        names = set()
+        for i, upload in enumerate(batch):
+            if upload.file.filename in names:
+                upload.file.filename = f"{i}_{upload.file.filename}"
+            names.add(upload.file.filename)
+
+        content = "\n".join(upload.description for upload in batch)[:MAX_CONTENT_LENGTH]
+        try:
+            message = await channel.send(content=content, files=[upload.file for upload in batch])
+            if len(message.attachments) != len(batch):
+                raise RuntimeError(f"Upload failed - {len(message.attachments)} attachments for {len(batch)} files")
+        except Exception as e:
+            for upload in batch:
+                if not upload.future.done():
+                    upload.future.set_exception(e if isinstance(e, RuntimeError) else RuntimeError(f"Upload failed: {e}"))
+            return
+
+        self.nb_messages += 1
+        self.nb_files += len(batch)
+        for upload, attachment in zip(batch, message.attachments):
+            if not upload.future.done():
+                upload.future.set_result(attachment.url)
+        logger.info(f"Uploaded {len(batch)} file(s) in one message to the save channel")
+
+
+save_uploads = UploadBatcher()
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+import nextcord as discord
+
+from photo_contest.posting import PostingScheduler
+
+logger = logging.getLogger("photo_contest_bot")
+
+T = TypeVar("T")
+
+
+@dataclass
+class ReactionVote:
+    """A vote reaction, decoded from the raw gateway event without any API call.
+
+    Attributes:
+        location_id: Channel or thread the reaction was added in
+        message_id: The reacted message
+        user_id: The voter
+        emoji: The reaction
+        guild: Server of the reaction (from the gateway cache): only its members can vote
+        received_at: When the event was received (time.monotonic), to measure the commit latency
+    """
+    location_id: int
+    message_id: int
+    user_id: int
+    emoji: str
+    guild: discord.Guild
+    received_at: float = field(default_factory=time.monotonic)
+
+
+class BatchCommitter(Generic[T]):
+    """Queue of items applied in batches by a single committer task.
+
+    Handlers submit items and return at once. The committer waits `linger` seconds after
+    the first item of a batch for more to come, then hands up to `max_batch` items to
+    `commit`, which applies them with one durable write. Since a single task commits,
+    batches never race with each other.
+
+    If `commit` raises, the batch stays at the front of the queue and is committed again
+    (with the items submitted meanwhile, still in arrival order) after a delay that doubles
+    up to `max_retry_delay`. `commit` must thus be safe to call again with the same items.
+
+    Args:
+        commit: Applies a batch (called with the items in arrival order)
+        linger: Seconds to wait for more items before committing a batch
+        max_batch: Largest batch
+        retry_delay: Seconds to wait before the first retry of a failed batch
+        max_retry_delay: Longest wait between two retries
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[List[T]], Awaitable[None]],
+        linger: float = 0.2,
+        max_batch: int = 2000,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+    ):
+        self.commit = commit
+        self.linger = linger
+        self.max_batch = max_batch
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.queue: "asyncio.Queue[T]" = asyncio.Queue()
+        self.nb_submitted = 0
+        self.nb_committed = 0
+        self.nb_batches = 0
+        self._committed = asyncio.Event()
+        self._task: "Optional[asyncio.Task[None]]" = None
+
+    def submit(self, item: T):
+        self.queue.put_nowait(item)
+        self.nb_submitted += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        batch: List[T] = []  # not empty only while a failed batch waits for its retry
+        delay = self.retry_delay
+        while True:
+            if not batch:
+                batch.append(await self.queue.get())
+                await asyncio.sleep(self.linger)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await self.commit(batch)
+            except Exception as e:
+                logger.error(f"Could not commit a batch of {len(batch)} items, retrying in {delay:g}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            delay = self.retry_delay
+            self.nb_committed += len(batch)
+            self.nb_batches += 1
+            self._committed.set()
+            batch = []
+
+    async def drain(self):
+        """Wait until every item submitted so far went through commit."""
+        target = self.nb_submitted
+        while self.nb_committed < target:
+            self._committed.clear()
+            await self._committed.wait()
+
+
+class ReactionCleaner:
+    """Removes reactions in the background, paced by a PostingScheduler.
+
+    Public votes stay invisible by removing the vote reactions once they are saved. Discord
+    rate limits reaction removals per channel, so they run in a few workers of their own
+    instead of holding back the vote handling.
+
+    Args:
+        workers: Number of removals in flight
+    """
+
+    def __init__(self, workers: int = 4):
+        self.scheduler = PostingScheduler("Reaction cleanup")
+        self.queue: "asyncio.Queue[ReactionVote]" = asyncio.Queue()
+        self.workers = workers
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    def remove(self, reaction: ReactionVote):
+        """Queue the removal of a reaction (done once the cleaner is started)."""
+        self.queue.put_nowait(reaction)
+
+    async def _work(self, client: discord.Client):
+        while True:
+            reaction = await self.queue.get()
+            # The type is only checked by get_partial_message: threads and channels are handled alike
+            channel = client.get_partial_messageable(reaction.location_id, type=discord.ChannelType.text)
+            message = channel.get_partial_message(reaction.message_id)
+            try:
+                await self.scheduler.call(
+                    ("reaction", reaction.location_id), message.remove_reaction, reaction.emoji, discord.Object(reaction.user_id)
+                )
+            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+                pass
+            except Exception as e:
+                logger.warning(f"Could not remove a {reaction.emoji} reaction of {reaction.user_id}: {e}")
+
+    def start(self, client: discord.Client):
+        """Start the workers (no-op if they are already running)."""
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._work(client)))
+
+
+reaction_cleaner = ReactionCleaner()
@@ -3,27 +3,36 @@ from copy import deepcopy
 import os
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 import logging
 import nextcord as discord
 import random
 import re
-import requests
+import time
 from arrow import utcnow
 from nextcord.ext import commands, tasks
 
 import constantes
-
-from photo_contest.photo_contest_data import JuryVote, Contest, Period, Schedule, Submission, make_contest
-from photo_contest.board_gen import (
-    gen_competition_board,
-    gen_semifinals_boards,
-    gen_final_results_board,
-    gen_photo_vote_details,
-    gen_final_photo_vote_details,
-    gen_winner_announcement_board,
-)
+from bot_metrics import metrics
+from executors import SnapshotWriter, executors
+from loop_watchdog import loop_watchdog
+from sampling_profiler import profiler
+
+from photo_contest.photo_contest_data import CompetitionInfo, JuryVote, Contest, Period, PublicVote, Schedule, Submission, make_contest, set_mutation_hook
+from photo_contest.journal import TransitionJournal
+from photo_contest.uploads import save_uploads
+from photo_contest.dm_outbox import dm_outbox
+from photo_contest.vote_pipeline import BatchCommitter, ReactionVote, reaction_cleaner
+from photo_contest.member_names import member_names
+from photo_contest.event_scheduler import EventScheduler, ScheduledEvent
+from photo_contest.posting import PostingScheduler
+from photo_contest.board_gen import RenderedBoard, strip_emoji
+from photo_contest.assets import warm_up
+from photo_contest.downloader import DownloadError, downloader, file_sha256, image_format
+from photo_contest.picture_store import picture_store, thumbnail_path
+from photo_contest.board_cache import board_cache
+from photo_contest.render_service import RenderJob, render_service
 
 class ContestPeriod(Enum):
     IDLE = "idle"
@@ -76,14 +85,32 @@ discord_team_role_id = 674583505446895616
 save_channel_id = 1421893549573537842
 announcement_channel_id = 1474888237565743385
 final_channel_id = announcement_channel_id
+# Seconds between two jurors of the final reveal
+final_reveal_delay = 30
+# The whole final reveal is also posted as a single file after the winner ("webp", "gif", "zip" or None)
+final_reveal_export_format: Optional[str] = "webp"
+# During the last minutes of a voting period, its result boards are kept rendered in board_cache
+prerender_window_minutes = 15
+# Optional live standings: a pinned board per qualif thread and semi final, edited while the votes come in.
+# Boards are only re-rendered and edited when their tallies changed, at most once per interval
+live_standings_enabled = False
+live_standings_interval_minutes = 5.0
+live_standings_edit_spacing = 2.0  # seconds between two board edits, to stay well below Discord's rate limits
+# Optional numbered mosaic of all the photos of a qualif thread, posted before the individual vote messages
+qualif_contact_sheets = False
+# Metrics (handler latencies, API calls, saves, renders): Prometheus text file, and local endpoint on this port (None: off)
+metrics_textfile = "photo_contest/metrics.prom"
+metrics_port: Optional[int] = 9101
+# Live profiles taken with contest_profile (collapsed stacks and top functions)
+profiles_folder = "photo_contest/profiles"
 
 # Ensure required directories exist
 os.makedirs("photo_contest/pictures", exist_ok=True)
-os.makedirs("photo_contest/generated_tables", exist_ok=True)
 os.makedirs("photo_contest/assets", exist_ok=True)
 
 # Global state for contest period
 current_period = None  # Will be set to ContestPeriod enum value
+picture_restore: Optional[asyncio.Task] = None  # background download of the missing pictures, started on_ready
 
 if os.path.exists("photo_contest/contest2026.yaml"):
     contest = Contest.from_file("photo_contest/contest2026.yaml")
@@ -125,12 +152,18 @@ else:
     )
     contest.save("photo_contest/contest2026.yaml")
 
+# Steps of the period transitions already done, so that an interrupted transition resumes where it stopped
+journal = TransitionJournal("photo_contest/contest2026.journal.jsonl")
+
 
 # Functions for handling the contest ##########################################
 
 async def build_id2name_mapping(bot: discord.Client, contest: Contest, include_voters: bool = False) -> Dict[int, str]:
     """Build a mapping from user IDs to display names for all participants.
     
+    Names come from the shared member name cache, which only asks Discord for the ones it
+    does not know yet (in batches).
+    
     Args:
         bot: Discord client
         contest: Contest object with submissions
@@ -143,40 +176,48 @@ async def build_id2name_mapping(bot: discord.Client, contest: Contest, include_v
     if not guild:
         return {}
     
-    id2name: Dict[int, str] = {}
+    author_ids = {submission.author_id for submission in contest.submissions}
+    voter_ids = {voter_id for comp in contest.competitions for voter_id in comp.votes_jury.keys()} if include_voters else set()
+    names = await member_names.resolve(guild, [*author_ids, *voter_ids])
     
-    # Add submission authors
-    for submission in contest.submissions:
-        if submission.author_id not in id2name:
-            try:
-                member = await guild.fetch_member(submission.author_id)
-                if member:
-                    id2name[submission.author_id] = member.name
-                else:
-                    id2name[submission.author_id] = f"User <@{submission.author_id}>"
-            except:
-                id2name[submission.author_id] = f"User <@{submission.author_id}>"
-    
-    # Add voter names if requested
-    if include_voters:
-        for comp in contest.competitions:
-            for voter_id in comp.votes_jury.keys():
-                if voter_id not in id2name:
-                    try:
-                        member = await guild.fetch_member(voter_id)
-                        id2name[voter_id] = member.name
-                    except:
-                        id2name[voter_id] = f"Juror <@{voter_id}>"
+    id2name: Dict[int, str] = {}
+    for user_id in voter_ids:
+        id2name[user_id] = names.get(user_id) or f"Juror <@{user_id}>"
+    for user_id in author_ids:
+        id2name[user_id] = names.get(user_id) or f"User <@{user_id}>"
     
     return id2name
 
 
-async def upload_to_save_channel(guild: discord.Guild, file_path: str, description: str) -> str:
+def board_file(board: RenderedBoard, filename: Optional[str] = None) -> discord.File:
+    """Wrap an in-memory board into a Discord attachment (named after the board by default)."""
+    return discord.File(board.open(), filename=filename or board.name)
+
+
+async def edit_message(channel: discord.abc.Messageable, message_id: int, scheduler: Optional[PostingScheduler] = None, **fields: Any):
+    """Edit a message from its channel and id only, without fetching it first.
+    
+    Args:
+        channel: The channel of the message (a partial messageable is enough)
+        message_id: The message to edit
+        scheduler: If given, the edit is paced and retried by it
+        **fields: What to edit, as for Message.edit (content, embed...)
+    """
+    message = channel.get_partial_message(message_id)  # pyright: ignore[reportAttributeAccessIssue]
+    if scheduler is not None:
+        await scheduler.call(("edit", channel.id), message.edit, **fields)  # pyright: ignore[reportAttributeAccessIssue]
+    else:
+        await message.edit(**fields)
+
+
+async def upload_to_save_channel(guild: discord.Guild, file: str | RenderedBoard, description: str) -> str:
     """Upload a file to the save channel and return its permanent URL.
     
+    Files uploaded at the same time are grouped in messages of up to 10 attachments.
+    
     Args:
         guild: Discord guild
-        file_path: Path to the file to upload
+        file: Path to the file to upload, or an in-memory board
         description: Description for the upload message
         
     Returns:
@@ -189,16 +230,12 @@ async def upload_to_save_channel(guild: discord.Guild, file_path: str, descripti
     if not save_channel or not isinstance(save_channel, discord.TextChannel):
         raise RuntimeError("Save channel not found")
     
-    with open(file_path, "rb") as f:
-        uploaded_message = await save_channel.send(
-            content=description,
-            file=discord.File(f, filename=os.path.basename(file_path))
-        )
-    
-    if not uploaded_message.attachments:
-        raise RuntimeError("Upload failed - no attachments in message")
+    if isinstance(file, RenderedBoard):
+        cdn_url = await save_uploads.upload(save_channel, board_file(file), description)
+    else:
+        with open(file, "rb") as f:
+            cdn_url = await save_uploads.upload(save_channel, discord.File(f, filename=os.path.basename(file)), description)
     
-    cdn_url = uploaded_message.attachments[0].url
     logger.info(f"Uploaded file to save channel, CDN URL: {cdn_url}")
     
     return cdn_url
@@ -239,6 +276,16 @@ async def notify_organizer_dm_failed(user: discord.Member | discord.User, messag
         pass
 
 
+async def notify_organizer(bot: discord.Client, message: str, files: Optional[List[discord.File]] = None):
+    """Send a message to the organizer (e.g. statistics), ignoring failures."""
+    try:
+        organizer = await bot.fetch_user(organizer_id)
+        if organizer:
+            await organizer.send(message, files=files or [])
+    except:
+        pass
+
+
 async def notify_organizer_error(bot: discord.Client, error_message: str):
     """Notify the organizer about an error.
     
@@ -254,13 +301,35 @@ async def notify_organizer_error(bot: discord.Client, error_message: str):
         pass
 
 
+# Time the contest mutations (vote saves, period transitions...)
+set_mutation_hook(lambda name, seconds: metrics.observe("contest_mutation_seconds", seconds, operation=name))
+
+
+def write_contest(snapshot: Contest):
+    """Write a contest snapshot to the contest file (blocking: run by contest_writer in the I/O pool)."""
+    with metrics.timer("save_seconds", what="contest"):
+        snapshot.save("photo_contest/contest2026.yaml")
+
+
+# Contest saves run in the I/O pool, one at a time and in order
+contest_writer: SnapshotWriter[Contest] = SnapshotWriter(write_contest, "the contest")
+
+
+async def save_contest(snapshot: Contest):
+    """Save the contest off the event loop; returns once it (or a newer version) is on disk."""
+    await contest_writer.save(snapshot)
+
+
 def reload_contest() -> Contest:
-    """Reload contest from disk to get latest state, avoiding race conditions.
+    """Get the latest state of the contest, avoiding race conditions.
     
     When multiple votes are submitted concurrently, each handler should call this
-    before saving to ensure they work with the most recent saved version.
+    before saving to ensure they work with the most recent version. The bot is the only
+    writer of the contest file and every change is made to the global contest before it
+    is saved, so the global contest is never older than the file: it is returned instead
+    of parsing the file again on the event loop.
     """
-    return Contest.from_file("photo_contest/contest2026.yaml")
+    return contest
 
 
 async def send_dm_safe(user: discord.User | discord.Member, content: str = "", embed: Optional[discord.Embed] = None, view: Optional[discord.ui.View] = None, file: Optional[discord.File] = None) -> bool:
@@ -310,62 +379,102 @@ async def _send_error(message: discord.Message, error_text: str) -> None:
     await message.channel.send(error_text, delete_after=30, reference=_create_reference(message))
 
 
-async def download_missing_pictures():
-    """Download pictures from Discord CDN for submissions that don't have local copies.
+def stage_submissions_first(submissions: list[Submission]) -> list[Submission]:
+    """Order submissions so that the ones competing in the current stage come first."""
+    stage_competitions = {
+        ContestPeriod.QUALIF: contest.qualif_competitions,
+        ContestPeriod.SEMIS: contest.semis_competitions,
+        ContestPeriod.FINAL: [contest.final_competition] if contest.final_competition else [],
+    }.get(current_period, [])
+    in_stage = {sub.discord_save_path for comp in stage_competitions for sub in comp.competing_entries}
+    return sorted(submissions, key=lambda sub: sub.discord_save_path not in in_stage)  # stable: keeps the order otherwise
+
+
+async def local_copy_hash(submission: Submission) -> Optional[str]:
+    """SHA-256 of the local copy of a picture, None if it is missing or corrupt.
+    
+    The copy is checked against the hash recorded when it was downloaded. Copies without a
+    recorded hash (saved before hashes were recorded) are accepted if they look like a picture.
+    """
+    path = submission.local_save_path
+    if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    
+    sha256 = await executors.run_io(file_sha256, path)
+    expected = contest.picture_hashes.get(submission.discord_save_path)
+    if expected is not None:
+        return sha256 if sha256 == expected else None
+    
+    with open(path, "rb") as f:
+        return sha256 if image_format(f.read(12)) is not None else None
+
+
+async def download_missing_pictures(max_concurrent: int = 8):
+    """Download pictures from Discord CDN for submissions that don't have valid local copies.
     
     This function is called on startup to ensure all submissions have local copies
     of their images, which may be missing due to:
     - Bot restart on a different machine
-    - Local files being lost/deleted
+    - Local files being lost/deleted or partially written
     - Contest data restored from backup
+    
+    Pictures of the current stage are fetched first, several at a time, through the picture
+    store. Each download goes to a temporary file renamed once complete, and the hash of
+    every picture is recorded, so that an interrupted run resumes where it stopped and
+    corrupt files are fetched again.
     """
     global contest
     
     print("Checking for missing local pictures...")
-    downloaded_count = 0
-    error_count = 0
-    
-    for submission in contest.submissions:
-        # Check if local file is missing or path is empty
-        should_download = (
-            not submission.local_save_path or 
-            not os.path.exists(submission.local_save_path)
-        )
-        
-        if should_download and submission.discord_save_path:
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(max_concurrent)
+    hashes: Dict[str, str] = {}  # discord_save_path -> sha256, of the pictures downloaded or hashed for the first time
+    nb_downloaded = 0
+    errors = []
+    
+    # Several submissions can share a picture (e.g. qualifiers): fetch each file once
+    submissions = {sub.local_save_path or sub.discord_save_path: sub for sub in contest.submissions}
+    
+    async def fetch(submission: Submission):
+        nonlocal nb_downloaded
+        async with semaphore:
+            sha256 = await local_copy_hash(submission)
+            if sha256 is not None:
+                if submission.discord_save_path not in contest.picture_hashes:
+                    hashes[submission.discord_save_path] = sha256
+                return
+            if submission.local_save_path and not os.path.exists(submission.local_save_path) and os.path.exists(thumbnail_path(submission.local_save_path)):
+                return  # evicted by the picture store, fetched again when a board needs it
+            if not submission.local_save_path or not submission.discord_save_path:
+                errors.append(submission)
+                print(f"✗ No local path or URL to restore the picture of {submission.author_id} from")
+                return
             try:
-                # Use existing local_save_path if available, otherwise generate one
-                local_filename = submission.local_save_path
-                
-                # Download from Discord CDN
-                print(f"Downloading missing picture: {local_filename}")
-                response = requests.get(submission.discord_save_path, timeout=10)
-                
-                if response.status_code == 200:
-                    # Save locally
-                    with open(local_filename, "wb") as f:
-                        f.write(response.content)
-                    
-                    # Update submission's local_save_path
-                    downloaded_count += 1
-                    print(f"✓ Successfully downloaded: {local_filename}")
-                else:
-                    print(f"✗ Failed to download (HTTP {response.status_code}): {submission.discord_save_path}")
-                    error_count += 1
-                    
-            except Exception as e:
+                print(f"Downloading missing picture: {submission.local_save_path}")
+                path = await picture_store.ensure(submission, refetch=True)
+                hashes[submission.discord_save_path] = await executors.run_io(file_sha256, path)
+                nb_downloaded += 1
+                print(f"✓ Successfully downloaded: {submission.local_save_path}")
+            except DownloadError as e:
+                errors.append(submission)
                 print(f"✗ Error downloading picture from {submission.discord_save_path}: {e}")
-                error_count += 1
     
-    if downloaded_count > 0:
-        # Save contest with updated local paths
-        contest.save("photo_contest/contest2026.yaml")
-        print(f"Downloaded {downloaded_count} missing picture(s)")
+    await asyncio.gather(*(fetch(sub) for sub in stage_submissions_first(list(submissions.values()))))
+    
+    await executors.run_io(picture_store.evict)
+    
+    if hashes:
+        # Save contest with the hashes of the new local copies
+        contest = contest.set_picture_hashes(hashes)
+        await save_contest(contest)
     
-    if error_count > 0:
-        print(f"Failed to download {error_count} picture(s)")
+    if nb_downloaded:
+        print(f"Downloaded {nb_downloaded} missing picture(s) in {time.perf_counter() - start:.1f}s")
     
-    if downloaded_count == 0 and error_count == 0:
+    if errors:
+        print(f"Failed to download {len(errors)} picture(s)")
+    
+    if not nb_downloaded and not errors:
         print("All pictures already present locally")
 
 
@@ -602,8 +711,11 @@ async def submit(message: discord.Message, bot: discord.Client) -> Contest:
         pass  # Message already deleted or no permission to delete
     
     # Download the image locally
-    response = requests.get(submission_url)
-    if response.status_code != 200:
+    local_filename = f"photo_contest/pictures/{message.id}{file_extension}"
+    try:
+        await downloader.download(submission_url, local_filename)
+    except DownloadError as e:
+        logger.warning(f"Submission {message.id}: {e}")
         ref = discord.MessageReference(
             message_id=message.id, channel_id=message.channel.id
         )
@@ -613,10 +725,6 @@ async def submit(message: discord.Message, bot: discord.Client) -> Contest:
             reference=ref,
         )
         return contest
-
-    local_filename = f"photo_contest/pictures/{message.id}{file_extension}"
-    with open(local_filename, "wb") as f:
-        f.write(response.content)
     
     # Upload the image to the designated submissions channel
     assert message.guild is not None, "Message guild is None"
@@ -646,7 +754,7 @@ async def submit(message: discord.Message, bot: discord.Client) -> Contest:
     contest = contest.add_submission(submission, channel_id, 0, thread_id)
     
     # Save immediately to persist the submission
-    contest.save("photo_contest/contest2026.yaml")
+    await save_contest(contest)
     
     # Get the submission index that was just assigned
     res = contest.competition_from_channel_thread(channel_id, thread_id)
@@ -679,7 +787,7 @@ async def submit(message: discord.Message, bot: discord.Client) -> Contest:
     
     # Update the contest with the real message_id
     contest = contest.set_message_id(channel_id, thread_id, submission_index, message_resend.id)
-    contest.save("photo_contest/contest2026.yaml")
+    await save_contest(contest)
     
     # Delete the original message to maintain anonymity
     await _safe_delete(message)
@@ -687,23 +795,24 @@ async def submit(message: discord.Message, bot: discord.Client) -> Contest:
     return contest
 
 
-async def _perform_withdrawal(contest: Contest, message: Optional[discord.Message], channel_id: int, thread_id: Optional[int], bot: Optional[discord.Client] = None) -> Contest:
-    """Core withdrawal logic - withdraws submission, renumbers messages, and saves contest.
+async def _perform_withdrawal(message: Optional[discord.Message], channel_id: int, thread_id: Optional[int], bot: Optional[discord.Client] = None):
+    """Core withdrawal logic - withdraws submission, saves contest, and renumbers messages.
+    
+    The withdrawal is applied to the global contest and saved before any other await, so
+    that it neither loses nor overwrites the votes saved meanwhile.
     
     Args:
-        contest: The contest object
         message: The Discord message of the submission (can be None if message already deleted)
         channel_id: The channel ID
         thread_id: The thread ID (None for main channels)
         bot: The discord bot client (required if message is None)
-    
-    Returns:
-        Updated contest object
     """
+    global contest
+    
     # Get submission index for message renumbering
     res = contest.competition_from_channel_thread(channel_id, thread_id)
     if not res:
-        return contest
+        return
     _, competition = res
     
     # Find the message_id to withdraw
@@ -712,64 +821,47 @@ async def _perform_withdrawal(contest: Contest, message: Optional[discord.Messag
     else:
         # Find the message_id from the competition that was at this position
         # We need to find which submission was at the current index before withdrawal
-        message_id = None
-        for msg_id, idx in competition.msg_to_sub.items():
-            if idx == 0:  # Get the first submission to determine which one to withdraw
-                message_id = msg_id
-                break
+        message_id = competition.message_id_of(0)  # Get the first submission to determine which one to withdraw
         if message_id is None:
-            return contest
+            return
     
     submission_index = competition.msg_to_sub[message_id]
     
-    # Withdraw the submission
+    # Withdraw the submission and save the updated contest
     contest = contest.withdraw_submission(channel_id, message_id, thread_id)
+    res = contest.competition_from_channel_thread(channel_id, thread_id)
+    await save_contest(contest)
     
     # Update the message numbers for all subsequent submissions
-    # Get the updated competition
-    res = contest.competition_from_channel_thread(channel_id, thread_id)
     if res:
         _, updated_competition = res
         
-        # Get the channel for editing messages
+        # Get the channel for editing messages (no need to fetch it: the edits only need its id)
         channel = None
         if message is not None:
             channel = message.channel
         elif bot is not None:
-            # Need to fetch the channel from the guild
-            for guild in bot.guilds:
-                channel = guild.get_channel(channel_id)
-                if channel:
-                    break
+            channel = bot.get_partial_messageable(thread_id or channel_id, type=discord.ChannelType.text)
         
         if channel:
             # For each submission with a higher index, update their message
             for msg_id, idx in updated_competition.msg_to_sub.items():
                 if idx >= submission_index:  # All submissions that were after the withdrawn one
                     try:
-                        assert isinstance(channel, (discord.TextChannel, discord.Thread)), "Channel is not a TextChannel or Thread"
-                        msg = await channel.fetch_message(msg_id)
-                        await msg.edit(content=f"Submission #{idx + 1}")
+                        await edit_message(channel, msg_id, content=f"Submission #{idx + 1}")
                     except discord.NotFound:
                         # Message was deleted, skip
                         pass
                     except discord.Forbidden:
                         # No permission to edit, skip
                         pass
-    
-    # Save the updated contest
-    contest.save("photo_contest/contest2026.yaml")
-    
-    return contest
 
 
-async def withdraw(contest: Contest, message: discord.Message, user: discord.Member | discord.User) -> Contest:
+async def withdraw(message: discord.Message, user: discord.Member | discord.User):
     """Handles withdrawal of a submission.
     
     Withdraws a submission when the message_resend gets a ❌ reaction from either
-    the author or a user with discord_team_role.
-    
-    Returns the updated contest object.
+    the author or a user with discord_team_role. The global contest is updated and saved.
     """
     
     # Check the channel and thread
@@ -777,23 +869,16 @@ async def withdraw(contest: Contest, message: discord.Message, user: discord.Mem
     
     # Check if this channel/thread is valid for submissions
     if (channel_id, thread_id) not in contest.channel_threads_open_for_submissions:
-        return contest
+        return
     
     # Check if this message is a submission (prefer submission period competitions)
     if not contest.is_submission_message(channel_id, thread_id, message.id, prefer_type="submission"):
-        return contest
+        return
     
     # Get the submission
     submission = contest.get_submission_from_message(channel_id, thread_id, message.id)
     if not submission:
-        return contest
-    
-    # Get submission index for later message renumbering
-    res = contest.competition_from_channel_thread(channel_id, thread_id)
-    if not res:
-        return contest
-    _, competition = res
-    submission_index = competition.msg_to_sub[message.id]
+        return
     
     # Check if user is authorized to withdraw (author or discord team member)
     is_author = user.id == submission.author_id
@@ -807,15 +892,13 @@ async def withdraw(contest: Contest, message: discord.Message, user: discord.Mem
             await message.remove_reaction("❌", user)
         except (discord.NotFound, discord.Forbidden):
             pass
-        return contest
+        return
     
     # Perform the withdrawal
-    contest = await _perform_withdrawal(contest, message, channel_id, thread_id)
+    await _perform_withdrawal(message, channel_id, thread_id)
     
     # Delete the original submission message
     await _safe_delete(message)
-    
-    return contest
 
 
 class JuryConfirmView(discord.ui.View):
@@ -846,7 +929,7 @@ class JuryConfirmView(discord.ui.View):
             contest = reload_contest()
             save_vid = self.voter_id_for_save
             contest = contest.save_jury_vote(self.channel_id, self.thread_id, save_vid, self.ranking, period=self.period)
-            contest.save("photo_contest/contest2026.yaml")
+            await save_contest(contest)
             logger.info(f"Jury vote saved: user={save_vid}, channel={self.channel_id}, thread={self.thread_id}")
             await interaction.user.send(f"{self.ranking_text}\n\n✅ Your vote has been saved successfully!")
         except ValueError as e:
@@ -1225,92 +1308,85 @@ async def handle_jury_vote_request(contest: Contest, message: discord.Message, u
         await notify_organizer_dm_failed(user, message, "jury voting")
 
 
-async def handle_public_vote(contest: Contest, message: discord.Message, user: discord.Member | discord.User, emoji: str, current_period: ContestPeriod) -> Contest:
-    """Handle a public vote (0-3 points) during qualif or semis periods.
+# Public votes: reaction -> points
+PUBLIC_VOTE_POINTS: dict[str, Literal[0] | Literal[1] | Literal[2] | Literal[3]] = {
+    "0️⃣": 0,
+    "1️⃣": 1,
+    "2️⃣": 2,
+    "3️⃣": 3,
+}
+
+
+async def commit_public_votes(reactions: List[ReactionVote]):
+    """Save a batch of public votes (0-3 points) with a single write of the contest.
     
-    Args:
-        contest: The current contest
-        message: The submission message that was reacted to
-        user: The user who reacted
-        emoji: The emoji name (should be 0️⃣, 1️⃣, 2️⃣, or 3️⃣)
-        current_period: The current contest period
+    Called by vote_pipeline only, so batches never overlap: the contest does not need to be
+    reloaded from disk. Only members of the server can vote: the voters of the batch are
+    checked at once, in the member cache then with member_names (which asks Discord in
+    batches for the ones that are not cached). Confirmations are queued in the DM outbox
+    and the reactions are removed in the background to keep the votes invisible. If the save
+    fails, vote_pipeline commits the batch again: a vote saved twice replaces itself.
     
-    Returns:
-        Updated contest object
+    Args:
+        reactions: The vote reactions, in the order they were added
     """
-    # Enforce deadline: only allow votes during qualif or semis periods
-    if current_period not in [ContestPeriod.QUALIF, ContestPeriod.SEMIS]:
-        try:
-            await message.remove_reaction(emoji, user)
-        except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-            pass
-        return contest
-    
-    # Map emoji to points
-    emoji_to_points: dict[str, Literal[0] | Literal[1] | Literal[2] | Literal[3]] = {
-        "0️⃣": 0,
-        "1️⃣": 1,
-        "2️⃣": 2,
-        "3️⃣": 3,
-    }
-    
-    if emoji not in emoji_to_points:
-        return contest
-    
-    points = emoji_to_points[emoji]
-    
-    # Get channel and thread
-    channel_id, thread_id = get_channel_and_thread(message)
-    
-    # Find the competition, preferring the current period type
-    period_type = current_period.value if current_period != ContestPeriod.IDLE else None
-    res = contest.competition_from_channel_thread(channel_id, thread_id, prefer_type=period_type)
-    
-    if not res:
-        return contest
-    
-    _, competition = res
-    
-    # Check if this message is a submission
-    if message.id not in competition.msg_to_sub:
-        return contest
+    global contest
     
-    # Get the submission
-    submission_idx = competition.msg_to_sub[message.id]
-    submission = competition.competing_entries[submission_idx]
+    # Enforce deadline: votes queued right before the end of the period are refused
+    if current_period not in [ContestPeriod.QUALIF, ContestPeriod.SEMIS]:
+        for reaction in reactions:
+            reaction_cleaner.remove(reaction)
+        return
     
-    try:
-        # Reload contest to avoid race condition with concurrent votes
-        contest = reload_contest()
-        # Save the vote
-        contest = contest.save_public_vote(channel_id, thread_id, user.id, points, submission, period=current_period.value)
-        contest.save("photo_contest/contest2026.yaml")
-        logger.info(f"Public vote saved: user={user.id}, points={points}, channel={channel_id}, thread={thread_id}")
-        
-        # Send confirmation DM to the user
-        plural = "points" if points != 1 else "point"
-        embed = discord.Embed(
-            title="✅ Vote Saved!",
-            description=f"You gave **{points} {plural}** to this photo.",
-            color=0x57F287  # Green
-        )
-        embed.set_image(url=submission.discord_save_path)
-        await send_dm_safe(user, embed=embed)
+    members: set[tuple[int, int]] = set()  # (guild id, user id)
+    guilds = {reaction.guild.id: reaction.guild for reaction in reactions}
+    for guild in guilds.values():
+        names = await member_names.resolve(guild, [reaction.user_id for reaction in reactions if reaction.guild.id == guild.id])
+        members.update((guild.id, user_id) for user_id, name in names.items() if name is not None)
+    
+    votes: list[tuple[int, PublicVote]] = []
+    voted: list[tuple[ReactionVote, PublicVote]] = []
+    for reaction in reactions:
+        if (reaction.guild.id, reaction.user_id) not in members:
+            reaction_cleaner.remove(reaction)
+            continue
+        res = contest.competition_from_location(reaction.location_id, prefer_type=current_period.value)
+        if not res:
+            continue
+        i, competition = res
         
-        # Remove all number reactions from this user on this message to keep votes invisible
-        for emoji_str in ["0️⃣", "1️⃣", "2️⃣", "3️⃣"]:
-            try:
-                await message.remove_reaction(emoji_str, user)
-            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                pass
-    except ValueError as e:
-        # User tried to vote for themselves, remove their reaction
-        try:
-            await message.remove_reaction(emoji, user)
-        except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-            pass
+        # Check if this message is a submission
+        if reaction.message_id not in competition.msg_to_sub:
+            continue
+        submission = competition.competing_entries[competition.msg_to_sub[reaction.message_id]]
+        vote = PublicVote(voter_id=reaction.user_id, nb_points=PUBLIC_VOTE_POINTS[reaction.emoji], submission=submission)
+        votes.append((i, vote))
+        voted.append((reaction, vote))
     
-    return contest
+    if not votes:
+        return
+    
+    contest, rejected = contest.save_public_votes(votes)
+    await save_contest(contest)
+    oldest = time.monotonic() - min(reaction.received_at for reaction, _ in voted)
+    logger.info(f"Public votes saved: {len(votes) - len(rejected)} in one write, {len(rejected)} refused, oldest waited {oldest:.2f}s")
+    
+    for reaction, vote in voted:
+        # Votes for one's own photo are refused: only their reaction is removed
+        if not any(vote is refused for refused in rejected):
+            plural = "points" if vote.nb_points != 1 else "point"
+            embed = discord.Embed(
+                title="✅ Vote Saved!",
+                description=f"You gave **{vote.nb_points} {plural}** to this photo.",
+                color=0x57F287  # Green
+            )
+            embed.set_image(url=vote.submission.discord_save_path)
+            dm_outbox.enqueue(reaction.user_id, embed=embed, coalesce="vote_confirmation")
+        reaction_cleaner.remove(reaction)
+
+
+# Acknowledges vote reactions at once, saves them in batches
+vote_pipeline: BatchCommitter[ReactionVote] = BatchCommitter(commit_public_votes)
 
 
 async def handle_commentary_request(contest: Contest, message: discord.Message, user: discord.Member | discord.User, current_period: ContestPeriod):
@@ -1407,7 +1483,7 @@ async def handle_commentary_request(contest: Contest, message: discord.Message,
                     author_id=interaction.user.id,
                     text=commentary_text
                 )
-                contest.save("photo_contest/contest2026.yaml")
+                await save_contest(contest)
                 logger.info(f"Commentary added: user={interaction.user.id}, channel={channel_id}, thread={thread_id}")
                 
                 # Update the summary for this specific submission
@@ -1513,8 +1589,6 @@ async def update_commentary_summary(contest: Contest, submission: Submission, gu
         
         # Update the summary message
         try:
-            summary_msg = await channel.fetch_message(message_id)
-            
             if summary_text:
                 content = (
                     f"📝 **Commentary Summary**\n"
@@ -1528,7 +1602,7 @@ async def update_commentary_summary(contest: Contest, submission: Submission, gu
                     f"💬 React above to add your commentary"
                 )
             
-            await summary_msg.edit(content=content)
+            await edit_message(channel, message_id, content=content)
         except (discord.NotFound, discord.Forbidden):
             pass
 
@@ -1578,168 +1652,345 @@ async def announce_semis_results(bot: discord.Client):
     await announce_stage_results(bot, contest, "final", "Finalists", "Grand Final")
 
 
-async def announce_individual_vote_boards(bot: discord.Client):
-    """Add individual vote details boards to submission embeds after the final.
+# Result board jobs: shared by the announce handlers and the pre-render task, so that
+# boards rendered before a period closes are found again in board_cache
+
+async def vote_details_jobs(bot: discord.Client, contest: Contest, id2name: Dict[int, str], stages: tuple[str, ...] = ("qualif", "semis", "final")) -> list[RenderJob]:
+    """One render job per submission of the given stages, for its individual vote details board.
     
-    For each qualif and semis submission, generates an individual vote board showing
-    how each jury member voted for that specific photo, uploads it to the save channel,
-    and updates the submission embed to include the board as a thumbnail.
+    The tag keeps the Discord context needed once the board is ready:
+    (target_channel, competition, submission index, submission, upload description)
     """
-    global contest
+    jobs: list[RenderJob] = []
     
-    print("Generating individual vote boards...")
+    # Qualif competitions - posted in threads
+    if "qualif" in stages:
+        qualif_jury_voter_authors = contest.get_jury_voter_authors("qualif")
+        for comp in contest.qualif_competitions:
+            category_channel = bot.get_channel(comp.channel_id)
+            category_name = getattr(category_channel, "name", f"Category {comp.channel_id}")
+            
+            # Determine target channel (thread or category channel)
+            if comp.thread_id:
+                target_channel = await bot.fetch_channel(comp.thread_id)
+                thread_name = target_channel.name if isinstance(target_channel, discord.Thread) else None
+            else:
+                target_channel = category_channel
+                thread_name = None
+            
+            assert isinstance(target_channel, (discord.TextChannel, discord.Thread)), "Target channel must be a text channel or thread"
+            
+            for i, submission in enumerate(comp.competing_entries):
+                description = f"Vote details - {category_name}" + (f" - {thread_name}" if thread_name else "") + f" - Photo #{i+1}"
+                jobs.append(RenderJob(
+                    "gen_photo_vote_details",
+                    (submission, comp, category_name, id2name, thread_name),
+                    {"jury_voter_authors": qualif_jury_voter_authors},
+                    tag=(target_channel, comp, i, submission, description),
+                ))
+    
+    # Semis competitions - posted in category channels
+    if "semis" in stages:
+        semis_jury_voter_authors = contest.get_jury_voter_authors("semis")
+        for comp in contest.semis_competitions:
+            category_channel = await bot.fetch_channel(comp.channel_id)
+            assert isinstance(category_channel, (discord.TextChannel, discord.Thread)), "Category channel must be a text channel or thread"
+            category_name = category_channel.name
+            
+            for i, submission in enumerate(comp.competing_entries):
+                jobs.append(RenderJob(
+                    "gen_photo_vote_details",
+                    (submission, comp, category_name, id2name, None),
+                    {"jury_voter_authors": semis_jury_voter_authors},
+                    tag=(category_channel, comp, i, submission, f"Vote details - {category_name} - Photo #{i+1}"),
+                ))
+    
+    # Final competition
+    final_comp = contest.final_competition
+    if "final" in stages and final_comp:
+        final_channel = bot.get_channel(final_channel_id)
+        if final_channel and isinstance(final_channel, discord.TextChannel):
+            for i, submission in enumerate(final_comp.competing_entries):
+                jobs.append(final_details_job(
+                    submission, final_comp, id2name, contest,
+                    tag=(final_channel, final_comp, i, submission, f"Vote details - Grand Final - Photo #{i+1}"),
+                ))
     
-    # Build id2name mapping
-    id2name = await build_id2name_mapping(bot, contest)
+    return jobs
+
+
+def final_details_job(submission: Submission, final_comp: CompetitionInfo, id2name: Dict[int, str], contest: Contest, tag: Any = None) -> RenderJob:
+    return RenderJob("gen_final_photo_vote_details", (submission, final_comp, id2name), {"contest": contest}, tag=tag)
+
+
+async def qualif_board_jobs(bot: discord.Client, contest: Contest, id2name: Dict[int, str]) -> list[RenderJob]:
+    """One render job per qualif competition board, tagged with (target_channel, category_name, thread_name)."""
+    jobs: list[RenderJob] = []
     
     # Get jury voter authors for bonus display
     qualif_jury_voter_authors = contest.get_jury_voter_authors("qualif")
-    semis_jury_voter_authors = contest.get_jury_voter_authors("semis")
     
-    # Process qualif competitions - post in threads
     for comp in contest.qualif_competitions:
         category_channel = bot.get_channel(comp.channel_id)
         category_name = getattr(category_channel, "name", f"Category {comp.channel_id}")
         
-        # Determine target channel (thread or category channel)
+        # Get thread name and channel
         if comp.thread_id:
-            target_channel = await bot.fetch_channel(comp.thread_id)
-            thread_name = target_channel.name if isinstance(target_channel, discord.Thread) else None
+            thread = await bot.fetch_channel(comp.thread_id)
+            assert isinstance(thread, discord.Thread), "Thread ID does not correspond to a thread channel"
+            thread_name = thread.name
+            target_channel = thread  # Post in thread
         else:
-            target_channel = category_channel
             thread_name = None
+            target_channel = category_channel  # Post in category channel
         
         assert isinstance(target_channel, (discord.TextChannel, discord.Thread)), "Target channel must be a text channel or thread"
         
-        # Generate individual vote board for each submission
-        for i, submission in enumerate(comp.competing_entries):
-            # Generate the individual vote board
-            board_path = gen_photo_vote_details(submission, comp, category_name, id2name, thread_name, jury_voter_authors=qualif_jury_voter_authors)
-            
-            # Upload to save channel for permanent URL
-            try:
-                board_url = await upload_to_save_channel(
-                    target_channel.guild,
-                    board_path,
-                    f"Vote details - {category_name}" + (f" - {thread_name}" if thread_name else "") + f" - Photo #{i+1}"
-                )
-            except RuntimeError as e:
-                print(f"Could not upload individual vote board: {e}")
-                continue
-            
-            # Update the submission message to add the individual vote board
-            message_id = None
-            for msg_id, sub_idx in comp.msg_to_sub.items():
-                if sub_idx == i:
-                    message_id = msg_id
-                    break
-            
-            if message_id and target_channel and isinstance(target_channel, (discord.TextChannel, discord.Thread)):
-                try:
-                    message = await target_channel.fetch_message(message_id)
-                    # Update embed to include individual vote board as thumbnail
-                    embed = discord.Embed()
-                    embed.set_image(url=submission.discord_save_path)
-                    embed.set_thumbnail(url=board_url)
-                    await message.edit(
-                        content=f"Submission #{i+1}",
-                        embed=embed
-                    )
-                except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
-                    print(f"Could not update message {message_id}: {e}")
+        jobs.append(RenderJob(
+            "gen_competition_board",
+            (comp, category_name, id2name, thread_name, qualif_jury_voter_authors),
+            tag=(target_channel, category_name, thread_name),
+        ))
     
-    # Process semis competitions - post in category channels
+    return jobs
+
+
+def semis_boards_job(bot: discord.Client, contest: Contest, id2name: Dict[int, str]) -> RenderJob:
+    # Build channel_names dict for semifinals
+    channel_names: Dict[int, str] = {}
     for comp in contest.semis_competitions:
-        category_channel = await bot.fetch_channel(comp.channel_id)
-        assert isinstance(category_channel, (discord.TextChannel, discord.Thread)), "Category channel must be a text channel or thread"
-        category_name = category_channel.name
-        
-        # Generate individual vote board for each submission
-        for i, submission in enumerate(comp.competing_entries):
-            # Generate the individual vote board
-            board_path = gen_photo_vote_details(submission, comp, category_name, id2name, None, jury_voter_authors=semis_jury_voter_authors)
-            
-            # Upload to save channel for permanent URL
-            try:
-                board_url = await upload_to_save_channel(
-                    category_channel.guild,
-                    board_path,
-                    f"Vote details - {category_name} - Photo #{i+1}"
-                )
-            except RuntimeError as e:
-                print(f"Could not upload individual vote board: {e}")
-                continue
-            
-            # Update the submission message to add the individual vote board
-            message_id = None
-            for msg_id, sub_idx in comp.msg_to_sub.items():
-                if sub_idx == i:
-                    message_id = msg_id
-                    break
-            
-            if message_id and category_channel and isinstance(category_channel, (discord.TextChannel, discord.Thread)):
-                try:
-                    message = await category_channel.fetch_message(message_id)
-                    # Update embed to include individual vote board as thumbnail
-                    embed = discord.Embed()
-                    embed.set_image(url=submission.discord_save_path)
-                    embed.set_thumbnail(url=board_url)
-                    await message.edit(
-                        content=f"Submission #{i+1}",
-                        embed=embed
-                    )
-                except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
-                    print(f"Could not update message {message_id}: {e}")
+        category_channel = bot.get_channel(comp.channel_id)
+        channel_names[comp.channel_id] = getattr(category_channel, "name", f"Category {comp.channel_id}")
+    
+    return RenderJob("gen_semifinals_boards", (contest, channel_names, id2name))
+
+
+def final_reveal_job(final_comp: CompetitionInfo, id2name: Dict[int, str]) -> RenderJob:
+    """Render job for every board of the live final reveal (see gen_final_reveal_boards)."""
+    # Random order for suspense, but derived from the votes so that the boards
+    # pre-rendered before the final closes are in the same order as the reveal
+    voter_order = sorted(final_comp.votes_jury.keys())
+    random.Random(final_comp.tally_fingerprint()).shuffle(voter_order)
+    
+    return RenderJob(
+        "gen_final_reveal_boards",
+        (final_comp, id2name, voter_order),
+        {"export_format": final_reveal_export_format},
+    )
+
+
+def winner_board_job(final_comp: CompetitionInfo, id2name: Dict[int, str], contest: Contest) -> Optional[RenderJob]:
+    """Render job for the winner recap board, None if there is a tie for the first place."""
+    jury_scores = final_comp.count_votes_jury()
+    max_score = max(jury_scores.values()) if jury_scores else 0
+    if sum(1 for score in jury_scores.values() if score == max_score) > 1:
+        return None
+    
+    winner = max(final_comp.competing_entries, key=lambda x: (jury_scores.get(x, 0), -x.submission_time))
+    return RenderJob(
+        "gen_winner_announcement_board",
+        kwargs={
+            "winner": winner,
+            "all_finalists": final_comp.competing_entries,
+            "final_scores": jury_scores,
+            "category_name": "Grand Final",
+            "id2name": id2name,
+            "final_competition": final_comp,
+            "contest": contest,
+        },
+    )
+
+
+async def stage_result_jobs(bot: discord.Client, contest: Contest, period: ContestPeriod) -> list[RenderJob]:
+    """Every render job the results of a stage will need once it is over.
+    
+    The boards of the whole contest are posted after the final, so the final also
+    includes the qualif and semis jobs (already cached unless something changed).
+    """
+    # Same mappings as the announce handlers: authors only, or authors and jurors
+    id2name_voters = await build_id2name_mapping(bot, contest, include_voters=True)
+    author_ids = {submission.author_id for submission in contest.submissions}
+    id2name = {user_id: name for user_id, name in id2name_voters.items() if user_id in author_ids}
+    
+    jobs: list[RenderJob] = []
+    if period in (ContestPeriod.QUALIF, ContestPeriod.FINAL):
+        jobs += await qualif_board_jobs(bot, contest, id2name)
+        jobs += await vote_details_jobs(bot, contest, id2name, ("qualif",))
+    if period in (ContestPeriod.SEMIS, ContestPeriod.FINAL):
+        jobs.append(semis_boards_job(bot, contest, id2name))
+        jobs += await vote_details_jobs(bot, contest, id2name, ("semis",))
     
-    # Process final competition
     final_comp = contest.final_competition
-    if final_comp:
-        final_channel = bot.get_channel(final_channel_id)
-        if final_channel and isinstance(final_channel, discord.TextChannel):
-            for i, submission in enumerate(final_comp.competing_entries):
-                board_path = gen_final_photo_vote_details(
-                    submission, final_comp, id2name, contest=contest
-                )
-                
-                try:
-                    board_url = await upload_to_save_channel(
-                        final_channel.guild,
-                        board_path,
-                        f"Vote details - Grand Final - Photo #{i+1}"
-                    )
-                except RuntimeError as e:
-                    print(f"Could not upload final vote board: {e}")
-                    continue
-                
-                message_id = final_comp.msg_to_sub.get(i)
-                if message_id:
-                    try:
-                        message = await final_channel.fetch_message(message_id)
-                        embed = discord.Embed()
-                        embed.set_image(url=submission.discord_save_path)
-                        embed.set_thumbnail(url=board_url)
-                        await message.edit(
-                            content=f"Submission #{i+1}",
-                            embed=embed
-                        )
-                    except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
-                        print(f"Could not update final message {message_id}: {e}")
+    if period == ContestPeriod.FINAL and final_comp:
+        jobs.append(RenderJob("gen_final_results_board", (contest, id2name)))
+        jobs += await vote_details_jobs(bot, contest, id2name, ("final",))
+        # DMed to the finalists by notify_final_results
+        jobs += [final_details_job(submission, final_comp, id2name_voters, contest) for submission in final_comp.competing_entries]
+        if final_comp.votes_jury:
+            jobs.append(final_reveal_job(final_comp, id2name_voters))
+            winner_job = winner_board_job(final_comp, id2name_voters, contest)
+            if winner_job:
+                jobs.append(winner_job)
     
-    print("Individual vote boards complete!")
+    return jobs
 
 
-async def announce_final_results(bot: discord.Client, reveal_delay: int = 30):
-    """Announce final results with Eurovision-style voting reveal with live boards.
+def standings_fingerprint(competition: CompetitionInfo, jury_voter_authors: set[int]) -> str:
+    """What the live standings board of a competition depends on: its tallies and the +3 jury bonuses."""
+    bonus_authors = sorted({sub.author_id for sub in competition.competing_entries} & jury_voter_authors)
+    return f"{competition.tally_fingerprint()}/{','.join(map(str, bonus_authors))}"
+
+
+async def refresh_live_standings(bot: discord.Client):
+    """Post or refresh the pinned standings board of each competition of the current voting stage.
     
-    Args:
-        bot: Discord client
-        reveal_delay: Seconds to wait between revealing each voter's results (default: 30)
+    Only the competitions whose tallies changed since their last board are re-rendered, in
+    the render workers (see gen_live_standings_board: the rows that did not change are not
+    repainted), and the edits are spaced by live_standings_edit_spacing seconds.
     """
     global contest
     
-    # Get the announcement channel
-    announcement_channel = bot.get_channel(announcement_channel_id)
-    if not announcement_channel or not isinstance(announcement_channel, discord.TextChannel):
+    if current_period == ContestPeriod.QUALIF:
+        mode, competitions = "qualif", contest.qualif_competitions
+    elif current_period == ContestPeriod.SEMIS:
+        mode, competitions = "semis", contest.semis_competitions
+    else:
+        return
+    
+    jury_voter_authors = contest.get_jury_voter_authors(mode)
+    to_refresh = [
+        (comp, fingerprint)
+        for comp in competitions
+        if (fingerprint := standings_fingerprint(comp, jury_voter_authors))
+        != contest.standings_posts.get(comp.thread_id or comp.channel_id, {}).get("fingerprint")
+    ]
+    if not to_refresh:
+        return
+    
+    id2name = await build_id2name_mapping(bot, contest)
+    new_posts: Dict[int, Dict[str, Any]] = {}
+    
+    for comp, fingerprint in to_refresh:
+        location_id = comp.thread_id or comp.channel_id
+        try:
+            channel = bot.get_channel(location_id) or await bot.fetch_channel(location_id)
+            assert isinstance(channel, (discord.TextChannel, discord.Thread)), "Target channel must be a text channel or thread"
+            
+            category_channel = bot.get_channel(comp.channel_id)
+            category_name = getattr(category_channel, "name", f"Category {comp.channel_id}")
+            if mode == "semis":
+                category_name = strip_emoji(category_name)
+            thread_name = channel.name if comp.thread_id else None
+            board = await render_service.render(RenderJob(
+                "gen_live_standings_board", (location_id, comp, category_name, id2name, thread_name, mode, jury_voter_authors)
+            ))
+            content = f"📊 **Live standings** (updated <t:{int(utcnow().timestamp())}:R>)"
+            
+            message = None
+            post = contest.standings_posts.get(location_id)
+            if post:
+                try:
+                    message = await channel.get_partial_message(post["message_id"]).edit(
+                        content=content, file=board_file(board), attachments=[]
+                    )
+                except discord.NotFound:
+                    message = None  # deleted in the meantime: post a new one
+            if message is None:
+                message = await channel.send(content, file=board_file(board))
+                try:
+                    await message.pin()
+                except discord.HTTPException as e:
+                    logger.warning(f"Could not pin the live standings in {location_id}: {e}")
+            
+            new_posts[location_id] = {"message_id": message.id, "fingerprint": fingerprint}
+            logger.info(f"Live standings of {location_id} refreshed")
+        except Exception as e:
+            logger.error(f"Could not refresh the live standings of {location_id}: {e}")
+        
+        await asyncio.sleep(live_standings_edit_spacing)
+    
+    if new_posts:
+        contest = contest.set_standings_posts(new_posts)
+        await save_contest(contest)
+
+
+async def announce_individual_vote_boards(bot: discord.Client):
+    """Add individual vote details boards to submission embeds after the final.
+    
+    For each qualif and semis submission, generates an individual vote board showing
+    how each jury member voted for that specific photo, uploads it to the save channel,
+    and updates the submission embed to include the board as a thumbnail.
+    
+    Boards are rendered in the render service's process pool (or taken from the board
+    cache when they were pre-rendered); each board is uploaded and its message edited
+    as soon as it is ready, while the others keep rendering. Boards ready at the same time
+    are uploaded together, up to 10 per message.
+    """
+    global contest
+    
+    print("Generating individual vote boards...")
+    
+    # Build id2name mapping
+    id2name = await build_id2name_mapping(bot, contest)
+    
+    jobs = await vote_details_jobs(bot, contest, id2name)
+    
+    print(f"Rendering {len(jobs)} individual vote boards...")
+    
+    scheduler = PostingScheduler("Individual vote boards")
+    nb_files, nb_messages = save_uploads.nb_files, save_uploads.nb_messages
+    
+    async def attach_board(target_channel, comp: CompetitionInfo, i: int, submission: Submission, board: RenderedBoard, description: str):
+        # Upload to save channel for permanent URL (batched with the other boards ready at the same time)
+        try:
+            board_url = await upload_to_save_channel(target_channel.guild, board, description)
+        except RuntimeError as e:
+            print(f"Could not upload individual vote board: {e}")
+            return
+        
+        # Update the submission message to add the individual vote board
+        message_id = comp.message_id_of(i)
+        
+        if message_id:
+            try:
+                # Update embed to include individual vote board as thumbnail
+                embed = discord.Embed()
+                embed.set_image(url=submission.discord_save_path)
+                embed.set_thumbnail(url=board_url)
+                await edit_message(target_channel, message_id, scheduler, content=f"Submission #{i+1}", embed=embed)
+            except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
+                print(f"Could not update message {message_id}: {e}")
+    
+    # Each board is uploaded as soon as it is rendered, while the others keep rendering
+    uploads = []
+    async for result in board_cache.stream(jobs):
+        target_channel, comp, i, submission, description = result.job.tag
+        
+        if result.error is not None or result.board is None:
+            print(f"Could not render individual vote board ({description}): {result.error}")
+            continue
+        
+        uploads.append(asyncio.create_task(attach_board(target_channel, comp, i, submission, result.board, description)))
+    
+    await asyncio.gather(*uploads)
+    print(f"Uploaded {save_uploads.nb_files - nb_files} boards in {save_uploads.nb_messages - nb_messages} messages")
+    print("Individual vote boards complete!")
+
+
+async def announce_final_results(bot: discord.Client, reveal_delay: Optional[float] = None):
+    """Announce final results with Eurovision-style voting reveal with live boards.
+    
+    Args:
+        bot: Discord client
+        reveal_delay: Seconds to wait between revealing each voter's results (default: final_reveal_delay)
+    """
+    if reveal_delay is None:
+        reveal_delay = final_reveal_delay
+    global contest
+    
+    # Get the announcement channel
+    announcement_channel = bot.get_channel(announcement_channel_id)
+    if not announcement_channel or not isinstance(announcement_channel, discord.TextChannel):
         print(f"Warning: Could not find announcement channel {announcement_channel_id}")
         return
     
@@ -1752,72 +2003,45 @@ async def announce_final_results(bot: discord.Client, reveal_delay: int = 30):
         print("Warning: No final competition found")
         return
     
+    # Every board of the reveal (one per juror, then the clean final board), usually
+    # pre-rendered before the final closed, so that each message can be posted as soon as its turn comes
+    reveal_job = final_reveal_job(final_comp, id2name)
+    voter_order = reveal_job.args[2]
+    boards = list(await board_cache.render(reveal_job))
+    recap_board = boards.pop() if final_reveal_export_format else None
+    *voter_boards, final_board = boards
+    
     await announcement_channel.send(f"\n\n🎤 **LIVE VOTING REVEAL - GRAND FINAL** 🎤\n")
     await announcement_channel.send(f"**{len(final_comp.votes_jury)} jury votes have been cast. Let's reveal them!**\n")
     
-    # Get jury votes and randomize order for suspense
-    from random import shuffle
-    jury_votes_list = list(final_comp.votes_jury.items())
-    shuffle(jury_votes_list)
-    
-    # Create a temporary final competition to accumulate votes
-    from photo_contest.photo_contest_data import CompetitionInfo
-    temp_final = CompetitionInfo(
-        type="final",
-        channel_id=final_comp.channel_id,
-        start_time=final_comp.start_time,
-        end_time=final_comp.end_time,
-        competing_entries=final_comp.competing_entries
-    )
-    
-    total_voters = len(jury_votes_list)
-    
-    # Generate and post boards progressively
-    for i, (voter_id, jury_vote) in enumerate(jury_votes_list, start=1):
-        voter_name = id2name.get(voter_id, f"Juror {voter_id}")
-        
-        # Add voter's vote to temporary competition
-        temp_final = temp_final.add_jury_vote(jury_vote)
-        
-        # Calculate points from this voter for display
-        voter_points = jury_vote.points_to_submissions()
-        
-        # Create temporary contest with updated final
-        temp_contest = Contest(
-            competitions=[temp_final],
-            schedule=contest.schedule
-        )
-        
-        # Generate board with latest voter info
-        board_path = gen_final_results_board(
-            temp_contest,
-            id2name,
-            latest_voter_points=voter_points,
-            latest_voter_name=voter_name,
-            latest_voter_index=i,
-            total_voters=total_voters,
-        )
-        
+    # Post the pre-rendered boards progressively
+    for i, (voter_id, board) in enumerate(zip(voter_order, voter_boards), start=1):
         if i == 1:
             await announcement_channel.send(
                 "📊 **Starting scoreboard:**",
-                file=discord.File(board_path)
+                file=board_file(board)
             )
         else:
             await announcement_channel.send(
                 f"Thank you <@{voter_id}> 🎖️ for your votes!",
-                file=discord.File(board_path)
+                file=board_file(board)
             )
         
         await asyncio.sleep(reveal_delay)
     
-    # Generate and post the final clean results board (without "+New" column)
-    final_board_path = gen_final_results_board(contest, id2name)
+    # Post the final clean results board (without "+New" column)
     await announcement_channel.send(
         "🏆 **Final Results:**",
-        file=discord.File(final_board_path)
+        file=board_file(final_board)
     )
     
+    # The whole reveal in a single file, for those who missed it live
+    if recap_board is not None:
+        await announcement_channel.send(
+            "🎞️ **The whole reveal in one go:**",
+            file=board_file(recap_board)
+        )
+    
     # Announce the winner
     jury_scores = final_comp.count_votes_jury()
     
@@ -1853,18 +2077,12 @@ async def announce_final_results(bot: discord.Client, reveal_delay: int = 30):
             print(f"Could not send DM to winner {winner.author_id}: {e}")
         
         # Generate winner recap board
-        winner_board_path = gen_winner_announcement_board(
-            winner=winner,
-            all_finalists=final_comp.competing_entries,
-            final_scores=jury_scores,
-            category_name="Grand Final",
-            id2name=id2name,
-            final_competition=final_comp,
-            contest=contest,
-        )
+        winner_job = winner_board_job(final_comp, id2name, contest)
+        assert winner_job is not None
+        winner_board = await board_cache.render(winner_job)
         await announcement_channel.send(
             "📸 **Winner Recap:**",
-            file=discord.File(winner_board_path)
+            file=board_file(winner_board)
         )
         
         await announcement_channel.send("\n✨ **Contest complete! Thank you to all participants!** ✨")
@@ -1880,62 +2098,36 @@ async def announce_final_boards(bot: discord.Client):
     # Build id2name mapping
     id2name = await build_id2name_mapping(bot, contest)
     
-    # Build channel_names dict for semifinals
-    channel_names: Dict[int, str] = {}
-    for comp in contest.semis_competitions:
-        category_channel = bot.get_channel(comp.channel_id)
-        channel_names[comp.channel_id] = getattr(category_channel, "name", f"Category {comp.channel_id}")
-    
-    # Generate and post qualif boards - post in their respective threads
-    # Get jury voter authors for bonus display
-    qualif_jury_voter_authors = contest.get_jury_voter_authors("qualif")
-    
-    for comp in contest.qualif_competitions:
-        category_channel = bot.get_channel(comp.channel_id)
-        category_name = getattr(category_channel, "name", f"Category {comp.channel_id}")
-        
-        # Get thread name and channel
-        if comp.thread_id:
-            thread = await bot.fetch_channel(comp.thread_id)
-            assert isinstance(thread, discord.Thread), "Thread ID does not correspond to a thread channel"
-            thread_name = thread.name
-            target_channel = thread  # Post in thread
-        else:
-            thread_name = None
-            target_channel = category_channel  # Post in category channel
+    # Post qualif boards in their respective threads (usually pre-rendered by the pre-render task)
+    for job in await qualif_board_jobs(bot, contest, id2name):
+        target_channel, category_name, thread_name = job.tag
+        board = await board_cache.render(job)
         
-        assert isinstance(target_channel, (discord.TextChannel, discord.Thread)), "Target channel must be a text channel or thread"
-        
-        board_path = gen_competition_board(comp, category_name, id2name, thread_name, qualif_jury_voter_authors)
-        
-        with open(board_path, "rb") as f:
-            await target_channel.send(
-                content=f"📊 **Qualification Results: {category_name}**" + (f" - {thread_name}" if thread_name else ""),
-                file=discord.File(f, filename=os.path.basename(board_path))
-            )
+        await target_channel.send(
+            content=f"📊 **Qualification Results: {category_name}**" + (f" - {thread_name}" if thread_name else ""),
+            file=board_file(board)
+        )
     
-    # Generate and post semi-final boards - post in category channels
-    semifinal_boards = gen_semifinals_boards(contest, channel_names, id2name)
-    for comp, board_path in zip(contest.semis_competitions, semifinal_boards):
+    # Post semi-final boards in category channels
+    semifinal_boards = await board_cache.render(semis_boards_job(bot, contest, id2name))
+    for comp, board in zip(contest.semis_competitions, semifinal_boards):
         category_channel = bot.get_channel(comp.channel_id)
         assert isinstance(category_channel, (discord.TextChannel, discord.Thread)), "Category channel must be a text channel or thread"
         
-        with open(board_path, "rb") as f:
-            await category_channel.send(
-                content=f"📊 **Semi-Final Results**",
-                file=discord.File(f, filename=os.path.basename(board_path))
-            )
+        await category_channel.send(
+            content=f"📊 **Semi-Final Results**",
+            file=board_file(board)
+        )
     
     # Generate and post final board - post in final channel
     final_channel = bot.get_channel(final_channel_id)
     if final_channel and isinstance(final_channel, discord.TextChannel):
-        board_path = gen_final_results_board(contest, id2name)
+        board = await board_cache.render(RenderJob("gen_final_results_board", (contest, id2name)))
         
-        with open(board_path, "rb") as f:
-            await final_channel.send(
-                content="🏆 **Final Results** 🏆",
-                file=discord.File(f, filename=os.path.basename(board_path))
-            )
+        await final_channel.send(
+            content="🏆 **Final Results** 🏆",
+            file=board_file(board)
+        )
     
     announcement_channel = bot.get_channel(announcement_channel_id)
     if announcement_channel and isinstance(announcement_channel, (discord.TextChannel, discord.Thread)):
@@ -1969,16 +2161,13 @@ async def _send_final_vote_reminder_dms(bot: discord.Client, contest: Contest):
     vote_link = f"{final_channel.jump_url}" + (f"/{vote_msg_id}" if vote_msg_id else "")
     
     for voter_id in voter_ids:
-        try:
-            user = await bot.fetch_user(voter_id)
-            await user.send(
-                f"🏆 **Grand Final voting is now open!**\n\n"
-                f"Rank your top 5 out of the 15 finalists.\n"
-                f"Vote here: {vote_link}\n\n"
-                f"Voting deadline: <t:{int(deadline)}:F>"
-            )
-        except (discord.Forbidden, discord.NotFound, discord.HTTPException):
-            pass
+        dm_outbox.enqueue(
+            voter_id,
+            f"🏆 **Grand Final voting is now open!**\n\n"
+            f"Rank your top 5 out of the 15 finalists.\n"
+            f"Vote here: {vote_link}\n\n"
+            f"Voting deadline: <t:{int(deadline)}:F>"
+        )
 
 
 async def notify_period_start(bot: discord.Client, period: ContestPeriod):
@@ -2066,11 +2255,7 @@ async def notify_qualifiers(bot: discord.Client, contest: Contest, competition_t
         competition_type: Type of competitions ("semis" or "final")
         stage_name: Name of the stage they qualified for (e.g., "Semi-Finals", "Grand Final")
     """
-    guild = bot.get_guild(voltServer)
-    if not guild:
-        return
-    
-    # Send DM for each qualified photo
+    # Send DM for each qualified photo (through the outbox)
     if competition_type == "final":
         competitions = [contest.final_competition] if contest.final_competition else []
     else:
@@ -2079,42 +2264,30 @@ async def notify_qualifiers(bot: discord.Client, contest: Contest, competition_t
         # For finals, there's a single combined competition so don't mention category
         if stage_name == "Grand Final":
             for submission in comp.competing_entries:
-                try:
-                    user = await guild.fetch_member(submission.author_id)
-                    if user:
-                        description = f"🎉 Your photo has qualified for the **{stage_name}**!\n\nThis is the final round - good luck! 🍀"
-                        
-                        embed = discord.Embed(
-                            title=f"🎉 Photo Qualified!",
-                            description=description,
-                            color=0x00ff00
-                        )
-                        embed.set_image(url=submission.discord_save_path)
-                        await send_dm_safe(user, embed=embed)
-                except Exception:
-                    # User not found, skip
-                    pass
+                description = f"🎉 Your photo has qualified for the **{stage_name}**!\n\nThis is the final round - good luck! 🍀"
+                
+                embed = discord.Embed(
+                    title=f"🎉 Photo Qualified!",
+                    description=description,
+                    color=0x00ff00
+                )
+                embed.set_image(url=submission.discord_save_path)
+                dm_outbox.enqueue(submission.author_id, embed=embed)
         else:
             # For semis, mention the category name
             category_channel = bot.get_channel(comp.channel_id)
             category_name = getattr(category_channel, "name", f"Category {comp.channel_id}")
             
             for submission in comp.competing_entries:
-                try:
-                    user = await guild.fetch_member(submission.author_id)
-                    if user:
-                        description = f"Your photo from **{category_name}** has qualified for the **{stage_name}**!\n\nGood luck in the next round! 🍀"
-                        
-                        embed = discord.Embed(
-                            title=f"🎉 Photo Qualified!",
-                            description=description,
-                            color=0x00ff00
-                        )
-                        embed.set_image(url=submission.discord_save_path)
-                        await send_dm_safe(user, embed=embed)
-                except Exception:
-                    # User not found, skip
-                    pass
+                description = f"Your photo from **{category_name}** has qualified for the **{stage_name}**!\n\nGood luck in the next round! 🍀"
+                
+                embed = discord.Embed(
+                    title=f"🎉 Photo Qualified!",
+                    description=description,
+                    color=0x00ff00
+                )
+                embed.set_image(url=submission.discord_save_path)
+                dm_outbox.enqueue(submission.author_id, embed=embed)
 
 
 async def notify_final_results(bot: discord.Client, contest: Contest):
@@ -2124,13 +2297,7 @@ async def notify_final_results(bot: discord.Client, contest: Contest):
         bot: The Discord bot client
         contest: The contest object
     """
-    guild = bot.get_guild(voltServer)
-    if not guild:
-        return
-    
     medal_emojis = ["🥇", "🥈", "🥉"]
-
-    users = dict()
     
     # Get the single combined final competition
     comp = contest.final_competition
@@ -2159,53 +2326,56 @@ async def notify_final_results(bot: discord.Client, contest: Contest):
         placement = i + 1
         points = total_points[submission]
         
+        # Create placement message
+        if placement == 1:
+            medal = medal_emojis[0]
+            title = f"{medal} GRAND FINAL WINNER!"
+            description = f"🎊 **Congratulations!** Your photo won **1st place** in the Grand Final!\n\n**Total Points:** {points}"
+            color = 0xFFD700  # Gold
+        elif placement == 2:
+            medal = medal_emojis[1]
+            title = f"{medal} 2nd Place - Grand Final"
+            description = f"🎉 **Amazing!** Your photo placed **2nd** in the Grand Final!\n\n**Total Points:** {points}"
+            color = 0xC0C0C0  # Silver
+        elif placement == 3:
+            medal = medal_emojis[2]
+            title = f"{medal} 3rd Place - Grand Final"
+            description = f"👏 **Great work!** Your photo placed **3rd** in the Grand Final!\n\n**Total Points:** {points}"
+            color = 0xCD7F32  # Bronze
+        else:
+            title = f"Final Results - Grand Final"
+            description = f"Thank you for participating! Your photo placed **{placement}th** in the Grand Final.\n\n**Total Points:** {points}"
+            color = 0x7289DA  # Discord blurple
+        
+        embed = discord.Embed(
+            title=title,
+            description=description,
+            color=color
+        )
+        embed.set_image(url=submission.discord_save_path)
+        
+        # Generate individual result board
         try:
-            if submission.author_id in users:
-                user = users[submission.author_id]
-            else:
-                user = await guild.fetch_member(submission.author_id)
-                users[submission.author_id] = user
-
-            if user:
-                # Create placement message
-                if placement == 1:
-                    medal = medal_emojis[0]
-                    title = f"{medal} GRAND FINAL WINNER!"
-                    description = f"🎊 **Congratulations!** Your photo won **1st place** in the Grand Final!\n\n**Total Points:** {points}"
-                    color = 0xFFD700  # Gold
-                elif placement == 2:
-                    medal = medal_emojis[1]
-                    title = f"{medal} 2nd Place - Grand Final"
-                    description = f"🎉 **Amazing!** Your photo placed **2nd** in the Grand Final!\n\n**Total Points:** {points}"
-                    color = 0xC0C0C0  # Silver
-                elif placement == 3:
-                    medal = medal_emojis[2]
-                    title = f"{medal} 3rd Place - Grand Final"
-                    description = f"👏 **Great work!** Your photo placed **3rd** in the Grand Final!\n\n**Total Points:** {points}"
-                    color = 0xCD7F32  # Bronze
-                else:
-                    title = f"Final Results - Grand Final"
-                    description = f"Thank you for participating! Your photo placed **{placement}th** in the Grand Final.\n\n**Total Points:** {points}"
-                    color = 0x7289DA  # Discord blurple
-                
-                embed = discord.Embed(
-                    title=title,
-                    description=description,
-                    color=color
-                )
-                embed.set_image(url=submission.discord_save_path)
-                
-                # Generate individual result board
-                board_path = gen_final_photo_vote_details(submission, comp, id2name, contest=contest)
-                
-                await send_dm_safe(
-                    user,
-                    embed=embed,
-                    file=discord.File(board_path)
-                )
-        except Exception:
-            # User not found, skip
-            pass
+            board = await board_cache.render(final_details_job(submission, comp, id2name, contest))
+        except Exception as e:
+            logger.error(f"Could not render the final board of {submission.author_id}: {e}")
+            continue
+        
+        dm_outbox.enqueue(submission.author_id, embed=embed, file=board)
+
+
+def period_at(timestamp: float) -> ContestPeriod:
+    """The period the schedule says the contest is in at a given time."""
+    schedule = contest.schedule
+    if schedule.submission_period.start <= timestamp < schedule.submission_period.end:
+        return ContestPeriod.SUBMISSION
+    elif schedule.qualif_period.start <= timestamp < schedule.qualif_period.end:
+        return ContestPeriod.QUALIF
+    elif schedule.semis_period.start <= timestamp < schedule.semis_period.end:
+        return ContestPeriod.SEMIS
+    elif schedule.final_period.start <= timestamp < schedule.final_period.end:
+        return ContestPeriod.FINAL
+    return ContestPeriod.IDLE
 
 
 async def recover_state(bot: discord.Client):
@@ -2215,30 +2385,27 @@ async def recover_state(bot: discord.Client):
     current_timestamp = utcnow().timestamp()
     
     # Determine where we should be
-    if contest.schedule.submission_period.start <= current_timestamp < contest.schedule.submission_period.end:
-        target_period = ContestPeriod.SUBMISSION
-    elif contest.schedule.qualif_period.start <= current_timestamp < contest.schedule.qualif_period.end:
-        target_period = ContestPeriod.QUALIF
-    elif contest.schedule.semis_period.start <= current_timestamp < contest.schedule.semis_period.end:
-        target_period = ContestPeriod.SEMIS
-    elif contest.schedule.final_period.start <= current_timestamp < contest.schedule.final_period.end:
-        target_period = ContestPeriod.FINAL
-    else:
-        target_period = ContestPeriod.IDLE
+    target_period = period_at(current_timestamp)
     
     print(f"Recovering state... Current period should be: {target_period.value}")
     
+    # Resume a stage preparation interrupted by the crash, even if its period did not start yet
+    for prefix, prep in (("prep_qualif", prep_qualif_period), ("prep_semis", prep_semis_period), ("prep_final", prep_final_period)):
+        if journal.has_started(f"{prefix}/") and not journal.is_done(f"{prefix}/done"):
+            print(f"Resuming interrupted {prefix}...")
+            await prep(bot)
+    
     # Check if we need to set up periods that we missed
     # Note: When recovering, we need to run both prep_* (post photos) and notify_* (announce)
-    if target_period == ContestPeriod.QUALIF and not contest.qualif_competitions:
+    if target_period == ContestPeriod.QUALIF and prep_pending("prep_qualif", bool(contest.qualif_competitions)):
         print("Missed qualif setup, setting up now...")
         await prep_qualif_period(bot)
         await notify_period_start(bot, ContestPeriod.QUALIF)
-    elif target_period == ContestPeriod.SEMIS and not contest.semis_competitions:
+    elif target_period == ContestPeriod.SEMIS and prep_pending("prep_semis", bool(contest.semis_competitions)):
         print("Missed semis setup, setting up now...")
         await prep_semis_period(bot)
         await notify_period_start(bot, ContestPeriod.SEMIS)
-    elif target_period == ContestPeriod.FINAL and not contest.final_competition:
+    elif target_period == ContestPeriod.FINAL and prep_pending("prep_final", bool(contest.final_competition)):
         print("Missed final setup, setting up now...")
         await prep_final_period(bot)
         await notify_period_start(bot, ContestPeriod.FINAL)
@@ -2250,6 +2417,91 @@ async def recover_state(bot: discord.Client):
     print(f"Recovery complete. Current period: {current_period.value}")
 
 
+async def transition_to(period: ContestPeriod, bot: discord.Client):
+    """Close the current period and set up the new one."""
+    global current_period
+    
+    old_period = current_period
+    current_period = period
+    
+    if old_period:
+        await close_period(old_period, bot)
+    await setup_period(period, old_period, bot)
+
+
+# Order of the periods, to tell whether a scheduled boundary moves the contest forward
+PERIOD_ORDER = [ContestPeriod.SUBMISSION, ContestPeriod.QUALIF, ContestPeriod.SEMIS, ContestPeriod.FINAL]
+
+
+async def on_period_boundary(bot: discord.Client, timestamp: float):
+    """Scheduled at each start and end of a period: move to the period the schedule gives from then on.
+    
+    The contest only moves forward. A period entered early by an admin (contest_goto, contest_next)
+    is kept until the schedule reaches a later one, and a period only ends into IDLE when it is the
+    one the boundary closes, so that an admin override is not undone by the boundary it skipped.
+    """
+    target = period_at(timestamp)
+    if target == current_period:
+        return
+    
+    if target == ContestPeriod.IDLE:
+        ended = [
+            period for period, schedule_period in zip(PERIOD_ORDER, schedule_periods())
+            if schedule_period.end == timestamp
+        ]
+        if current_period not in ended:
+            return
+    elif current_period in PERIOD_ORDER and PERIOD_ORDER.index(current_period) >= PERIOD_ORDER.index(target):
+        return
+    
+    if target != ContestPeriod.IDLE and utcnow().timestamp() >= schedule_periods()[PERIOD_ORDER.index(target)].end:
+        return  # the period is already over (e.g. the bot was down during all of it)
+    
+    logger.info(f"Scheduled transition: {current_period.value if current_period else 'None'} -> {target.value}")
+    await transition_to(target, bot)
+
+
+def schedule_periods() -> List[Period]:
+    """Schedule of the periods, in the order of PERIOD_ORDER."""
+    schedule = contest.schedule
+    return [schedule.submission_period, schedule.qualif_period, schedule.semis_period, schedule.final_period]
+
+
+async def prerender_stage(bot: discord.Client, period: ContestPeriod):
+    """Re-render the result boards of a voting period whose votes changed since their last render."""
+    try:
+        jobs = await stage_result_jobs(bot, contest, period)
+        nb_rendered = await board_cache.prerender(jobs)
+        if nb_rendered:
+            logger.info(f"Pre-rendered {nb_rendered}/{len(jobs)} {period.value} result boards")
+    except Exception as e:
+        logger.error(f"Pre-rendering of the {period.value} result boards failed: {e}")
+
+
+def contest_events(bot: discord.Client) -> List[ScheduledEvent]:
+    """Everything the bot has to do at a given time, from the current schedule.
+    
+    Period boundaries are journaled so that each one runs exactly once, even across restarts.
+    During the last prerender_window_minutes of each voting period, the result boards are
+    re-rendered every minute so that the close handlers find them ready.
+    """
+    events = []
+    boundaries = sorted({ts for schedule_period in schedule_periods() for ts in (schedule_period.start, schedule_period.end)})
+    for ts in boundaries:
+        events.append(ScheduledEvent(ts, f"boundary@{ts}", lambda ts=ts: on_period_boundary(bot, ts)))
+    
+    for period, schedule_period in zip(PERIOD_ORDER[1:], schedule_periods()[1:]):
+        window_start = max(schedule_period.start, schedule_period.end - prerender_window_minutes * 60)
+        for ts in range(window_start, schedule_period.end, 60):
+            events.append(ScheduledEvent(
+                ts, f"prerender:{period.value}@{ts}",
+                lambda period=period: prerender_stage(bot, period),
+                persistent=False
+            ))
+    
+    return events
+
+
 async def close_qualif_period(bot: discord.Client):
     """Close qualification period by removing voting reactions and locking threads."""
     global contest
@@ -2317,19 +2569,11 @@ async def announce_semis_winners(bot: discord.Client):
             
             for sub in qualifiers:
                 # Find the message ID for this submission
-                msg_id = None
-                for m_id, sub_idx in comp.msg_to_sub.items():
-                    if sub_idx == comp.competing_entries.index(sub):
-                        msg_id = m_id
-                        break
+                msg_id = comp.message_id_of(comp.competing_entries.index(sub))
                 
                 if msg_id:
-                    try:
-                        message = await channel.fetch_message(msg_id)
-                        await channel.send(f"✅ **{category_name} qualifier**: {message.jump_url}")
-                    except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                        # Fallback: just send the Discord path
-                        await channel.send(f"✅ **{category_name} qualifier**: {sub.discord_save_path}")
+                    # The link only needs the ids, no need to fetch the message
+                    await channel.send(f"✅ **{category_name} qualifier**: {channel.get_partial_message(msg_id).jump_url}")
                 else:
                     await channel.send(f"✅ **{category_name} qualifier**: {sub.discord_save_path}")
         
@@ -2350,23 +2594,146 @@ async def close_final_period(bot: discord.Client):
             pass
 
 
+# Public voting reactions (0-3 points) and commentary reaction, added under every submission
+VOTE_REACTIONS = ("0️⃣", "1️⃣", "2️⃣", "3️⃣", "💬")
+
+
+async def find_recent_message(channel: discord.TextChannel | discord.Thread, content: str, limit: int = 50) -> Optional[int]:
+    """Id of the latest message of the bot with exactly this content among the last messages of the channel.
+    
+    Used to reconcile the journal: tells whether a send interrupted by a crash went through.
+    """
+    async for message in channel.history(limit=limit):
+        if message.author.id == channel.guild.me.id and message.content == content:
+            return message.id
+    return None
+
+
+async def journaled_send(
+    key: str,
+    scheduler: PostingScheduler,
+    channel: discord.TextChannel | discord.Thread,
+    content: str,
+    **kwargs: Any,
+) -> int:
+    """Send a message as a journaled step, return its id (the recorded one if it was already sent)."""
+    return await journal.step(
+        key,
+        lambda: scheduler.call(("send", channel.id), channel.send, content, **kwargs),
+        result=lambda msg: msg.id,
+        reconcile=lambda: find_recent_message(channel, content),
+    )
+
+
+async def journaled_reactions(
+    key: str,
+    scheduler: PostingScheduler,
+    channel: discord.TextChannel | discord.Thread,
+    message_id: int,
+    reactions: tuple[str, ...],
+):
+    """Add reactions, in order, to a message, one journaled step per reaction."""
+    message = channel.get_partial_message(message_id)
+    for emoji in reactions:
+        await journal.step(f"{key}/{emoji}", lambda emoji=emoji: scheduler.call(("reaction", channel.id), message.add_reaction, emoji))
+
+
+async def post_submission_messages(
+    scheduler: PostingScheduler,
+    channel: discord.TextChannel | discord.Thread,
+    comp: CompetitionInfo,
+    journal_prefix: str,
+    reactions: tuple[str, ...] = VOTE_REACTIONS,
+):
+    """Post the "Submission #n" messages of a competition in order and record their message ids.
+    
+    Each message and its reactions are journaled steps under journal_prefix, so this can be
+    called again after a crash: it resumes after the last message sent.
+    The ids are recorded in the contest once all messages are sent (or one failed): the
+    contest is only copied once per competition, and votes are not open yet during the preparation.
+    Reactions are added by a second task while the next submissions are being sent: they
+    are rate limited separately, and keep their order on each message.
+    """
+    global contest
+    to_react: asyncio.Queue[Optional[tuple[int, int]]] = asyncio.Queue()
+    
+    async def add_reactions():
+        while (item := await to_react.get()) is not None:
+            i, message_id = item
+            await journaled_reactions(f"{journal_prefix}/reactions/{i}", scheduler, channel, message_id, reactions)
+    
+    reactor = asyncio.create_task(add_reactions()) if reactions else None
+    message_ids: dict[int, int] = {}
+    send_error: Optional[BaseException] = None
+    try:
+        for i, submission in enumerate(comp.competing_entries):
+            message_ids[i] = await journaled_send(
+                f"{journal_prefix}/submission/{i}",
+                scheduler,
+                channel,
+                f"Submission #{i+1}",
+                embed=discord.Embed().set_image(url=submission.discord_save_path),
+            )
+            if reactor:
+                to_react.put_nowait((i, message_ids[i]))
+    except BaseException as e:
+        send_error = e
+    
+    # Update the message_id mappings and track the submission posts, in one copy of the contest
+    contest = contest.set_submission_messages(comp.channel_id, comp.thread_id, message_ids)
+    if reactor:
+        to_react.put_nowait(None)
+        (reactions_error,) = await asyncio.gather(reactor, return_exceptions=True)
+        if isinstance(reactions_error, BaseException):
+            if send_error is None:
+                raise reactions_error
+            logger.warning(f"Reactions of {journal_prefix} failed as well: {reactions_error!r}")
+    # The send error comes first: it tells which submission the preparation stopped at
+    if send_error is not None:
+        raise send_error
+
+
+async def report_prep_errors(bot: discord.Client, scheduler: PostingScheduler, errors: dict):
+    """Tell the organizer which channels/threads could not be fully prepared."""
+    if errors:
+        details = "\n".join(f"• <#{location_id}>: {error}" for location_id, error in errors.items())
+        await notify_organizer_error(bot, f"{scheduler.name}: some channels could not be fully prepared\n{details}")
+
+
+def prep_pending(journal_prefix: str, stage_exists: bool) -> bool:
+    """Whether a stage preparation still has to run, or to resume after a crash.
+    
+    Args:
+        journal_prefix: "prep_qualif", "prep_semis" or "prep_final"
+        stage_exists: Whether the competitions of the stage were created
+    """
+    if journal.is_done(f"{journal_prefix}/done"):
+        return False
+    # Stages prepared before the journal existed have competitions but no steps
+    return not stage_exists or journal.has_started(f"{journal_prefix}/")
+
+
 async def prep_qualif_period(bot: discord.Client):
     """Prepare qualification period: create threads and post submissions with voting reactions.
     
     Called at the END of the submission period to prepare for qualification voting.
     Voting will be announced and become valid at the START of the qualification period.
+    Every Discord call is a journaled step (see TransitionJournal): if the preparation
+    was interrupted, calling this again resumes where it stopped.
     """
     global contest
     
+    scheduler = PostingScheduler("Qualification prep")
+    
     # Get the number of threads needed per category
     thread_counts = contest.count_qualifs()
     
     # Create threads for each category (skip categories with < 25 submissions)
     all_thread_ids = []
-    category_threads: dict[int, list[discord.Thread]] = {}  # Store thread objects for later use
+    thread_names: dict[int, str] = {}
     
     for comp, thread_count in zip(contest.submission_competitions, thread_counts):
-        channel = await bot.fetch_channel(comp.channel_id)
+        channel = bot.get_channel(comp.channel_id) or await bot.fetch_channel(comp.channel_id)
         if not channel or not isinstance(channel, discord.TextChannel):
             print(f"Warning: Could not find channel {comp.channel_id}")
             all_thread_ids.append([])
@@ -2378,8 +2745,10 @@ async def prep_qualif_period(bot: discord.Client):
             all_thread_ids.append([])
             
             # Announce auto-qualification in the category channel
-            category_name = getattr(channel, "name", f"Category {comp.channel_id}")
-            await channel.send(
+            await journaled_send(
+                f"prep_qualif/category_message/{comp.channel_id}",
+                scheduler,
+                channel,
                 f"🎉 **All {len(comp.competing_entries)} submission(s) automatically qualify for the Semi-Finals!**\n\n"
                 f"No qualification voting is needed for this category due to the low number of submissions. "
                 f"All entries will proceed directly to the semi-finals. Good luck!"
@@ -2387,22 +2756,38 @@ async def prep_qualif_period(bot: discord.Client):
             continue
         
         thread_ids = []
-        threads = []
         for i in range(thread_count):
-            thread = await channel.create_thread(
-                name=f"Qualification Thread {i+1}",
-                type=discord.ChannelType.public_thread,
-                auto_archive_duration=10080  # 7 days
+            name = f"Qualification Thread {i+1}"
+            
+            # Threads of an already created qualification stage are reused (forced re-run)
+            existing_ids = [c.thread_id for c in contest.qualif_competitions if c.channel_id == comp.channel_id]
+            if i < len(existing_ids) and not journal.is_done(f"prep_qualif/thread/{comp.channel_id}/{i}"):
+                await journal.record(f"prep_qualif/thread/{comp.channel_id}/{i}", existing_ids[i])
+            
+            async def find_thread(channel=channel, name=name) -> Optional[int]:
+                return next((t.id for t in channel.threads if t.name == name and t.owner_id == channel.guild.me.id), None)
+            
+            thread_id = await journal.step(
+                f"prep_qualif/thread/{comp.channel_id}/{i}",
+                lambda channel=channel, name=name: channel.create_thread(
+                    name=name,
+                    type=discord.ChannelType.public_thread,
+                    auto_archive_duration=10080  # 7 days
+                ),
+                result=lambda thread: thread.id,
+                reconcile=find_thread,
             )
-            thread_ids.append(thread.id)
-            threads.append(thread)
+            thread_ids.append(thread_id)
+            thread_names[thread_id] = name
         all_thread_ids.append(thread_ids)
-        category_threads[comp.channel_id] = threads
         
         # Post message in category channel with links to threads
         category_name = getattr(channel, "name", f"Category {comp.channel_id}")
-        thread_links = "\n".join(f"• <#{thread.id}>" for thread in threads)
-        await channel.send(
+        thread_links = "\n".join(f"• <#{thread_id}>" for thread_id in thread_ids)
+        await journaled_send(
+            f"prep_qualif/category_message/{comp.channel_id}",
+            scheduler,
+            channel,
             f"🗳️ **Qualification voting opens soon for {category_name}!**\n\n"
             f"Voting will begin at <t:{int(contest.schedule.qualif_period.start)}:F>\n\n"
             f"Check out the qualification threads below:\n"
@@ -2410,10 +2795,11 @@ async def prep_qualif_period(bot: discord.Client):
             f"Vote for your favorite photos to help them advance to the semi-finals!"
         )
     
-    # Update contest with qualifications
+    # Update contest with qualifications (already done if we are resuming)
+    if not contest.qualif_competitions:
+        contest = contest.make_qualifs(all_thread_ids)
+        await save_contest(contest)
     
-    contest = contest.make_qualifs(all_thread_ids)
-    contest.save("photo_contest/contest2026.yaml")
     # For categories that have qualification threads, remove the original
     # reposts in the main category channel to avoid duplicate posts.
     for comp in contest.qualif_competitions:
@@ -2428,17 +2814,15 @@ async def prep_qualif_period(bot: discord.Client):
             for (msg_id, ch_id, th_id, is_summary) in posts:
                 if ch_id == comp.channel_id and th_id is None and not is_summary:
                     # Delete the original message in the category channel
-                    try:
-                        channel_obj = bot.get_channel(ch_id) or await bot.fetch_channel(ch_id)
-                        if channel_obj:
-                            try:
-                                assert isinstance(channel_obj, discord.TextChannel), "Channel ID does not correspond to a text channel"
-                                msg_obj = await channel_obj.fetch_message(msg_id)
-                                await msg_obj.delete()
-                            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                                pass
-                    except Exception:
-                        pass
+                    async def delete_repost(ch_id=ch_id, msg_id=msg_id):
+                        try:
+                            channel_obj = bot.get_channel(ch_id) or await bot.fetch_channel(ch_id)
+                            assert isinstance(channel_obj, discord.TextChannel), "Channel ID does not correspond to a text channel"
+                            await channel_obj.get_partial_message(msg_id).delete()
+                        except (discord.NotFound, discord.Forbidden, discord.HTTPException, AssertionError):
+                            pass
+                    
+                    await journal.step(f"prep_qualif/delete_repost/{msg_id}", delete_repost)
                     removed = True
                     # omit this post from the new posts list
                 else:
@@ -2458,43 +2842,50 @@ async def prep_qualif_period(bot: discord.Client):
                     copy_contest.submission_posts.pop(key, None)
                 contest = copy_contest
     
-    # Post submissions in their respective threads with voting reactions
-    for comp in contest.qualif_competitions:
+    # Contact sheets are rendered in the process pool while the threads are being filled
+    contact_sheets: Dict[int, asyncio.Future] = {}
+    if qualif_contact_sheets:
+        for comp in contest.qualif_competitions:
+            if journal.is_done(f"prep_qualif/{comp.thread_id}/contact_sheet"):
+                continue
+            category_channel = bot.get_channel(comp.channel_id)
+            category_name = getattr(category_channel, "name", f"Category {comp.channel_id}")
+            title = f"{category_name} - {thread_names.get(comp.thread_id, 'Qualification')}"
+            contact_sheets[comp.thread_id] = asyncio.ensure_future(
+                render_service.render(RenderJob("gen_contact_sheet", (comp, title)))
+            )
+    
+    # Post submissions in their respective threads with voting reactions, all threads at once
+    async def prepare_thread(comp: CompetitionInfo):
         assert comp.thread_id is not None, "Qualification competition missing thread_id"
+        thread_start = time.perf_counter()
+        prefix = f"prep_qualif/{comp.thread_id}"
         
-        # Fetch the thread using bot.fetch_channel to ensure we have the latest version
-        thread = await bot.fetch_channel(comp.thread_id)
+        thread = bot.get_channel(comp.thread_id) or await scheduler.call(("fetch", comp.thread_id), bot.fetch_channel, comp.thread_id)
         if not thread or not isinstance(thread, discord.Thread):
             print(f"Warning: Could not find thread {comp.thread_id}")
-            continue
+            return
         
-        for i, submission in enumerate(comp.competing_entries):
-            msg = await thread.send(
-                content=f"Submission #{i+1}",
-                embed=discord.Embed().set_image(url=submission.discord_save_path)
-            )
-            # Add voting reactions: 0, 1, 2, 3 points
-            await msg.add_reaction("0️⃣")
-            await msg.add_reaction("1️⃣")
-            await msg.add_reaction("2️⃣")
-            await msg.add_reaction("3️⃣")
-            # Add commentary reaction
-            await msg.add_reaction("💬")
-            
-            # Update the contest with the message_id mapping
-            contest = contest.set_message_id(comp.channel_id, comp.thread_id, i, msg.id)
-            
-            # Track the submission post
-            contest = contest.add_submission_post(
-                submission.discord_save_path,
-                msg.id,
-                comp.channel_id,
-                comp.thread_id,
-                is_summary=False
-            )
+        if comp.thread_id in contact_sheets:
+            try:
+                sheet = await contact_sheets[comp.thread_id]
+                await journaled_send(
+                    f"{prefix}/contact_sheet",
+                    scheduler,
+                    thread,
+                    "🖼️ **All the photos of this thread at a glance** - vote on the numbered submissions below!",
+                    file=board_file(sheet),
+                )
+            except Exception as e:
+                logger.error(f"Could not post the contact sheet of thread {comp.thread_id}: {e}")
+        
+        await post_submission_messages(scheduler, thread, comp, prefix)
         
         # Send voting instruction message
-        vote_msg = await thread.send(
+        vote_msg_id = await journaled_send(
+            f"{prefix}/instructions",
+            scheduler,
+            thread,
             "🗳️ **Jury Voting opens soon!**\n"
             f"Voting will begin at <t:{int(contest.schedule.qualif_period.start)}:F>\n\n"
             "React with 🗳️ to this message to cast your jury vote (top 10 ranking).\n\n"
@@ -2503,10 +2894,20 @@ async def prep_qualif_period(bot: discord.Client):
             "You can vote on as many photos as you wish! Your reactions will be automatically removed to keep votes secret.\n\n"
             "Note: The top 2 of public and the top 6 of jury among the remaining submissions will advance to the semi-finals."
         )
-        await vote_msg.add_reaction("🗳️")
+        await journaled_reactions(f"{prefix}/instructions_reaction", scheduler, thread, vote_msg_id, ("🗳️",))
+        
+        logger.info(
+            f"Qualification thread {comp.thread_id} prepared in {time.perf_counter() - thread_start:.1f}s "
+            f"({len(comp.competing_entries)} submissions, contact sheet {'on' if qualif_contact_sheets else 'off'})"
+        )
+    
+    errors = await scheduler.run({comp.thread_id: prepare_thread(comp) for comp in contest.qualif_competitions})
+    await report_prep_errors(bot, scheduler, errors)
     
     # Save the updated contest with message mappings
-    contest.save("photo_contest/contest2026.yaml")
+    await save_contest(contest)
+    if not errors:
+        await journal.record("prep_qualif/done")
 
 
 async def prep_semis_period(bot: discord.Client):
@@ -2514,107 +2915,104 @@ async def prep_semis_period(bot: discord.Client):
     
     Called at the END of the qualification period to prepare for semi-finals voting.
     Voting will be announced and become valid at the START of the semi-finals period.
+    Resumable like prep_qualif_period.
     """
     global contest
     
-    # Store qualif info before solving (to map semis back to threads)
-    qualif_competitions = contest.qualif_competitions
-    
     # Solve qualifications to determine semi-finalists (includes copying public votes to semis)
-    contest, voters_transferred = contest.solve_qualifs()
-    contest.save("photo_contest/contest2026.yaml")
-    
-    # Map channel_id to list of original thread_ids for that channel
-    channel_to_thread_ids = {}
-    for comp in qualif_competitions:
-        if comp.channel_id not in channel_to_thread_ids:
-            channel_to_thread_ids[comp.channel_id] = []
-        channel_to_thread_ids[comp.channel_id].append(comp.thread_id)
+    if not journal.is_done("prep_semis/solve_qualifs"):
+        if contest.semis_competitions:
+            # Solved and saved right before a crash: the transferred voters are lost, skip their DMs
+            voters_transferred = set()
+        else:
+            contest, voters_transferred = contest.solve_qualifs()
+            await save_contest(contest)
+        await journal.record("prep_semis/solve_qualifs", sorted(voters_transferred))
+    voters_transferred = journal.result("prep_semis/solve_qualifs")
     
     # Send DM notifications to voters whose votes were transferred
     for voter_id in voters_transferred:
-        try:
-            user = await bot.fetch_user(voter_id)
-            if user:
-                embed = discord.Embed(
-                    title="Your votes have been transferred!",
-                    description="Your public votes from the qualification round have been automatically transferred to the semi-finals! You can change them if you'd like by voting again in the semi-finals."
-                )
-                await send_dm_safe(user, embed=embed)
-        except Exception as e:
-            print(f"Could not send DM to voter {voter_id}: {e}")
+        async def send_transfer_dm(voter_id=voter_id):
+            embed = discord.Embed(
+                title="Your votes have been transferred!",
+                description="Your public votes from the qualification round have been automatically transferred to the semi-finals! You can change them if you'd like by voting again in the semi-finals."
+            )
+            dm_outbox.enqueue(voter_id, embed=embed)
+        
+        await journal.step(f"prep_semis/transfer_dm/{voter_id}", send_transfer_dm)
     
     # Announce qualification results (random order, no authors) in announcement channel
-    await announce_qualif_results(bot)
+    await journal.step("prep_semis/announce_qualif_results", lambda: announce_qualif_results(bot))
+    
+    scheduler = PostingScheduler("Semi-finals prep")
     
     # Announce qualifiers in each original qualification thread
-    for comp in contest.qualif_competitions:
-        assert comp.thread_id is not None, "Qualification competition missing thread_id"
-        qualifiers = contest.get_qualifiers_for_thread(comp.channel_id, comp.thread_id)
-        
-        if not qualifiers:
-            continue
-        
-        channel = bot.get_channel(comp.channel_id)
+    async def announce_thread_qualifiers(comp: CompetitionInfo, qualifiers: list[Submission]):
+        prefix = f"prep_semis/{comp.thread_id}"
         try:
-            thread = await bot.fetch_channel(comp.thread_id)
+            thread = bot.get_channel(comp.thread_id) or await scheduler.call(("fetch", comp.thread_id), bot.fetch_channel, comp.thread_id)
         except Exception:
-            continue
+            return
         
         if thread:
             assert isinstance(thread, discord.Thread), "Thread ID does not correspond to a thread channel"
-            await thread.send("🏆 **Qualification Results** 🏆\nThe following photos have qualified for the Semi-Finals (in no particular order):")
+            await journaled_send(f"{prefix}/results_header", scheduler, thread, "🏆 **Qualification Results** 🏆\nThe following photos have qualified for the Semi-Finals (in no particular order):")
             
             for i, sub in enumerate(qualifiers):
-                await thread.send(
+                await journaled_send(
+                    f"{prefix}/qualifier/{i}",
+                    scheduler,
+                    thread,
                     f"Qualifier **#{i+1}**",
                     embed=discord.Embed().set_image(url=sub.discord_save_path)
                 )
             
             start_time = int(contest.schedule.semis_period.start)
             timestamp_str = f"<t:{start_time}:F>"
-            await thread.send(
+            await journaled_send(
+                f"{prefix}/voting_start",
+                scheduler,
+                thread,
                 "📅 **Voting will begin at** " + timestamp_str
             )
     
+    announcements = {}
+    for comp in contest.qualif_competitions:
+        assert comp.thread_id is not None, "Qualification competition missing thread_id"
+        
+        # The qualifiers are shuffled: keep the order of the first run when resuming
+        qualifier_paths = journal.result(f"prep_semis/{comp.thread_id}/qualifiers")
+        if qualifier_paths is None:
+            qualifier_paths = [sub.discord_save_path for sub in contest.get_qualifiers_for_thread(comp.channel_id, comp.thread_id)]
+            await journal.record(f"prep_semis/{comp.thread_id}/qualifiers", qualifier_paths)
+        by_path = {sub.discord_save_path: sub for sub in comp.competing_entries}
+        qualifiers = [by_path[path] for path in qualifier_paths]
+        
+        if qualifiers:
+            announcements[comp.thread_id] = announce_thread_qualifiers(comp, qualifiers)
+    
+    errors = await scheduler.run(announcements)
+    await report_prep_errors(bot, scheduler, errors)
+    
     # Send DM notifications to qualifiers
-    await notify_qualifiers(bot, contest, "semis", "Semi-Finals")
+    await journal.step("prep_semis/notify_qualifiers", lambda: notify_qualifiers(bot, contest, "semis", "Semi-Finals"))
     
-    # Post submissions in semi-final channels
-    for comp in contest.semis_competitions:
+    # Post submissions in semi-final channels, all channels at once
+    async def prepare_semi_final(comp: CompetitionInfo):
+        prefix = f"prep_semis/{comp.channel_id}"
         channel = bot.get_channel(comp.channel_id)
         if not channel or not isinstance(channel, discord.TextChannel):
             print(f"Warning: Could not find channel {comp.channel_id}")
-            continue
+            return
         
-        await channel.send("🎉 **Semi-Finals have begun!** 🎉")
-        for i, submission in enumerate(comp.competing_entries):
-            msg = await channel.send(
-                content=f"Submission #{i+1}",
-                embed=discord.Embed().set_image(url=submission.discord_save_path)
-            )
-            # Add voting reactions: 0, 1, 2, 3 points
-            await msg.add_reaction("0️⃣")
-            await msg.add_reaction("1️⃣")
-            await msg.add_reaction("2️⃣")
-            await msg.add_reaction("3️⃣")
-            # Add commentary reaction
-            await msg.add_reaction("💬")
-            
-            # Update the contest with the message_id mapping
-            contest = contest.set_message_id(comp.channel_id, comp.thread_id, i, msg.id)
-            
-            # Track the submission post
-            contest = contest.add_submission_post(
-                submission.discord_save_path,
-                msg.id,
-                comp.channel_id,
-                None,
-                is_summary=False
-            )
+        await journaled_send(f"{prefix}/header", scheduler, channel, "🎉 **Semi-Finals have begun!** 🎉")
+        await post_submission_messages(scheduler, channel, comp, prefix)
 
         # Send voting instruction message
-        vote_msg = await channel.send(
+        vote_msg_id = await journaled_send(
+            f"{prefix}/instructions",
+            scheduler,
+            channel,
             "🗳️ **Voting has NOT started yet!**\n"
             f"Voting will begin at <t:{int(contest.schedule.semis_period.start)}:F>\n\n"
             "React with 🗳️ to this message to cast your jury vote (top 10 ranking).\n\n"
@@ -2623,10 +3021,15 @@ async def prep_semis_period(bot: discord.Client):
             "You can vote on as many photos as you wish! Your reactions will be automatically removed to keep votes secret.\n\n"
             "Note: The top 2 of public and the top 6 of jury among the remaining submissions will advance to the semi-finals."
         )
-        await vote_msg.add_reaction("🗳️")
+        await journaled_reactions(f"{prefix}/instructions_reaction", scheduler, channel, vote_msg_id, ("🗳️",))
+    
+    semis_errors = await scheduler.run({comp.channel_id: prepare_semi_final(comp) for comp in contest.semis_competitions})
+    await report_prep_errors(bot, scheduler, semis_errors)
 
     # Save the updated contest with message mappings
-    contest.save("photo_contest/contest2026.yaml")
+    await save_contest(contest)
+    if not errors and not semis_errors:
+        await journal.record("prep_semis/done")
 
 
 async def prep_final_period(bot):
@@ -2634,15 +3037,17 @@ async def prep_final_period(bot):
     
     Called at the END of the semi-finals period to prepare for final voting.
     Voting will be announced and become valid at the START of the final period.
+    Resumable like prep_qualif_period.
     """
     global contest
     
     # Solve semi-finals to determine finalists with the correct channel_id
-    contest = contest.solve_semis(final_channel_id)
-    contest.save("photo_contest/contest2026.yaml")
+    if not contest.final_competition:
+        contest = contest.solve_semis(final_channel_id)
+        await save_contest(contest)
     
     # Announce winners in each semi-final channel
-    await announce_semis_winners(bot)
+    await journal.step("prep_final/announce_semis_winners", lambda: announce_semis_winners(bot))
     
     final_comp = contest.final_competition
     if not final_comp:
@@ -2650,7 +3055,7 @@ async def prep_final_period(bot):
         return
     
     # Send DM notifications to finalists
-    await notify_qualifiers(bot, contest, "final", "Grand Final")
+    await journal.step("prep_final/notify_qualifiers", lambda: notify_qualifiers(bot, contest, "final", "Grand Final"))
     
     # Post submissions in the final channel (single channel for all categories)
     final_channel = bot.get_channel(final_channel_id)
@@ -2659,44 +3064,33 @@ async def prep_final_period(bot):
         return
     
     # Post all finalists from all categories in the final channel
-    await final_channel.send("🏆 **GRAND FINAL!** 🏆\nAll 15 finalists compete together!")
-    
-    # Get the final competition
-    final_comp = contest.final_competition
-    if not final_comp:
-        print("Warning: No final competition found")
-        return
+    scheduler = PostingScheduler("Final prep")
     
-    # Post all submissions
-    for i, submission in enumerate(final_comp.competing_entries):
-        msg = await final_channel.send(
-            content=f"Submission #{i+1}",
-            embed=discord.Embed().set_image(url=submission.discord_save_path)
-        )
+    async def prepare_final(final_comp: CompetitionInfo):
+        await journaled_send("prep_final/header", scheduler, final_channel, "🏆 **GRAND FINAL!** 🏆\nAll 15 finalists compete together!")
         
-        # Update the contest with the message_id mapping
-        contest = contest.set_message_id(final_channel_id, None, i, msg.id)
+        # Post all submissions (one channel: the scheduler only paces and retries the calls)
+        await post_submission_messages(scheduler, final_channel, final_comp, "prep_final", reactions=())
         
-        # Track the submission post
-        contest = contest.add_submission_post(
-            submission.discord_save_path,
-            msg.id,
-            final_channel_id,
-            None,
-            is_summary=False
+        # Send voting instruction message
+        vote_msg_id = await journaled_send(
+            "prep_final/instructions",
+            scheduler,
+            final_channel,
+            "🗳️ **Final Voting opens soon!**\n"
+            f"Voting will begin at <t:{int(contest.schedule.final_period.start)}:F>\n\n"
+            "React with 🗳️ to this message to cast your vote.\n"
+            "You will rank your top 5 out of the 15 finalists."
         )
+        await journaled_reactions("prep_final/instructions_reaction", scheduler, final_channel, vote_msg_id, ("🗳️",))
     
-    # Send voting instruction message
-    vote_msg = await final_channel.send(
-        "🗳️ **Final Voting opens soon!**\n"
-        f"Voting will begin at <t:{int(contest.schedule.final_period.start)}:F>\n\n"
-        "React with 🗳️ to this message to cast your vote.\n"
-        "You will rank your top 5 out of the 15 finalists."
-    )
-    await vote_msg.add_reaction("🗳️")
+    errors = await scheduler.run({final_channel_id: prepare_final(final_comp)})
+    await report_prep_errors(bot, scheduler, errors)
     
     # Save the updated contest
-    contest.save("photo_contest/contest2026.yaml")
+    await save_contest(contest)
+    if not errors:
+        await journal.record("prep_final/done")
 
 
 def main():
@@ -2705,48 +3099,33 @@ def main():
         command_prefix=constantes.prefixVolt, help_command=None, intents=intents
     )
 
-    async def planner(now, bot):
-        """Determines the current state of the contest based on the schedule and triggers period transitions."""
-        global contest, current_period
-        current_timestamp = now.timestamp()
-        
-        # Determine which period we're in
-        if contest.schedule.submission_period.start <= current_timestamp < contest.schedule.submission_period.end:
-            period = ContestPeriod.SUBMISSION
-        elif contest.schedule.qualif_period.start <= current_timestamp < contest.schedule.qualif_period.end:
-            period = ContestPeriod.QUALIF
-        elif contest.schedule.semis_period.start <= current_timestamp < contest.schedule.semis_period.end:
-            period = ContestPeriod.SEMIS
-        elif contest.schedule.final_period.start <= current_timestamp < contest.schedule.final_period.end:
-            period = ContestPeriod.FINAL
-        else:
-            period = ContestPeriod.IDLE
-        
-        # Handle period transitions
-        if current_period != period:
-            old_period = current_period
-            current_period = period
-            
-            # Close the previous period
-            if old_period:
-                await close_period(old_period, bot)
-            
-            # Setup the new period
-            await setup_period(period, old_period, bot)
-        
-        return period
+    metrics.instrument(bot, "photo_contest")
+    scheduler = EventScheduler(lambda: contest_events(bot), journal)
 
-    @tasks.loop(minutes=1.0)
-    async def autoplanner():
-        now = utcnow().to("Europe/Brussels")
-        await planner(now, bot)
+    @tasks.loop(minutes=live_standings_interval_minutes)
+    async def live_standings_refresher():
+        """Refresh the live standings boards of the current voting stage."""
+        try:
+            await refresh_live_standings(bot)
+        except Exception as e:
+            logger.error(f"Live standings refresh failed: {e}")
 
     @bot.event
     async def on_ready():
+        global picture_restore
         print(f"Bot is ready. Logged in as {bot.user}")
         await recover_state(bot)
-        await download_missing_pictures()
-        autoplanner.start()
+        # Pictures are restored in the background: the bot answers right away, current stage first
+        if picture_restore is None or picture_restore.done():
+            picture_restore = asyncio.create_task(download_missing_pictures())
+        warm_up()  # fonts and logo, so the first board of the day doesn't pay for the disk reads
+        scheduler.start()
+        dm_outbox.start(bot, report=lambda text: notify_organizer(bot, text))
+        reaction_cleaner.start(bot)
+        metrics.start(textfile=metrics_textfile, port=metrics_port)
+        loop_watchdog.start(report=lambda text: notify_organizer(bot, text))
+        if live_standings_enabled and not live_standings_refresher.is_running():
+            live_standings_refresher.start()
 
     @bot.event
     async def on_message(message):
@@ -2759,7 +3138,7 @@ def main():
         # Handle submissions only during submission period
         if current_period == ContestPeriod.SUBMISSION:
             contest = await submit(message, bot)
-            contest.save("photo_contest/contest2026.yaml")
+            await save_contest(contest)
 
     @bot.event
     async def on_raw_reaction_add(payload):
@@ -2770,6 +3149,13 @@ def main():
         if payload.user_id == bot.user.id:
             return
         
+        # Public votes are only queued here, without any API call: they are saved in batches
+        if payload.emoji.name in PUBLIC_VOTE_POINTS and current_period in (ContestPeriod.QUALIF, ContestPeriod.SEMIS):
+            guild = bot.get_guild(payload.guild_id) if payload.guild_id is not None else None
+            if guild is not None:
+                vote_pipeline.submit(ReactionVote(payload.channel_id, payload.message_id, payload.user_id, payload.emoji.name, guild))
+            return
+        
         # Get the user who reacted
         guild = bot.get_guild(payload.guild_id)
         if not guild:
@@ -2802,7 +3188,7 @@ def main():
         
         # Handle withdrawal reactions (❌) - allowed during any period
         if payload.emoji.name == "❌":
-            contest = await withdraw(contest, message, user)
+            await withdraw(message, user)
             return
         
         # Check for voting-related emojis
@@ -2842,11 +3228,9 @@ def main():
             pass
         
         elif current_period == ContestPeriod.QUALIF or current_period == ContestPeriod.SEMIS:
-            # Handle public votes (0-3 points)
-            if payload.emoji.name in ["0️⃣", "1️⃣", "2️⃣", "3️⃣"]:
-                contest = await handle_public_vote(contest, message, user, payload.emoji.name, current_period)
+            # Public votes (0-3 points) were queued before fetching the message
             # Handle jury vote requests
-            elif payload.emoji.name == "🗳️":
+            if payload.emoji.name == "🗳️":
                 await handle_jury_vote_request(contest, message, user, bot, current_period)
             # Handle commentary requests (semis only)
             elif payload.emoji.name == "💬" and current_period in (ContestPeriod.QUALIF, ContestPeriod.SEMIS):
@@ -2903,7 +3287,7 @@ def main():
             return
         
         # Perform the withdrawal (message is already deleted, so pass None for message)
-        contest = await _perform_withdrawal(contest, message=None, channel_id=channel_id, thread_id=thread_id, bot=bot)
+        await _perform_withdrawal(message=None, channel_id=channel_id, thread_id=thread_id, bot=bot)
 
     # Admin Commands for Testing #############################################
     
@@ -3020,6 +3404,44 @@ def main():
         
         await ctx.send(schedule_info)
     
+    @bot.command(name="contest_metrics")
+    async def command_contest_metrics(ctx: commands.Context):
+        """Show where the bot spends its time: handlers, Discord API calls, saves and renders."""
+        if not is_admin(ctx.author.id):
+            await ctx.send("❌ This command is only available to admins.", delete_after=5)
+            return
+        
+        # Code blocks, split to fit in Discord messages
+        chunk: list[str] = []
+        for line in metrics.summary():
+            if chunk and sum(len(l) + 1 for l in chunk) + len(line) > 1900:
+                await ctx.send("```\n" + "\n".join(chunk) + "\n```")
+                chunk = []
+            chunk.append(line)
+        if chunk:
+            await ctx.send("```\n" + "\n".join(chunk) + "\n```")
+    
+    @bot.command(name="contest_profile")
+    async def command_contest_profile(ctx: commands.Context, seconds: int = 30):
+        """Profile the running bot for some seconds and DM the flame graph and top functions to the organizer."""
+        if not is_admin(ctx.author.id):
+            await ctx.send("❌ This command is only available to admins.", delete_after=5)
+            return
+        if profiler.running:
+            await ctx.send("⏳ A profiling run is already in progress.")
+            return
+        
+        await ctx.send(f"🔬 Profiling the bot for {min(max(seconds, 1), int(profiler.max_seconds))}s, the results will be sent to the organizer.")
+        profile = await profiler.profile(seconds, profiles_folder)
+        summary = "\n".join(profile.summary)
+        if len(summary) > 1900:
+            summary = summary[:1900].rsplit("\n", 1)[0] + "\n…"
+        await notify_organizer(
+            bot,
+            f"```\n{summary}\n```",
+            files=[discord.File(profile.collapsed_path), discord.File(profile.summary_path)]
+        )
+    
     @bot.command(name="contest_timeline")
     async def command_contest_timeline(ctx):
         """Show contest timeline with Discord timestamps."""
@@ -3093,15 +3515,14 @@ def main():
             category_channel = bot.get_channel(comp.channel_id)
             category_name = getattr(category_channel, "name", f"Category {comp.channel_id}")
             
-            # Generate board
-            board_path = gen_competition_board(comp, category_name, id2name, None, qualif_jury_voter_authors)
+            # Generate board (same job as the posted board, so it usually comes from the cache)
+            board = await board_cache.render(RenderJob("gen_competition_board", (comp, category_name, id2name, None, qualif_jury_voter_authors)))
             
             # Send board to channel
-            with open(board_path, "rb") as f:
-                await ctx.send(
-                    f"📊 **Qualification Results - {category_name}**",
-                    file=discord.File(f, filename=f"qualif_{category_name.replace(' ', '_')}.png")
-                )
+            await ctx.send(
+                f"📊 **Qualification Results - {category_name}**",
+                file=board_file(board, filename=f"qualif_{category_name.replace(' ', '_')}.png")
+            )
         
         await ctx.send("✅ Qualification boards posted!")
     
@@ -3141,6 +3562,10 @@ def main():
         
         # Manually trigger the transition logic
         if old_period != target_period or force:
+            if force and target_period in (ContestPeriod.QUALIF, ContestPeriod.SEMIS, ContestPeriod.FINAL):
+                # Post everything again instead of resuming the previous preparation
+                await journal.reset(f"prep_{target_period.value}/")
+            
             # Don't close the previous period - just jump to the new one
             # This allows testing without triggering end-of-period cleanup
             
@@ -3226,7 +3651,9 @@ def main():
         current_schedule = contest.schedule  # Keep the current schedule
         
         contest = make_contest(channel_ids, current_schedule)
-        contest.save("photo_contest/contest2026.yaml")
+        await save_contest(contest)
+        await journal.reset("prep_")  # the fired schedule events stay fired: the schedule is kept
+        scheduler.reschedule()
         
         await ctx.send("✅ Contest has been reset! All submissions, votes, and competition data cleared.")
     
@@ -3246,14 +3673,9 @@ def main():
             await ctx.send(f"⚠️ This will clear ALL votes (jury & public). To confirm, use: `{constantes.prefixVolt}contest_clear_votes CONFIRM`", delete_after=10)
             return
         
-        # Clear all votes from all competitions
-        votes_cleared = 0
-        for comp in contest.competitions:
-            votes_cleared += len(comp.votes_jury) + len(comp.votes_public)
-            comp.votes_jury.clear()
-            comp.votes_public.clear()
-        
-        contest.save("photo_contest/contest2026.yaml")
+        # Clear all votes from all competitions (on a copy: the contest may be being written)
+        contest, votes_cleared = contest.clear_votes()
+        await save_contest(contest)
         logger.info(f"All votes cleared by admin: <@{ctx.author.id}> ({votes_cleared} votes removed)")
         
         await ctx.send(f"✅ All votes have been cleared! ({votes_cleared} votes removed)")
@@ -3351,7 +3773,7 @@ def main():
             contest = reload_contest()
             period_type = current_period.value if current_period != ContestPeriod.IDLE else None
             contest = contest.save_public_vote(channel_id, thread_id, user.id, points_literal, submission, period=period_type)
-            contest.save("photo_contest/contest2026.yaml")
+            await save_contest(contest)
             logger.info(f"Public vote saved by admin for user={user.id}, points={points}, submission={submission_number}")
             await ctx.send(f"✅ Vote cast! {user.mention} gave **{points} point{'s' if points != 1 else ''}** to Submission #{submission_number}", delete_after=10)
         except ValueError as e:
@@ -3367,6 +3789,8 @@ def main():
         help_text = (
             "**🛠️ Admin Contest Commands**\n\n"
             f"**`{constantes.prefixVolt}contest_status`** - Show current period and full schedule\n"
+            f"**`{constantes.prefixVolt}contest_metrics`** - Show handler latencies, Discord API calls, saves and renders\n"
+            f"**`{constantes.prefixVolt}contest_profile [seconds]`** - Profile the bot live and DM a flame graph to the organizer\n"
             f"**`{constantes.prefixVolt}contest_timeline`** - Show timeline with Discord timestamps (localized)\n"
             f"**`{constantes.prefixVolt}contest_qualif_board`** - Generate and post qualification results boards\n"
             f"**`{constantes.prefixVolt}contest_next`** - Advance to the next period\n"
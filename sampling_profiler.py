@@ -0,0 +1,163 @@
+"""On-demand sampling profiler of the asyncio event loop, to profile a bot live.
+
+While it runs, a thread samples the stack of the event loop thread every few
+milliseconds. Nothing is hooked into the interpreter, so it costs nothing when it is
+not running, and little when it is (one sys._current_frames() per sample).
+
+A profile is written as two files:
+- `<name>.collapsed`: one line per distinct stack, "root;...;leaf count", which
+  flamegraph.pl, speedscope or https://www.speedscope.app turn into a flame graph
+- `<name>.txt`: the functions the loop spent its time in, by self samples, and the
+  functions of the bots by total samples (including their callees)
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# Code of the bots: their file names are shown relative to it
+REPOSITORY = os.path.dirname(os.path.abspath(__file__))
+
+Frame = Tuple[str, str, int]  # (file, function, first line)
+
+
+@dataclass
+class Profile:
+    """Result of a profiling run.
+
+    Attributes:
+        seconds: Duration of the run
+        samples: Number of samples of the loop thread
+        idle: Samples where the loop was waiting for events
+        collapsed_path: File of the collapsed stacks (flame graph input)
+        summary_path: File of the top functions
+        summary: Lines of the top functions summary
+    """
+    seconds: float
+    samples: int
+    idle: int
+    collapsed_path: str
+    summary_path: str
+    summary: List[str] = field(default_factory=list)
+
+
+def _label(frame: Frame) -> str:
+    filename, name, lineno = frame
+    if filename.startswith(REPOSITORY + os.sep):
+        filename = os.path.relpath(filename, REPOSITORY)
+    else:
+        filename = os.path.basename(filename)
+    return f"{name} ({filename}:{lineno})".replace(";", ",")
+
+
+def _is_idle(stack: Tuple[Frame, ...]) -> bool:
+    """Whether the loop is waiting in the selector for something to do."""
+    filename, name, _ = stack[-1]
+    return name in ("select", "poll") and os.path.basename(filename) == "selectors.py"
+
+
+class SamplingProfiler:
+    """Samples the stack of the event loop thread during a profiling run.
+
+    Args:
+        interval: Seconds between two samples
+        max_seconds: Longest profiling run allowed
+    """
+
+    def __init__(self, interval: float = 0.005, max_seconds: float = 600.0):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: "Counter[Tuple[Frame, ...]]" = Counter()
+        self._stop = threading.Event()
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _sample(self, thread_id: int):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    async def profile(self, seconds: float, directory: str, name: Optional[str] = None) -> Profile:
+        """Profile the running event loop for a while and write the results in `directory`.
+
+        Raises:
+            RuntimeError: If a profiling run is already in progress
+        """
+        if self.running:
+            raise RuntimeError("A profiling run is already in progress")
+        seconds = min(max(seconds, 1.0), self.max_seconds)
+        async with self._lock:
+            self.stacks = Counter()
+            self._stop.clear()
+            sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),), name="sampling-profiler", daemon=True)
+            start = time.monotonic()
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                self._stop.set()
+                sampler.join()
+            elapsed = time.monotonic() - start
+
+            os.makedirs(directory, exist_ok=True)
+            name = name or f"profile-{datetime.now():%Y%m%d-%H%M%S}"
+            collapsed_path = os.path.join(directory, f"{name}.collapsed")
+            summary_path = os.path.join(directory, f"{name}.txt")
+            with open(collapsed_path, "w") as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(";".join(_label(frame) for frame in stack) + f" {count}\n")
+            summary = self.summary(elapsed)
+            with open(summary_path, "w") as f:
+                f.write("\n".join(summary) + "\n")
+
+            return Profile(
+                elapsed,
+                sum(self.stacks.values()),
+                sum(count for stack, count in self.stacks.items() if _is_idle(stack)),
+                collapsed_path,
+                summary_path,
+                summary,
+            )
+
+    def summary(self, seconds: float, top: int = 15) -> List[str]:
+        """Lines of the functions the loop was busy in, by self samples then by total samples."""
+        samples = sum(self.stacks.values())
+        busy = {stack: count for stack, count in self.stacks.items() if not _is_idle(stack)}
+        nb_busy = sum(busy.values())
+        own: "Counter[Frame]" = Counter()
+        total: "Counter[Frame]" = Counter()
+        for stack, count in busy.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                if frame[0].startswith(REPOSITORY + os.sep) and frame[0] != os.path.abspath(__file__):
+                    total[frame] += count
+
+        lines = [
+            f"Profile of the event loop over {seconds:.0f}s: {samples} samples, "
+            f"busy {nb_busy / samples:.0%} of the time" if samples else f"Profile of the event loop over {seconds:.0f}s: no samples"
+        ]
+        for title, counter in (("Self time (where the loop was busy)", own), ("Total time in the bots' code (including callees)", total)):
+            if not counter:
+                continue
+            lines.append("")
+            lines.append(f"{title}:")
+            for frame, count in counter.most_common(top):
+                lines.append(f"  {count / samples:6.1%} {count * seconds / samples:6.2f}s  {_label(frame)}")
+        return lines
+
+
+profiler = SamplingProfiler()
@@ -11,9 +11,15 @@ from discord.ext import commands
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from constantes import TOKENVOLT as token
-from data_contest.genSvg import generateSvgs
+from data_contest.genSvg import generateRecapAsync, generateSvgsAsync
+from bot_metrics import metrics
+from executors import dump_pickle
+from loop_watchdog import loop_watchdog
 
 ADMIN_ID = 619574125622722560
+RECAP_FORMAT: str | None = "webp" #all the boards of showResults are posted again in one file at the end ("webp", "gif", "zip" or None)
+METRICS_TEXTFILE = "data_contest/vote_music.prom" #handler latencies, API calls and saves, in the Prometheus text format
+METRICS_PORT: int | None = 9103 #local endpoint http://127.0.0.1:9103/metrics (None: off)
 
 try:
     if "vote_music.p" in os.listdir("data_contest"):
@@ -32,7 +38,6 @@ vote_status_dms: dict[int, discord.Message] = {}
 voting_closed = False
 live_count_msg: discord.Message | None = None
 jury_voters_in_progress: set[int] = set()
-save_lock = asyncio.Lock()
 user_vote_locks: dict[int, asyncio.Lock] = {}
 
 ALL_COUNTRY_CODES = {
@@ -88,8 +93,8 @@ async def dmChannelUser(user):
     return user.dm_channel
 
 async def save():
-    async with save_lock:
-        pickle.dump((JURY, infoVote, votes, msgVote), open("data_contest/vote_music.p", "wb"))
+    with metrics.timer("save_seconds", what="vote_music"):
+        await dump_pickle((JURY, infoVote, votes, msgVote), "data_contest/vote_music.p")
 
 def countVotes():
     jury = dict()
@@ -401,9 +406,13 @@ async def showResults(channel, semi):
     await asyncio.sleep(5)
 
     i = 0
-    for filePath, currentVoter, nextVoter in generateSvgs(semi):
+    boards = []
+    async for png, currentVoter, nextVoter in generateSvgsAsync(semi):
+        if currentVoter != "standings":
+            boards.append(png.getvalue())
+
         if currentVoter == "results":
-            await channel.send(f"**Here are the full results of the Televote!**\nThank you for your votes <:meowhuggies_left:780807943704412241>", file=discord.File(filePath, filename="viewvotes.png"))
+            await channel.send(f"**Here are the full results of the Televote!**\nThank you for your votes <:meowhuggies_left:780807943704412241>", file=discord.File(png, filename="viewvotes.png"))
         elif currentVoter == "standings":
             assert isinstance(nextVoter, list)
             if semi == "F":
@@ -413,7 +422,7 @@ async def showResults(channel, semi):
                 top10 = [c for c, _ in nextVoter[:10]]
                 await channel.send("According to the server's vote, the following countries **qualified for the Grand Final:**\n" + "\n".join(f"{flags[c]} {c}" for c in top10))
         elif currentVoter != "public":
-            await channel.send(f"Thank you **{currentVoter}** for your votes <:meowhuggies_left:780807943704412241>", file=discord.File(filePath, filename="viewvotes.png"))
+            await channel.send(f"Thank you **{currentVoter}** for your votes <:meowhuggies_left:780807943704412241>", file=discord.File(png, filename="viewvotes.png"))
         
             await asyncio.sleep(5)
             if nextVoter is not None:
@@ -436,14 +445,28 @@ async def showResults(channel, semi):
             if remaining == 0:
                 await asyncio.sleep(30)
 
-            await channel.send(f"**{points}** for **{country}** {flags[country]}", file=discord.File(filePath, filename="viewvotes.png"))
+            await channel.send(f"**{points}** for **{country}** {flags[country]}", file=discord.File(png, filename="viewvotes.png"))
 
             await asyncio.sleep(4)
 
+    if RECAP_FORMAT and boards:
+        recap = await generateRecapAsync(boards, f"results_{semi}", RECAP_FORMAT)
+        await channel.send("**All the results in one go:**", file=discord.File(recap, filename=recap.name))
+
 #MAIN ##########################################################################
 def main():
     intents = discord.Intents.all()
     bot = commands.Bot(command_prefix="T.", help_command=None, intents = intents)
+    metrics.instrument(bot, "vote_music")
+
+    async def reportToAdmin(text):
+        admin = await bot.fetch_user(ADMIN_ID)
+        await (await dmChannelUser(admin)).send(text)
+
+    @bot.event
+    async def on_ready():
+        metrics.start(textfile=METRICS_TEXTFILE, port=METRICS_PORT)
+        loop_watchdog.start(report=reportToAdmin)
 
     async def traitementRawReact(payload):
         assert bot.user is not None